@@ -1,19 +1,59 @@
+import sys
+from system.TextNormalizer import normalize_text
+
 class Book:
 #represents book in library
+#uses __slots__ instead of a per-instance dict, and author/genre strings are interned
+#so the thousands of books sharing them keep a single copy
+#title, author and genre keep a normalized search key next to them (see normalize_text), updated
+#whenever the field is set, which the search strategies and indexes match against
+    __slots__ = ('_title', '_author', 'total_copies', 'available_copies', '_genre', 'year',
+                 'title_key', 'author_key', 'genre_key')
 
 # initializes book instance
     def __init__(self, title, author, copies, genre, year) -> None:
         self.title = title
         self.author = author
-        self.is_loaned = "No" #default status, changes based on availability
         self.total_copies = copies  # total copies in the library
         self.available_copies = copies  # number of copies available to loan, initially all
         self.genre = genre
         self.year = year
 
-#updates loan status of the books
+    @property
+    def title(self):
+        return self._title
+
+    @title.setter
+    def title(self, value):
+        self._title = value
+        self.title_key = normalize_text(str(value))
+
+    @property
+    def author(self):
+        return self._author
+
+    @author.setter
+    def author(self, value):
+        self._author = sys.intern(value) if type(value) is str else value
+        self.author_key = sys.intern(normalize_text(str(value)))
+
+    @property
+    def genre(self):
+        return self._genre
+
+    @genre.setter
+    def genre(self, value):
+        self._genre = sys.intern(value) if type(value) is str else value
+        self.genre_key = sys.intern(normalize_text(str(value)))
+
+#loan status is derived from availability: "Yes" when no copy is left to loan
+#it is read only, change available_copies instead
+    @property
+    def is_loaned(self):
+        return "Yes" if self.available_copies == 0 else "No"
+
+#saves the updated list of books, the loan status itself is derived from available_copies
     def update_loan_status(self, books):
-        self.is_loaned = "Yes" if self.available_copies == 0 else "No"
         #save the updated list of books to books.cvs
         from system.CSVHandler import CSVHandler
         CSVHandler.save_books_to_csv(books)
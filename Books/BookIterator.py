@@ -1,79 +1,120 @@
-from abc import ABC, abstractmethod
+from heapq import nlargest, nsmallest
+from itertools import islice
+from Error.ConcurrentModificationException import ConcurrentModificationException
 
-#abstract base class for iterating over a collection of books, defines the interface for the iterators
-class BookIterator(ABC):
-    #checks if there are more books to iterate over
-    @abstractmethod
-    def has_next(self):
-        pass
 
-    #recieves the next book in the iteration
-    @abstractmethod
-    def next(self):
-        pass
+#a lazy stream over the books of a catalog, the books are read from the catalog one at a time as the
+#stream is iterated, so it always sees the current books and never copies them.
+#streams are chained into pipelines with filter, map, take and sort_by, for example
+#BookStream(books).filter(lambda book: book.year > 1900).sort_by(lambda book: book.year).take(5)
+#adding or removing books while a stream is iterated raises ConcurrentModificationException
+class BookStream:
+    #initializes a stream over the books of a catalog (a dict or a CatalogStore)
+    #source is the iterator the stream reads from, the books of the catalog by default
+    def __init__(self, books, source=None):
+        self.catalog = books
+        self.source = source if source is not None else _catalog_books(books)
+        self.size = len(books)
 
+    def __iter__(self):
+        return self
 
-#specific implementations of the book iterator interface
-class AllBooksIterator(BookIterator):
-    #initializes thr AllBookIterator
-    def __init__(self, books, logger):
-        self.books = list(books.values())
-        self.index = 0
-        self.logger = logger
+    #returns the next item of the stream, raises StopIteration when there are no more
+    def __next__(self):
+        if len(self.catalog) != self.size:
+            raise ConcurrentModificationException()
+        return next(self.source)
 
-    #checks if there are more books in the collection
-    def has_next(self):
-        return self.index < len(self.books)
+    #returns a stream of the items matching the predicate
+    def filter(self, predicate):
+        return BookStream(self.catalog, (item for item in self if predicate(item)))
 
-    #retrieves next book from the collection
-    def next(self):
-        if self.has_next():
-            book = self.books[self.index]
-            self.index += 1
-            return book
-        self.logger.log_error("Displayed all books fail")
-        raise StopIteration()
+    #returns a stream of the results of the function on every item
+    def map(self, function):
+        return BookStream(self.catalog, map(function, self))
 
+    #returns a stream of at most the first count items
+    def take(self, count):
+        return BookStream(self.catalog, islice(self, count))
 
-#iterator for books available to loan
-class AvailableBooksIterator(BookIterator):
-    #initializes the availableBooksIterator
-    def __init__(self, books, logger):
-        self.books = [book for book in books.values() if book.available_copies > 0]
-        self.index = 0
-        self.logger = logger
+    #returns a stream of the items ordered by key, the items are read and sorted when the first one is
+    #needed. with limit only the first limit items are kept, using a heap of limit items
+    def sort_by(self, key, reverse=False, limit=None):
+        def ordered():
+            if limit is None:
+                yield from sorted(self, key=key, reverse=reverse)
+            elif reverse:
+                yield from nlargest(limit, self, key=key)
+            else:
+                yield from nsmallest(limit, self, key=key)
 
-    #checks for more available books in collection
-    def has_next(self):
-        return self.index < len(self.books)
+        return BookStream(self.catalog, ordered())
 
-    #retrieves next available book in the collection
-    def next(self):
-        if self.has_next():
-            book = self.books[self.index]
-            self.index += 1
-            return book
-        self.logger.log_error("Displayed available books fail")
-        raise StopIteration()
+    #returns the remaining items as a list
+    def to_list(self):
+        return list(self)
 
 
-#iterator for borrowed books
-class BorrowedBooksIterator(BookIterator):
-    #initializes borrowedBooksIterator
-    def __init__(self, books, logger):
-        self.books = [book for book in books.values() if book.total_copies > book.available_copies]
-        self.index = 0
+#yields the books of a catalog, raises ConcurrentModificationException when the dict of the books changes
+#size while it is read. only the errors of the catalog are converted, the errors raised by the functions of
+#a pipeline are left as they are
+def _catalog_books(books):
+    books_iterator = iter(books.values())
+    while True:
+        try:
+            book = next(books_iterator)
+        except StopIteration:
+            return
+        except RuntimeError as error:  # the dict of the books changed size
+            raise ConcurrentModificationException() from error
+        yield book
+
+
+#base class for iterating over the books of a catalog that match a filter
+#an iterator is a BookStream, so it supports for loops and pipelines, and it keeps the has_next() / next()
+#interface. running out of books is not an error and is not logged
+class BookIterator(BookStream):
+    #initializes the iterator over the books of the catalog that match the filter of the iterator
+    def __init__(self, books, logger=None):
+        super().__init__(books, (book for book in _catalog_books(books) if self.matches(book)))
         self.logger = logger
+        self.lookahead = []  # the book has_next() read from the stream and next() did not return yet
+
+    #checks if a book belongs to the iteration, every book by default
+    def matches(self, book):
+        return True
 
-    #checks for more borrowed books in collection
+    def __next__(self):
+        if self.lookahead:
+            return self.lookahead.pop()
+        return super().__next__()
+
+    #checks if there are more books to iterate over
     def has_next(self):
-        return self.index < len(self.books)
+        if not self.lookahead:
+            try:
+                self.lookahead.append(super().__next__())
+            except StopIteration:
+                return False
+        return True
 
-    #retrieves next borrowed book in collection
+    #retrieves the next book in the iteration, raises StopIteration when there are no more
     def next(self):
-        if self.has_next():
-            book = self.books[self.index]
-            self.index += 1
-            return book
-        self.logger.log_error("Displayed borrowed books fail")
-        raise StopIteration()
\ No newline at end of file
+        return self.__next__()
+
+
+#iterator over all the books
+class AllBooksIterator(BookIterator):
+    pass
+
+
+#iterator for books available to loan
+class AvailableBooksIterator(BookIterator):
+    def matches(self, book):
+        return book.available_copies > 0
+
+
+#iterator for borrowed books
+class BorrowedBooksIterator(BookIterator):
+    def matches(self, book):
+        return book.total_copies > book.available_copies
@@ -0,0 +1,187 @@
+import sys
+from array import array
+from Books.Book import Book
+from system.TextNormalizer import normalize_text
+
+#a columnar store for very large catalogs
+#every field is kept in one array (or one list for titles) instead of one object per book,
+#authors and genres are dictionary encoded, and books are handed out as lightweight BookView objects.
+#it behaves like the title -> book dict the rest of the library uses
+class CatalogStore:
+    #initializes an empty store
+    def __init__(self, books=None):
+        self._rows = {}  # title -> row
+        self._titles = []
+        self._author_codes = array('I')
+        self._genre_codes = array('I')
+        self._years = array('i')
+        self._total_copies = array('i')
+        self._available_copies = array('i')
+        self._free_rows = []
+
+        self._strings = []  # code -> author/genre
+        self._codes = {}  # author/genre -> code
+
+        if books is not None:
+            for book in books.values():
+                self[book.title] = book
+
+    #returns the code of an author or genre, adding it when new
+    def _encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(sys.intern(value) if type(value) is str else value)
+        return code
+
+    #adds a book from its fields and returns its view
+    def add(self, title, author, copies, genre, year, available_copies=None):
+        if title in self._rows:
+            row = self._rows[title]
+        elif self._free_rows:
+            row = self._free_rows.pop()
+            self._rows[title] = row
+        else:
+            row = len(self._titles)
+            self._rows[title] = row
+            self._titles.append(None)
+            self._author_codes.append(0)
+            self._genre_codes.append(0)
+            self._years.append(0)
+            self._total_copies.append(0)
+            self._available_copies.append(0)
+
+        self._titles[row] = title
+        self._author_codes[row] = self._encode(author)
+        self._genre_codes[row] = self._encode(genre)
+        self._years[row] = year
+        self._total_copies[row] = copies
+        self._available_copies[row] = copies if available_copies is None else available_copies
+        return BookView(self, row)
+
+    #stores a book (a Book or a view) under its title
+    def __setitem__(self, title, book):
+        if isinstance(book, BookView) and book._store is self and self._rows.get(title) == book._row:
+            return
+        self.add(title, book.author, book.total_copies, book.genre, book.year, book.available_copies)
+
+    #returns the view of a book
+    def __getitem__(self, title):
+        return BookView(self, self._rows[title])
+
+    #removes a book, views of the removed book must not be used afterwards
+    def __delitem__(self, title):
+        row = self._rows.pop(title)
+        self._titles[row] = None
+        self._free_rows.append(row)
+
+    def __contains__(self, title):
+        return title in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def get(self, title, default=None):
+        row = self._rows.get(title)
+        return default if row is None else BookView(self, row)
+
+    #removes a book and returns it as a detached Book
+    def pop(self, title, *default):
+        if title not in self._rows:
+            if default:
+                return default[0]
+            raise KeyError(title)
+        view = self[title]
+        book = Book(view.title, view.author, view.total_copies, view.genre, view.year)
+        book.available_copies = view.available_copies
+        del self[title]
+        return book
+
+    def keys(self):
+        return self._rows.keys()
+
+    def values(self):
+        return (BookView(self, row) for row in self._rows.values())
+
+    def items(self):
+        return ((title, BookView(self, row)) for title, row in self._rows.items())
+
+
+#a book stored in a CatalogStore, reads and writes go straight to the columns
+class BookView:
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    @property
+    def title(self):
+        return self._store._titles[self._row]
+
+    @property
+    def author(self):
+        return self._store._strings[self._store._author_codes[self._row]]
+
+    @author.setter
+    def author(self, value):
+        self._store._author_codes[self._row] = self._store._encode(value)
+
+    @property
+    def genre(self):
+        return self._store._strings[self._store._genre_codes[self._row]]
+
+    @genre.setter
+    def genre(self, value):
+        self._store._genre_codes[self._row] = self._store._encode(value)
+
+    @property
+    def year(self):
+        return self._store._years[self._row]
+
+    @year.setter
+    def year(self, value):
+        self._store._years[self._row] = value
+
+    @property
+    def total_copies(self):
+        return self._store._total_copies[self._row]
+
+    @total_copies.setter
+    def total_copies(self, value):
+        self._store._total_copies[self._row] = value
+
+    @property
+    def available_copies(self):
+        return self._store._available_copies[self._row]
+
+    @available_copies.setter
+    def available_copies(self, value):
+        self._store._available_copies[self._row] = value
+
+    #search keys are computed when read, the store does not keep them
+    @property
+    def title_key(self):
+        return normalize_text(str(self.title))
+
+    @property
+    def author_key(self):
+        return normalize_text(str(self.author))
+
+    @property
+    def genre_key(self):
+        return normalize_text(str(self.genre))
+
+    #loan status is derived from availability, the same way as in Book
+    @property
+    def is_loaned(self):
+        return "Yes" if self.available_copies == 0 else "No"
+
+    def __eq__(self, other):
+        return isinstance(other, BookView) and other._store is self._store and other._row == self._row
+
+    def __hash__(self):
+        return hash((id(self._store), self._row))
@@ -0,0 +1,8 @@
+from Error.CustomException import CustomException
+
+
+class ConcurrentModificationException(CustomException):
+    """Exception raised when books are added or removed while they are being iterated over."""
+    def __init__(self, message="The books were modified during the iteration."):
+        self.message = message
+        super().__init__(self.message)
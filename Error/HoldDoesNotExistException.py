@@ -0,0 +1,8 @@
+from Error.CustomException import CustomException
+
+
+class HoldDoesNotExistException(CustomException):
+    """Exception raised when a customer has no copy on hold for a book."""
+    def __init__(self, message="The customer has no copy on hold for this book."):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,8 @@
+from Error.CustomException import CustomException
+
+
+class HoldLimitExceededException(CustomException):
+    """Exception raised when a customer is already on as many waiting lists as the policy allows."""
+    def __init__(self, message="The customer is already on the maximum number of waiting lists."):
+        self.message = message
+        super().__init__(self.message)
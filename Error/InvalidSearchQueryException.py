@@ -0,0 +1,8 @@
+from Error.CustomException import CustomException
+
+
+class InvalidSearchQueryException(CustomException):
+    """Exception raised when a search query cannot be parsed."""
+    def __init__(self, message="Invalid search query."):
+        self.message = message
+        super().__init__(self.message)
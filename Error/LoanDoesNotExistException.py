@@ -0,0 +1,8 @@
+from Error.CustomException import CustomException
+
+
+class LoanDoesNotExistException(CustomException):
+    """Exception raised when a customer has no open loan of a book."""
+    def __init__(self, message="The customer has no open loan of this book."):
+        self.message = message
+        super().__init__(self.message)
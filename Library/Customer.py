@@ -1,16 +1,19 @@
 import re
 from typing import Optional
 
-#represents a costumer with: name. phone number, email address
+#represents a costumer with: name. phone number, email address, membership tier and accessibility needs
 class Customer:
+    __slots__ = ('name', 'phone', 'email', 'tier', 'accessibility')
 
     # Regular expressions for validation
     PHONE_PATTERN = r'^(?:\+972|0)(?:[23489]|5[0-689]|7[0-9])[0-9]{7}$'  # Israeli phone format
     EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'  # Email format
 
     #initializes a costumer instance
-    def __init__(self, name: str, phone: str, email: str):
+    def __init__(self, name: str, phone: str, email: str, tier: str = 'regular', accessibility: bool = False):
         self.name = name
+        self.tier = tier
+        self.accessibility = accessibility
         if not self.validate_phone(phone):
             raise ValueError("Invalid phone number format. Please use Israeli phone format (e.g., 0501234567 or +972501234567)")
         self.phone = phone
@@ -19,6 +22,18 @@ class Customer:
             raise ValueError("Invalid email format. Please use a valid email address (e.g., example@domain.com)")
         self.email = email
 
+    #creates a costumer from details that were already validated (e.g. read back from a snapshot)
+    @classmethod
+    def from_trusted(cls, name: str, phone: str, email: str, tier: str = 'regular',
+                     accessibility: bool = False) -> 'Customer':
+        customer = cls.__new__(cls)
+        customer.name = name
+        customer.phone = phone
+        customer.email = email
+        customer.tier = tier
+        customer.accessibility = accessibility
+        return customer
+
     #validates Israeli phone number format
     @classmethod
     def validate_phone(cls, phone: str) -> bool:
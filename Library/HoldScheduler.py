@@ -0,0 +1,122 @@
+import heapq
+import threading
+import time
+
+
+#calls a function when the deadline of a key passes, for example to expire the holds of waiting costumers.
+#deadlines are kept in a min-heap, so only the earliest one is looked at: the background thread sleeps
+#until it is due (or until an earlier one is scheduled), and no pending entry is ever scanned.
+#rescheduled and cancelled entries stay in the heap and are skipped when they reach the top.
+#clock returns the current time in seconds, it can be replaced (e.g. in tests) and due entries can then
+#be run with run_due() instead of the thread
+class HoldScheduler:
+    #initializes the scheduler, callback is called with the key of every entry whose deadline passed
+    def __init__(self, callback, clock=time.monotonic):
+        self.callback = callback
+        self.clock = clock
+        self.heap = []  # (deadline, sequence number, key), including entries that are no longer live
+        self.entries = {}  # key -> (deadline, sequence number) of its live entry
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.thread = None
+        self.stopped = False
+
+    #schedules the callback for a key after delay seconds, replacing the deadline the key had
+    #returns the deadline
+    def schedule(self, key, delay):
+        with self.condition:
+            deadline = self.clock() + delay
+            self.sequence += 1
+            self.entries[key] = (deadline, self.sequence)
+            heapq.heappush(self.heap, (deadline, self.sequence, key))
+            self._compact()
+            if self.heap[0][1] == self.sequence:
+                self.condition.notify()  # the thread may be sleeping until a later deadline
+            return deadline
+
+    #cancels the entry of a key, returns False when it has none
+    def cancel(self, key):
+        with self.condition:
+            return self.entries.pop(key, None) is not None
+
+    #returns the deadline of a key, or None when it has no entry
+    def deadline(self, key):
+        entry = self.entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    #rebuilds the heap once most of it is entries that are no longer live
+    def _compact(self):
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [(deadline, sequence, key) for key, (deadline, sequence) in self.entries.items()]
+            heapq.heapify(self.heap)
+
+    #drops the entries that are no longer live from the top of the heap, returns the earliest live deadline
+    def _next_deadline(self):
+        while self.heap:
+            deadline, sequence, key = self.heap[0]
+            if self.entries.get(key) == (deadline, sequence):
+                return deadline
+            heapq.heappop(self.heap)
+        return None
+
+    #removes and returns the keys whose deadline passed, earliest first
+    def pop_due(self, now=None):
+        with self.condition:
+            now = self.clock() if now is None else now
+            due = []
+            while True:
+                deadline = self._next_deadline()
+                if deadline is None or deadline > now:
+                    return due
+                key = heapq.heappop(self.heap)[2]
+                del self.entries[key]
+                due.append(key)
+
+    #calls the callback for every key whose deadline passed, returns the keys
+    def run_due(self, now=None):
+        due = self.pop_due(now)
+        for key in due:
+            self.callback(key)
+        return due
+
+    #starts the background thread
+    def start(self):
+        with self.condition:
+            if self.thread is not None:
+                return
+            self.stopped = False
+            self.thread = threading.Thread(target=self._run, name="HoldScheduler", daemon=True)
+            self.thread.start()
+
+    #stops the background thread and waits for it to finish
+    def stop(self):
+        with self.condition:
+            thread, self.thread = self.thread, None
+            self.stopped = True
+            self.condition.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    #sleeps until the earliest deadline and runs the due entries, until stopped
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    deadline = self._next_deadline()
+                    if deadline is not None and deadline <= self.clock():
+                        break
+                    self.condition.wait(None if deadline is None else deadline - self.clock())
+                if self.stopped:
+                    return
+            # the callback runs without the lock, so it can schedule and cancel entries
+            for key in self.pop_due():
+                try:
+                    self.callback(key)
+                except Exception:
+                    pass  # the callback reports its own errors, the other entries still run
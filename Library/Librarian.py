@@ -1,8 +1,14 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from functools import wraps
 
 from Error.BookDoesNotExistException import BookDoesNotExistException
 from Error.CustomException import CustomException
+from Error.HoldDoesNotExistException import HoldDoesNotExistException
+from Error.HoldLimitExceededException import HoldLimitExceededException
+from Error.LoanDoesNotExistException import LoanDoesNotExistException
 from Error.NegativeCopiesException import NegativeCopiesException
 from Error.NoBorrowedCopiesException import NoBorrowedCopiesException
 from Error.NoCopyAvailableException import NoCopyAvailableException
@@ -10,8 +16,23 @@ from Error.NonIntegerValueException import NonIntegerValueException
 from Error.RemovingBorrowedBookException import RemovingBorrowedBookException
 from Books.Book import Book
 from Library.Observer import LibraryNotificationSubject
-from system.CSVHandler import CSVHandler
+from system.Storage import CSVStorage, JournalStorage
+from search.ColumnarCatalog import ColumnarCatalog
+from search.TokenIndex import TokenIndex
+from search.TrigramIndex import TrigramIndex
+from search.NumericIndex import NumericIndex
+from search.FuzzyIndex import FuzzyIndex
+from search.PrefixIndex import PrefixIndex
+from search.SearchCache import SearchCache
+from search.RelevanceRanker import RelevanceRanker
+from search.AvailabilityIndex import AvailabilityIndex
+from search.DemandTracker import DemandTracker
+from search.LazyIndex import LazyIndex
 from Library.Customer import Customer
+from Library.HoldScheduler import HoldScheduler
+from Library.LoanLedger import LoanLedger
+from Library.WaitingList import customer_key
+from Library.WaitingPolicy import WaitingPolicy
 from Library.LibrarianNotificationObserver import LibrarianNotificationObserver
 from system.Logger import Logger
 
@@ -41,10 +62,46 @@ def log_operation(operation_name):
     return decorator
 
 
+def synchronized(func):
+    #decorator running a librarian operation under the librarian lock, so holds expiring on the
+    #scheduler thread do not interleave with other operations
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+#holds the changes of an open batch until it is committed or rolled back
+class LibrarianBatch:
+    def __init__(self):
+        self.books = {}  # title -> book whose state must be saved
+        self.removed = set()  # titles that must be deleted
+        self.waiting_list_changes = []  # ("add", title, [(costumer, priority)]) / ("remove", title, customers) in order
+        self.notifications = []  # (book, customers, event_type) in order
+        self.holds = []  # ("start" / "cancel", title, costumer) hold changes applied in order on commit
+        self.loans = []  # ("lend" / "give_back", title, costumer) ledger changes in order
+        self.undo = {}  # title -> state before the first change in the batch
+
+
 #represents a librarian managing the book collection and costumer interactions
 class Librarian:
     #initializes the librarian, including loading books and waiting list
-    def __init__(self, books_path=None, waiting_list_path=None) -> None:
+    #when journal_path is given, changes are appended to the journal instead of rewriting the csv files
+    #when snapshot_path is given, a binary snapshot is written on close() / checkpoint() and used for startup
+    #a storage object (e.g. SQLiteStorage) can be passed instead of the file paths
+    #columnar=True keeps a numpy column mirror of the catalog for fast filtering (ignored without numpy)
+    #waiting_policy (see WaitingPolicy) orders the waiting lists and limits them per costumer, first come first
+    #served by default
+    #when hold_period is given, a copy passed to a waiting costumer is held for hold_period seconds: if the
+    #costumer does not pick it up (see picked_up) it passes to the next costumer, or back to the shelf.
+    #clock is the time source of the hold deadlines
+    #ledger is the LoanLedger recording who has which copy and until when, kept in memory by default. the holds
+    #are recorded in it too, so the holds of a ledger file are restored on start and the overdue ones expired
+    def __init__(self, books_path=None, waiting_list_path=None, journal_path=None, compact_threshold=10000,
+                 storage=None, snapshot_path=None, columnar=False, waiting_policy=None, hold_period=None,
+                 clock=time.monotonic, ledger=None) -> None:
         # sets default paths to files if none was specified
         if books_path is None or waiting_list_path is None:
             base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -55,22 +112,61 @@ class Librarian:
             if waiting_list_path is None:
                 waiting_list_path = os.path.join(files_dir, 'waiting_list.csv')
 
+        if storage is None:
+            if journal_path is not None:
+                storage = JournalStorage(books_path, waiting_list_path, journal_path, compact_threshold,
+                                         snapshot_path=snapshot_path)
+            else:
+                storage = CSVStorage(books_path, waiting_list_path, snapshot_path=snapshot_path)
+        self.storage = storage
+
         # basic start
         self.logger = Logger()
-        self.books_borrowed = {}
         self.notification_subject = LibraryNotificationSubject()
         self.notification_observer = LibrarianNotificationObserver(self.logger)
         self.notification_subject.attach(self.notification_observer)
 
-        # load books and waiting list from files
-        self.books = CSVHandler.load_books_from_csv(books_path)
-        self.waiting_list = CSVHandler.load_waiting_list_from_csv(waiting_list_path)
-
-        # update loaned books status
-        for title, book in self.books.items():
-            if book.is_loaned == "Yes":
-                book.available_copies = 0
-                self.books_borrowed[title] = book.total_copies
+        # load books, waiting list and borrowed copies from storage
+        self.books, self.waiting_list, self.books_borrowed = self.storage.load()
+        self.waiting_policy = waiting_policy if waiting_policy is not None else WaitingPolicy()
+        self._lock = threading.RLock()
+
+        # copies held for waiting costumers, expired by the scheduler (see start_hold_expiry)
+        self.hold_period = hold_period
+        self.holds = {}  # (title, costumer key) -> costumer
+        self.hold_scheduler = HoldScheduler(self._expire_hold, clock)
+        self.ledger = ledger if ledger is not None else LoanLedger()
+        self._batch = None
+        self._restore_holds()
+
+        # indexes kept up to date with every change of the catalog
+        # the search indexes are built on their first query (see LazyIndex), so startup only builds the cheap ones
+        self.indexes = []
+        self.tokens = self.add_index(LazyIndex(TokenIndex, self._lock))
+        self.trigrams = self.add_index(LazyIndex(TrigramIndex, self._lock))
+        self.numbers = self.add_index(LazyIndex(NumericIndex, self._lock))
+        self.fuzzy = self.add_index(LazyIndex(FuzzyIndex, self._lock))
+        self.prefixes = self.add_index(LazyIndex(PrefixIndex, self._lock))
+        self.search_cache = self.add_index(SearchCache())
+        self.ranker = self.add_index(LazyIndex(RelevanceRanker, self._lock))
+        self.availability = self.add_index(AvailabilityIndex())
+        self.demand = self.add_index(DemandTracker())
+        self.columns = None
+        if columnar and ColumnarCatalog.is_supported():
+            self.columns = self.add_index(ColumnarCatalog())
+
+        # the holds whose pickup window ended while the library was closed expire now
+        self.expire_holds()
+
+    #registers an index (see search.CatalogIndex) that is kept up to date with the catalog
+    def add_index(self, index):
+        index.rebuild(self.books, self.books_borrowed, self.waiting_list)
+        self.indexes.append(index)
+        return index
+
+    #returns up to limit titles starting with the prefix, for autocomplete
+    def complete_title(self, prefix, limit=10):
+        return self.prefixes.complete(prefix, limit)
 
     #retrieves the waiting list
     def get_waiting_list(self):
@@ -78,13 +174,73 @@ class Librarian:
 
     #adds a book to library or updates number of copies
     @log_operation("book added")
+    @synchronized
     def added(self, book: Book):
+        self._validate_book(book)
+
+        with self.batch():
+            self._add_book(book)
+
+    #adds many books with a single commit
+    #invalid books are skipped and appended to rejected as (book, reason), returns the number of books added
+    @log_operation("bulk add")
+    @synchronized
+    def bulk_add(self, books, rejected=None):
+        added_count = 0
+        titles_with_waiting_list = []
+        changed_books = {}
+
+        with self.batch():
+            for book in books:
+                try:
+                    self._validate_book(book)
+                except CustomException as e:
+                    if rejected is not None:
+                        rejected.append((book, str(e)))
+                    continue
+
+                title = book.title
+                self._remember(title)
+                existing_book = self.books.get(title)
+                if existing_book is None:
+                    self.books[title] = book
+                    existing_book = book
+                else:
+                    existing_book.total_copies += book.total_copies
+                    existing_book.available_copies = existing_book.total_copies - self.books_borrowed.get(title, 0)
+                changed_books[title] = existing_book
+                added_count += 1
+
+                if self.waiting_list.get(title):
+                    titles_with_waiting_list.append(title)
+            self._books_changed(changed_books.values())
+
+            # fulfil the waiting lists once all the copies are in
+            for title in dict.fromkeys(titles_with_waiting_list):
+                existing_book = self.books[title]
+                customers = self.waiting_list[title]
+                customers_to_notify = []
+                for _ in range(min(existing_book.available_copies, len(customers))):
+                    customers_to_notify.append(customers.popleft())
+                    self.loaned(existing_book, customers_to_notify[-1])
+                    self._hold(title, customers_to_notify[-1])
+                if customers_to_notify:
+                    self._waiting_list_removed(title, customers_to_notify)
+                    self._notify(existing_book, customers_to_notify, "addition")
+
+        return added_count
+
+    #checks that the copies and year of a book are valid
+    def _validate_book(self, book: Book):
         if not isinstance(book.total_copies, int) or not isinstance(book.year, int):
             raise NonIntegerValueException()
 
         if book.total_copies <= 0:
             raise NegativeCopiesException()
 
+    #adds the book or its copies, runs inside a batch so waiting list loans are written once
+    def _add_book(self, book: Book):
+        self._remember(book.title)
         customers_to_notify = []
         if book.title in self.books:
             existing_book = self.books[book.title]
@@ -96,25 +252,22 @@ class Librarian:
 
             if book.title in self.waiting_list and self.waiting_list[book.title]:
                 for _ in range(min(added_copies, len(self.waiting_list[book.title]))):
-                    next_customer = self.waiting_list[book.title].pop(0)
+                    next_customer = self.waiting_list[book.title].popleft()
                     customers_to_notify.append(next_customer)
-                    self.loaned(book)
+                    self.loaned(book, next_customer)
+                    self._hold(book.title, next_customer)
 
-                self.save_waiting_list()
+                self._waiting_list_removed(book.title, customers_to_notify)
                 if customers_to_notify:
-                    self.notification_subject.notify(book, customers_to_notify, "addition")
-
-            if existing_book.available_copies == 0:
-                existing_book.is_loaned = "Yes"
-            else:
-                existing_book.is_loaned = "No"
+                    self._notify(book, customers_to_notify, "addition")
         else:
             self.books[book.title] = book
 
-        self.save_books()
+        self._book_changed(self.books[book.title])
 
     #removes book from library
     @log_operation("book removed")
+    @synchronized
     def removed(self, book: Book) -> bool:
         if book.title not in self.books:
             raise BookDoesNotExistException()
@@ -122,24 +275,25 @@ class Librarian:
         if book.title in self.books_borrowed:
             raise RemovingBorrowedBookException()
 
+        self._remember(book.title)
         del self.books[book.title]
-        self.save_books()
+        self._book_removed(book.title)
         return True
 
-    #loans a book to costumer if there is an available copy
+    #loans a book to costumer if there is an available copy, the loan is recorded in the ledger
     @log_operation("book borrowed")
-    def loaned(self, book: Book) -> bool:
+    @synchronized
+    def loaned(self, book: Book, customer=None) -> bool:
         if book.title in self.books:
             current_book = self.books[book.title]
 
             if current_book.available_copies > 0:
+                self._remember(book.title)
                 current_book.available_copies -= 1
                 self.books_borrowed[book.title] = self.books_borrowed.get(book.title, 0) + 1
+                self._record_loan("lend", book.title, customer)
 
-                if current_book.available_copies == 0:
-                    current_book.is_loaned = "Yes"
-
-                self.save_books()
+                self._book_changed(current_book)
                 return True
             else:
                 raise NoCopyAvailableException()
@@ -148,48 +302,209 @@ class Librarian:
 
     #returns borrowed book to library.
     # if there is a waiting list for the book it loans it to the first costumer on the list
+    # the loan of the costumer is closed in the ledger, the oldest loan of the book when no costumer is given
+    # raises LoanDoesNotExistException when the costumer has no loan of the book
     @log_operation("book returned")
-    def returned(self, book: Book) -> bool:
+    @synchronized
+    def returned(self, book: Book, customer=None) -> bool:
         if book.title not in self.books:
             raise BookDoesNotExistException()
 
         if book.title not in self.books_borrowed:
             raise NoBorrowedCopiesException()
 
+        if customer is not None and not self._has_loan(book.title, customer):
+            raise LoanDoesNotExistException()
+
+        with self.batch():
+            self._return_book(book, customer)
+        return True
+
+    #returns the copy and passes it to the next costumer, runs inside a batch
+    def _return_book(self, book: Book, customer=None):
+        self._remember(book.title)
         current_book = self.books[book.title]
         current_book.available_copies += 1
 
         self.books_borrowed[book.title] -= 1
         if self.books_borrowed[book.title] == 0:
             del self.books_borrowed[book.title]
-            current_book.is_loaned = "No"
-        else:
-            current_book.is_loaned = "Yes"
+        self._record_loan("give_back", book.title, customer)
+        if customer is not None:
+            self._release_hold(book.title, customer)
 
         if book.title in self.waiting_list and self.waiting_list[book.title]:
-            next_customer = self.waiting_list[book.title].pop(0)
-            self.save_waiting_list()
-            self.notification_subject.notify(book, [next_customer], "return")
-            self.loaned(book)
+            next_customer = self.waiting_list[book.title].popleft()
+            self._waiting_list_removed(book.title, [next_customer])
+            self._notify(book, [next_customer], "return")
+            self.loaned(book, next_customer)
+            self._hold(book.title, next_customer)
 
-        self.save_books()
-        return True
+        self._book_changed(current_book)
 
     #adds costumer to waiting list if no copies are available
     @log_operation("add to waiting list")
+    @synchronized
     def waiting_for_book(self, book, customer=None):
         if customer is None:
             customer = self.create_customer()
 
-        if book.title in self.waiting_list:
-            for existing_customer in self.waiting_list[book.title]:
-                if existing_customer.name == customer.name and existing_customer.phone == customer.phone:
-                    raise ValueError(f"Customer {customer.name} is already in waiting list for book '{book.title}'")
+        if customer in self.waiting_list.get(book.title, ()):
+            raise ValueError(f"Customer {customer.name} is already in waiting list for book '{book.title}'")
+        if not self.waiting_policy.can_hold(customer, len(self.waiting_list.titles_of(customer))):
+            raise HoldLimitExceededException(
+                f"Customer {customer.name} is already on {self.waiting_policy.max_holds} waiting lists")
+        self._remember(book.title)
+        priority = self.waiting_policy.priority(customer)
+        self.waiting_list.setdefault(book.title).append(customer, priority)
+        self._waiting_list_added(book.title, customer, priority)
+
+    #hands the copy held for a costumer to the costumer, the hold no longer expires
+    @log_operation("hold picked up")
+    @synchronized
+    def picked_up(self, book, customer):
+        key = (book.title, customer_key(customer))
+        if self.holds.pop(key, None) is None:
+            raise HoldDoesNotExistException()
+        self.hold_scheduler.cancel(key)
+        self._release_loan_hold(book.title, customer)
+        return True
+
+    #returns (title, costumer, deadline) for every copy held for a costumer, earliest deadline first
+    def pending_holds(self):
+        with self._lock:
+            holds = [(title, customer, self.hold_scheduler.deadline((title, key)))
+                     for (title, key), customer in self.holds.items()]
+        return sorted(holds, key=lambda hold: hold[2])
+
+    #starts the background thread expiring the holds
+    def start_hold_expiry(self):
+        self.hold_scheduler.start()
+
+    #expires the holds whose deadline passed, for use without the background thread
+    #returns the number of holds expired
+    def expire_holds(self):
+        return len(self.hold_scheduler.run_due())
+
+    #moves the due time of the loan of a book by a costumer a loan period from now, returns the loan
+    @log_operation("loan renewed")
+    @synchronized
+    def renewed(self, book, customer):
+        loan = self.ledger.find(book.title, customer)
+        if loan is None:
+            raise LoanDoesNotExistException()
+        return self.ledger.renew(loan.loan_id)
+
+    #returns the open loans of a costumer, oldest first
+    def loans_of(self, customer):
+        return self.ledger.loans_of(customer)
+
+    #returns the loans due before now (the current time of the ledger by default), earliest due first
+    def overdue_loans(self, now=None):
+        return self.ledger.overdue(now)
+
+    #records a loan or a return in the ledger, or keeps it until the open batch is committed
+    def _record_loan(self, change, title, customer):
+        if self._batch is not None:
+            self._batch.loans.append((change, title, customer))
+        else:
+            getattr(self.ledger, change)(title, customer)
+
+    #checks if a costumer has an open loan of a title, counting the loans and returns of the open batch
+    def _has_loan(self, title, customer):
+        key = customer_key(customer)
+        count = sum(1 for loan in self.ledger.loans_of(customer) if loan.title == title)
+        if self._batch is not None:
+            for change, loan_title, loan_customer in self._batch.loans:
+                if loan_title == title and loan_customer is not None and customer_key(loan_customer) == key:
+                    count += 1 if change == "lend" else -1
+        return count > 0
+
+    #holds the copy loaned to a waiting costumer, or keeps the hold until the open batch is committed
+    def _hold(self, title, customer):
+        if self.hold_period is None:
+            return
+        if self._batch is not None:
+            self._batch.holds.append(("start", title, customer))
+        else:
+            self._start_hold(title, customer)
+
+    #drops the hold of a costumer who returned the copy, or keeps the change until the open batch is committed
+    def _release_hold(self, title, customer):
+        if self.hold_period is None:
+            return
+        if self._batch is not None:
+            self._batch.holds.append(("cancel", title, customer))
         else:
-            self.waiting_list[book.title] = []
+            self._cancel_hold(title, customer)
+
+    #starts the pickup window of a hold, its deadline is recorded with the loan so it survives restarts
+    def _start_hold(self, title, customer):
+        key = (title, customer_key(customer))
+        self.holds[key] = customer
+        self.hold_scheduler.schedule(key, self.hold_period)
+        loan = self.ledger.find(title, customer)
+        if loan is not None:
+            self.ledger.hold(loan.loan_id, self.ledger.clock() + self.hold_period)
+
+    #ends the pickup window of a hold without expiring it
+    def _cancel_hold(self, title, customer):
+        key = (title, customer_key(customer))
+        self.holds.pop(key, None)
+        self.hold_scheduler.cancel(key)
+        self._release_loan_hold(title, customer)
+
+    #ends the hold recorded with the loan of a costumer, if any
+    def _release_loan_hold(self, title, customer):
+        loan = self.ledger.find(title, customer)
+        if loan is not None:
+            self.ledger.release(loan.loan_id)
+
+    #schedules the holds recorded in the ledger, the ones past their deadline are due at once
+    #the ledger deadlines are times since the epoch, so they are turned into delays for the scheduler clock
+    def _restore_holds(self):
+        now = self.ledger.clock()
+        for loan in self.ledger.held():
+            if loan.customer is None:
+                continue
+            key = (loan.title, customer_key(loan.customer))
+            self.holds[key] = loan.customer
+            self.hold_scheduler.schedule(key, max(0, loan.hold_until - now))
+
+    #called by the scheduler when the pickup window of a hold ends
+    #the costumer is notified and the copy is returned, which passes it to the next waiting costumer
+    #nothing is returned when the costumer no longer has the copy, so the copy of another costumer is not taken
+    @log_operation("hold expired")
+    @synchronized
+    def _expire_hold(self, key):
+        customer = self.holds.pop(key, None)
+        title = key[0]
+        if customer is None:
+            return False
+        if title not in self.books or self.ledger.find(title, customer) is None:
+            self._release_loan_hold(title, customer)
+            return False
+        book = self.books[title]
+        with self.batch():
+            self._notify(book, [customer], "hold_expired")
+            self._return_book(book, customer)
+        return True
 
-        self.waiting_list[book.title].append(customer)
-        self.save_waiting_list()
+    #returns the titles of the waiting lists a costumer is on
+    def waiting_lists_of(self, customer):
+        return self.waiting_list.titles_of(customer)
+
+    #removes a costumer from every waiting list, returns the titles of the lists the costumer was on
+    @log_operation("remove from waiting lists")
+    @synchronized
+    def remove_from_waiting_lists(self, customer):
+        titles = self.waiting_list.titles_of(customer)
+        with self.batch():
+            for title in titles:
+                self._remember(title)
+                self.waiting_list[title].remove(customer)
+                self._waiting_list_removed(title, [customer])
+        return titles
 
     #creates a costumer object
     def create_customer(self):
@@ -206,38 +521,199 @@ class Librarian:
     returns most demanded books based on:
     1. the number of borrowed copies
     2. the size of the waiting list
-    final demand score=number of borrowed copies+size of waiting list"""
+    final demand score=number of borrowed copies+size of waiting list
+    returns (title, demand score, borrowed copies, waiting list size) tuples from the highest score,
+    read from the demand tracker"""
     def get_most_demanded_books(self, limit=10):
+        return self.demand.top(limit)
+
+    #groups several operations: storage writes and notifications are deferred to a single commit
+    #when the scope ends, and the in-memory state is rolled back if an exception is raised
+    #the librarian lock is held for the whole scope, so holds expiring on the scheduler thread wait for it
+    #instead of landing in the batch of another thread
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            if self._batch is not None:
+                yield self
+                return
+
+            self._batch = LibrarianBatch()
+            try:
+                yield self
+            except BaseException:
+                batch, self._batch = self._batch, None
+                self._rollback(batch)
+                raise
+
+            batch, self._batch = self._batch, None
+            self._commit(batch)
+
+    #alias of batch
+    def transaction(self):
+        return self.batch()
+
+    #writes the changes of a batch with a single storage transaction and sends its notifications
+    def _commit(self, batch):
+        for _, _, _, waiting in batch.undo.values():
+            if waiting is not None:
+                waiting.forget_changes()
+        with self.storage.transaction():
+            for title in batch.removed:
+                self.storage.delete_book(title)
+            for book in batch.books.values():
+                self.storage.save_book(book, self.books_borrowed.get(book.title, 0))
+            for change, title, customers in batch.waiting_list_changes:
+                if change == "add":
+                    for customer, priority in customers:
+                        self.storage.add_waiting(title, customer, priority)
+                else:
+                    self.storage.remove_waiting(title, customers)
+
+        for change, title, customer in batch.loans:
+            getattr(self.ledger, change)(title, customer)
+        for change, title, customer in batch.holds:
+            if change == "start":
+                self._start_hold(title, customer)
+            else:
+                self._cancel_hold(title, customer)
+        for book, customers, event_type in batch.notifications:
+            self.notification_subject.notify(book, customers, event_type)
+
+    #restores the titles changed in a batch to the state they had before it
+    def _rollback(self, batch):
+        for title, (book, fields, borrowed, waiting) in batch.undo.items():
+            if book is None:
+                self.books.pop(title, None)
+            else:
+                book.total_copies, book.available_copies = fields
+                self.books[title] = book
 
-        book_demand = []
-
-        for title, book in self.books.items():
-            # number of borrowed copies
-            borrowed_copies = self.books_borrowed.get(title, 0)
-
-            # number of people on waiting list
-            waiting_list_count = len(self.waiting_list.get(title, []))
-
-            # final demand score
-            total_demand = borrowed_copies + waiting_list_count
-
-            book_demand.append((
-                title,
-                total_demand,
-                borrowed_copies,
-                waiting_list_count
-            ))
-
-        # order from highest score to lowest
-        sorted_books = sorted(book_demand, key=lambda x: x[1], reverse=True)
+            if borrowed is None:
+                self.books_borrowed.pop(title, None)
+            else:
+                self.books_borrowed[title] = borrowed
 
-        # returns a list of the requested length
-        return sorted_books[:limit]
+            if waiting is None:
+                self.waiting_list.pop(title, None)
+            else:
+                waiting.undo_changes()
+
+            for index in self.indexes:
+                if title in self.books:
+                    index.book_changed(self.books[title], self.books_borrowed.get(title, 0))
+                else:
+                    index.book_removed(title)
+                index.waiting_list_changed(title, len(self.waiting_list.get(title, [])))
+        self.logger.log_error("batch rolled back")
+
+    #remembers the state of a title the first time it changes inside a batch
+    #the waiting list is not copied, its queue records the changes made to it instead
+    def _remember(self, title):
+        if self._batch is None or title in self._batch.undo:
+            return
+        book = self.books.get(title)
+        waiting = self.waiting_list.get(title)
+        if waiting is not None:
+            waiting.record_changes()
+        self._batch.undo[title] = (
+            book,
+            (book.total_copies, book.available_copies) if book is not None else None,
+            self.books_borrowed.get(title),
+            waiting
+        )
+
+    #notifies the observers, or keeps the notification until the open batch is committed
+    def _notify(self, book, customers, event_type):
+        if self._batch is not None:
+            self._batch.notifications.append((book, customers, event_type))
+        else:
+            self.notification_subject.notify(book, customers, event_type)
 
-    #saves the current state of the library's books to books.cvs
+    #saves the current state of the library's books to storage
     def save_books(self):
-        CSVHandler.save_books_to_csv(self.books)
+        self.storage.save_books()
 
-    #saves the current state of the waiting list to waiting_list.cvs
+    #saves the current state of the waiting list to storage
     def save_waiting_list(self):
-        CSVHandler.save_waiting_list_to_csv(self.waiting_list)
+        self.storage.save_waiting_list()
+
+    #writes a full snapshot of the library (folds the journal when in journal mode)
+    def compact(self):
+        self.storage.compact()
+        self.logger.log_info("storage compacted")
+
+    #writes a binary snapshot of the current state
+    def checkpoint(self):
+        self.storage.write_snapshot()
+
+    #writes a snapshot and closes the storage on clean shutdown
+    def close(self):
+        self.hold_scheduler.stop()
+        self.ledger.close_file()
+        self.checkpoint()
+        self.storage.close()
+
+    #updates the indexes and persists the state of a single book
+    def _book_changed(self, book):
+        borrowed_copies = self.books_borrowed.get(book.title, 0)
+        for index in self.indexes:
+            index.book_changed(book, borrowed_copies)
+        self._save_book(book, borrowed_copies)
+
+    #updates the indexes and persists the state of many books
+    #when they are a large part of the catalog, the indexes are rebuilt once instead of updated book by book
+    def _books_changed(self, books):
+        books = list(books)
+        if len(books) * 4 < len(self.books):
+            for book in books:
+                self._book_changed(book)
+            return
+        for index in self.indexes:
+            index.rebuild(self.books, self.books_borrowed, self.waiting_list)
+        for book in books:
+            self._save_book(book, self.books_borrowed.get(book.title, 0))
+
+    #persists the state of a single book, or keeps it until the open batch is committed
+    def _save_book(self, book, borrowed_copies):
+        if self._batch is not None:
+            self._batch.removed.discard(book.title)
+            self._batch.books[book.title] = book
+            return
+        self.storage.save_book(book, borrowed_copies)
+
+    #updates the indexes and persists the removal of a book
+    def _book_removed(self, title):
+        for index in self.indexes:
+            index.book_removed(title)
+
+        if self._batch is not None:
+            self._batch.books.pop(title, None)
+            self._batch.removed.add(title)
+            return
+        self.storage.delete_book(title)
+
+    #updates the indexes and persists a costumer joining the waiting list of a book
+    #the priority is kept with the change, the costumer may have left the list by the time the batch is committed
+    def _waiting_list_added(self, title, customer, priority):
+        self._waiting_list_changed(title)
+
+        if self._batch is not None:
+            self._batch.waiting_list_changes.append(("add", title, [(customer, priority)]))
+            return
+        self.storage.add_waiting(title, customer, priority)
+
+    #updates the indexes and persists costumers leaving the waiting list of a book
+    def _waiting_list_removed(self, title, customers):
+        self._waiting_list_changed(title)
+
+        if self._batch is not None:
+            self._batch.waiting_list_changes.append(("remove", title, list(customers)))
+            return
+        self.storage.remove_waiting(title, customers)
+
+    #tells the indexes the new length of a waiting list
+    def _waiting_list_changed(self, title):
+        waiting_count = len(self.waiting_list.get(title, []))
+        for index in self.indexes:
+            index.waiting_list_changed(title, waiting_count)
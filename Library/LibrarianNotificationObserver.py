@@ -37,6 +37,8 @@ class LibrarianNotificationObserver(Observer):
                 message = f"The book '{book.title}' returned and loaned to:"
             elif event_type == "addition":
                 message = f"Were added {book.total_copies} copies of the book '{book.title}' and were loaned to:"
+            elif event_type == "hold_expired":
+                message = f"The copy of the book '{book.title}' held for pickup was not collected in time by:"
             else:
                 return
 
@@ -0,0 +1,229 @@
+import heapq
+import time
+from Library.Customer import Customer
+from Library.WaitingList import customer_key
+from system.Journal import Journal
+
+
+#a copy of a book loaned to a costumer (None for loans made without a costumer) until the due time
+#hold_until is the end of the pickup window while the copy is held for the costumer, None otherwise
+class Loan:
+    __slots__ = ('loan_id', 'title', 'customer', 'loaned_at', 'due', 'renewals', 'hold_until')
+
+    def __init__(self, loan_id, title, customer, loaned_at, due, renewals=0, hold_until=None):
+        self.loan_id = loan_id
+        self.title = title
+        self.customer = customer
+        self.loaned_at = loaned_at
+        self.due = due
+        self.renewals = renewals
+        self.hold_until = hold_until
+
+    def __repr__(self):
+        name = self.customer.name if self.customer is not None else None
+        return f"Loan({self.loan_id}, {self.title!r}, {name!r}, due={self.due})"
+
+
+#the open loans by loan id, with indexes by costumer and by title and a min-heap of due times, so the
+#loans of a costumer or of a title are read directly and the overdue loans are found without going
+#over the loans that are not due yet.
+#every change is appended to a journal file (when a path is given) and replayed when the ledger is opened,
+#the journal is rewritten with only the open loans once it holds many closed ones
+class LoanLedger:
+    DEFAULT_LOAN_PERIOD = 14 * 24 * 60 * 60  # two weeks, in seconds
+
+    #initializes the ledger and loads the open loans from its file
+    #clock returns the current time in seconds since the epoch, due times are absolute so they survive restarts
+    def __init__(self, file_path=None, loan_period=DEFAULT_LOAN_PERIOD, clock=time.time, compact_threshold=10000):
+        self.loan_period = loan_period
+        self.clock = clock
+        self.compact_threshold = compact_threshold
+        self.loans = {}  # loan id -> Loan
+        self.by_customer = {}  # costumer key -> loan ids, oldest first
+        self.by_title = {}  # title -> loan ids, oldest first
+        self.due_heap = []  # (due, loan id), including entries of returned or renewed loans
+        self.next_id = 1
+        self.journal = Journal(file_path) if file_path else None
+        if self.journal is not None:
+            count = 0
+            for record in self.journal.read():
+                self._apply(record)
+                count += 1
+            self.journal.record_count = count
+
+    #records a loan of a copy of a title and returns it
+    def lend(self, title, customer=None):
+        now = self.clock()
+        loan = Loan(self.next_id, title, customer, now, now + self.loan_period)
+        self._add(loan)
+        self._write(self._loan_record(loan))
+        return loan
+
+    #closes the loan of a title returned by a costumer and returns it, the oldest loan of the title when no
+    #costumer is given. returns None when there is no such loan, the loan of another costumer is never closed
+    def give_back(self, title, customer=None):
+        if customer is not None:
+            loan = self.find(title, customer)
+        else:
+            loan_ids = self.by_title.get(title)
+            loan = self.loans[next(iter(loan_ids))] if loan_ids else None
+        if loan is None:
+            return None
+        return self.close(loan.loan_id)
+
+    #closes a loan and returns it
+    def close(self, loan_id):
+        loan = self._remove(loan_id)
+        self._write({'op': 'return', 'id': loan_id})
+        self._compact()
+        return loan
+
+    #moves the due time of a loan to a loan period (or the given period) from now, returns the loan
+    def renew(self, loan_id, period=None):
+        loan = self.loans[loan_id]
+        loan.due = self.clock() + (self.loan_period if period is None else period)
+        loan.renewals += 1
+        heapq.heappush(self.due_heap, (loan.due, loan_id))
+        self._write({'op': 'renew', 'id': loan_id, 'due': loan.due})
+        self._compact()
+        return loan
+
+    #holds the copy of a loan for its costumer to pick up until the deadline (seconds since the epoch)
+    #returns the loan
+    def hold(self, loan_id, deadline):
+        loan = self.loans[loan_id]
+        loan.hold_until = deadline
+        self._write({'op': 'hold', 'id': loan_id, 'until': deadline})
+        self._compact()
+        return loan
+
+    #ends the hold of a loan (the copy was picked up or the hold expired), returns the loan
+    def release(self, loan_id):
+        loan = self.loans[loan_id]
+        if loan.hold_until is not None:
+            loan.hold_until = None
+            self._write({'op': 'release', 'id': loan_id})
+            self._compact()
+        return loan
+
+    #returns the loans whose copy is held for their costumer, earliest deadline first
+    def held(self):
+        return sorted((loan for loan in self.loans.values() if loan.hold_until is not None),
+                      key=lambda loan: (loan.hold_until, loan.loan_id))
+
+    #returns the oldest open loan of a title by a costumer, or None
+    def find(self, title, customer):
+        for loan_id in self.by_customer.get(customer_key(customer), ()):
+            if self.loans[loan_id].title == title:
+                return self.loans[loan_id]
+        return None
+
+    #returns the open loans of a costumer, oldest first
+    def loans_of(self, customer):
+        return [self.loans[loan_id] for loan_id in self.by_customer.get(customer_key(customer), ())]
+
+    #returns the open loans of a title, oldest first
+    def loans_for(self, title):
+        return [self.loans[loan_id] for loan_id in self.by_title.get(title, ())]
+
+    #returns the loans due before now (the current time by default), earliest due first
+    #only the part of the heap holding earlier due times is visited
+    def overdue(self, now=None):
+        now = self.clock() if now is None else now
+        heap = self.due_heap
+        overdue = []
+        stack = [0] if heap else []
+        while stack:
+            position = stack.pop()
+            due, loan_id = heap[position]
+            if due >= now:
+                continue  # the children of an entry are not due earlier
+            loan = self.loans.get(loan_id)
+            if loan is not None and loan.due == due:
+                overdue.append(loan)
+            stack.extend(child for child in (2 * position + 1, 2 * position + 2) if child < len(heap))
+        overdue.sort(key=lambda loan: (loan.due, loan.loan_id))
+        return overdue
+
+    def __len__(self):
+        return len(self.loans)
+
+    def __contains__(self, loan_id):
+        return loan_id in self.loans
+
+    #closes the ledger file
+    def close_file(self):
+        if self.journal is not None:
+            self.journal.close()
+
+    #adds a loan to the indexes
+    def _add(self, loan):
+        self.loans[loan.loan_id] = loan
+        self.next_id = max(self.next_id, loan.loan_id + 1)
+        self.by_title.setdefault(loan.title, {})[loan.loan_id] = None
+        if loan.customer is not None:
+            self.by_customer.setdefault(customer_key(loan.customer), {})[loan.loan_id] = None
+        heapq.heappush(self.due_heap, (loan.due, loan.loan_id))
+
+    #removes a loan from the indexes and returns it, its heap entry is skipped from now on
+    def _remove(self, loan_id):
+        loan = self.loans.pop(loan_id)
+        self._unindex(self.by_title, loan.title, loan_id)
+        if loan.customer is not None:
+            self._unindex(self.by_customer, customer_key(loan.customer), loan_id)
+        return loan
+
+    #removes a loan id from an index
+    @staticmethod
+    def _unindex(index, key, loan_id):
+        loan_ids = index[key]
+        del loan_ids[loan_id]
+        if not loan_ids:
+            del index[key]
+
+    #applies a record read back from the file
+    def _apply(self, record):
+        op = record.get('op')
+        loan_id = record.get('id')
+        if op == 'loan':
+            customer = None
+            if record.get('name') is not None:
+                customer = Customer.from_trusted(record['name'], record['phone'], record['email'])
+            self._add(Loan(loan_id, record['title'], customer, record['loaned_at'], record['due'],
+                           record.get('renewals', 0), record.get('hold_until')))
+        elif op == 'return' and loan_id in self.loans:
+            self._remove(loan_id)
+        elif op == 'renew' and loan_id in self.loans:
+            loan = self.loans[loan_id]
+            loan.due = record['due']
+            loan.renewals += 1
+            heapq.heappush(self.due_heap, (loan.due, loan_id))
+        elif op == 'hold' and loan_id in self.loans:
+            self.loans[loan_id].hold_until = record['until']
+        elif op == 'release' and loan_id in self.loans:
+            self.loans[loan_id].hold_until = None
+
+    #appends a record to the file
+    def _write(self, record):
+        if self.journal is not None:
+            self.journal.append(record)
+
+    #drops the entries of closed and renewed loans from the heap, and rewrites the file with only the open
+    #loans, once they are mostly stale
+    def _compact(self):
+        if len(self.due_heap) > 2 * len(self.loans) + 64:
+            self.due_heap = [(loan.due, loan_id) for loan_id, loan in self.loans.items()]
+            heapq.heapify(self.due_heap)
+        if self.journal is not None and self.journal.record_count > max(self.compact_threshold, 2 * len(self.loans)):
+            self.journal.reset([self._loan_record(loan) for loan in self.loans.values()])
+
+    #returns the record restoring an open loan
+    @staticmethod
+    def _loan_record(loan):
+        record = {'op': 'loan', 'id': loan.loan_id, 'title': loan.title, 'loaned_at': loan.loaned_at,
+                  'due': loan.due, 'renewals': loan.renewals}
+        if loan.hold_until is not None:
+            record['hold_until'] = loan.hold_until
+        if loan.customer is not None:
+            record.update(name=loan.customer.name, phone=loan.customer.phone, email=loan.customer.email)
+        return record
@@ -0,0 +1,230 @@
+import heapq
+
+
+#returns the key identifying a costumer on the waiting lists (a costumer is its name and phone)
+def customer_key(customer):
+    return customer.name, customer.phone
+
+
+#the waiting list of one book: a heap of (priority, arrival, costumer) entries, the costumer with the lowest
+#priority is served first and costumers with the same priority are served in the order they joined, so
+#with a single priority the list is first come first served. a dict of the costumers on the list answers
+#membership without scanning it.
+#a costumer leaving the list from the middle only marks its entry as removed, the entry is dropped when it
+#reaches the top of the heap (or when most of the heap is removed entries)
+class WaitingQueue:
+    #initializes the queue with the given costumers, or with the entries of another queue
+    #owner is the WaitingList keeping the reverse index
+    def __init__(self, customers=(), title=None, owner=None):
+        self.title = title
+        self.owner = owner
+        self.heap = []  # (priority, arrival number, costumer), including the entries of costumers that left
+        self.arrivals = 0
+        self.members = {}  # costumer key -> its entries on the list (more than 1 only in old files)
+        self.priorities = {}  # costumer key -> priority
+        self.removed = set()  # arrival numbers of the entries in the heap whose costumer left
+        self.size = 0  # number of entries that were not removed
+        self.changes = None  # ("append" / "pop", entry) made since record_changes(), in order
+        if isinstance(customers, WaitingQueue):
+            for customer, priority in customers.entries():
+                self.append(customer, priority)
+        else:
+            for customer in customers:
+                self.append(customer)
+
+    #adds a costumer behind the costumers with the same or a lower priority
+    def append(self, customer, priority=0):
+        entry = (priority, self.arrivals, customer)
+        heapq.heappush(self.heap, entry)
+        self.arrivals += 1
+        if self.changes is not None:
+            self.changes.append(("append", entry))
+        self._joined(entry)
+
+    #removes and returns the next costumer to serve
+    def popleft(self):
+        self._drop_removed()
+        entry = heapq.heappop(self.heap)
+        if self.changes is not None:
+            self.changes.append(("pop", entry))
+        self._left(entry)
+        return entry[2]
+
+    #returns the next costumer to serve without removing it, raises IndexError when the list is empty
+    def peek(self):
+        self._drop_removed()
+        return self.heap[0][2]
+
+    #removes the entry of a costumer (matched by name and phone) served first, returns False when it is missing
+    #the entry stays in the heap marked as removed
+    def remove(self, customer):
+        entries = self.members.get(customer_key(customer))
+        if not entries:
+            return False
+        entry = min(entries, key=lambda entry: entry[:2])
+        if self.changes is not None:
+            self.changes.append(("pop", entry))
+        self.removed.add(entry[1])
+        self._left(entry)
+        self._compact()
+        return True
+
+    #drops the removed entries from the top of the heap
+    def _drop_removed(self):
+        while self.heap and self.heap[0][1] in self.removed:
+            self.removed.discard(heapq.heappop(self.heap)[1])
+
+    #rebuilds the heap without the removed entries once they are most of it
+    def _compact(self):
+        if len(self.removed) > self.size + 64:
+            self.heap = [entry for entry in self.heap if entry[1] not in self.removed]
+            heapq.heapify(self.heap)
+            self.removed.clear()
+
+    #starts recording the changes of the queue, so they can be undone without copying it
+    def record_changes(self):
+        self.changes = []
+
+    #stops recording, the changes made are kept
+    def forget_changes(self):
+        self.changes = None
+
+    #undoes the changes recorded since record_changes(), the costumers that left are put back in their place
+    def undo_changes(self):
+        changes, self.changes = self.changes or [], None
+        for change, entry in reversed(changes):
+            if change == "append":
+                self.removed.add(entry[1])
+                self._left(entry)
+            else:
+                if entry[1] in self.removed:
+                    self.removed.discard(entry[1])  # the entry is still in the heap
+                else:
+                    heapq.heappush(self.heap, entry)
+                self._joined(entry)
+        self._compact()
+
+    #records an entry of a costumer that joined the queue
+    def _joined(self, entry):
+        key = customer_key(entry[2])
+        entries = self.members.setdefault(key, [])
+        entries.append(entry)
+        self.priorities[key] = entry[0]
+        self.size += 1
+        if len(entries) == 1 and self.owner is not None:
+            self.owner._joined(key, self.title)
+
+    #forgets an entry of a costumer that left the queue
+    def _left(self, entry):
+        key = customer_key(entry[2])
+        entries = self.members[key]
+        entries.remove(entry)
+        self.size -= 1
+        if entries:
+            return
+        del self.members[key]
+        del self.priorities[key]
+        if self.owner is not None:
+            self.owner._left(key, self.title)
+
+    #returns the priority of a costumer on the list
+    def priority_of(self, customer):
+        return self.priorities[customer_key(customer)]
+
+    #returns (costumer, priority) pairs in the order the costumers will be served
+    #the whole list is sorted, peek() reads only the next costumer
+    def entries(self):
+        entries = [entry for entry in self.heap if entry[1] not in self.removed]
+        return [(customer, priority) for priority, _, customer in sorted(entries, key=lambda entry: entry[:2])]
+
+    #checks if a costumer (matched by name and phone) is on the list
+    def __contains__(self, customer):
+        return customer_key(customer) in self.members
+
+    def __len__(self):
+        return self.size
+
+    #iterates over the costumers in the order they will be served
+    def __iter__(self):
+        return (customer for customer, _ in self.entries())
+
+    #the costumer at a position in serving order, the first one is read from the top of the heap
+    def __getitem__(self, position):
+        if position == 0:
+            return self.peek()
+        return self.entries()[position][0]
+
+    def __repr__(self):
+        return f"WaitingQueue({self.entries()!r})"
+
+
+#the waiting lists of all the books, as a dict of title -> WaitingQueue
+#lists assigned to it are turned into queues, and a reverse index of costumer -> titles tells which
+#lists a costumer is on without going over all of them
+class WaitingList(dict):
+    #initializes the waiting lists from a dict of title -> costumers
+    def __init__(self, waiting_lists=None):
+        super().__init__()
+        self.customer_titles = {}  # costumer key -> titles of the lists the costumer is on, in joining order
+        if waiting_lists:
+            for title, customers in waiting_lists.items():
+                self[title] = customers
+
+    def __setitem__(self, title, customers):
+        if title in self:
+            self._forget(title)
+        super().__setitem__(title, WaitingQueue(customers, title, self))
+
+    def __delitem__(self, title):
+        self._forget(title)
+        super().__delitem__(title)
+
+    def setdefault(self, title, customers=()):
+        if title not in self:
+            self[title] = customers
+        return self[title]
+
+    def pop(self, title, *default):
+        if title not in self:
+            if default:
+                return default[0]
+            raise KeyError(title)
+        self._forget(title)
+        return super().pop(title)
+
+    def update(self, waiting_lists=(), **kwargs):
+        for title, customers in dict(waiting_lists, **kwargs).items():
+            self[title] = customers
+
+    def clear(self):
+        super().clear()
+        self.customer_titles.clear()
+
+    #removes the costumers of a list from the reverse index before the list is replaced or deleted
+    def _forget(self, title):
+        queue = super().__getitem__(title)
+        for key in queue.members:
+            self._left(key, title)
+        queue.owner = None
+
+    #records a costumer joining the list of a title
+    def _joined(self, key, title):
+        self.customer_titles.setdefault(key, {})[title] = None
+
+    #records a costumer leaving the list of a title
+    def _left(self, key, title):
+        titles = self.customer_titles[key]
+        del titles[title]
+        if not titles:
+            del self.customer_titles[key]
+
+    #returns the titles of the waiting lists a costumer is on
+    def titles_of(self, customer):
+        return list(self.customer_titles.get(customer_key(customer), ()))
+
+    #removes a costumer from every waiting list, returns the titles of the lists the costumer was on
+    def remove_customer(self, customer):
+        titles = self.titles_of(customer)
+        for title in titles:
+            self[title].remove(customer)
+        return titles
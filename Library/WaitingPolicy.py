@@ -0,0 +1,32 @@
+#decides the order the costumers of a waiting list are served in, and how many waiting lists one costumer
+#may be on at the same time. the default policy is first come first served with no limit
+class WaitingPolicy:
+    #initializes the policy, max_holds limits the waiting lists of one costumer (None for no limit)
+    def __init__(self, max_holds=None):
+        self.max_holds = max_holds
+
+    #returns the priority of a costumer joining a waiting list, lower priorities are served first and
+    #costumers with the same priority are served in the order they joined
+    def priority(self, customer):
+        return 0
+
+    #checks if a costumer already on the given number of waiting lists may join another one
+    def can_hold(self, customer, holds):
+        return self.max_holds is None or holds < self.max_holds
+
+
+#serves costumers who need accessibility priority first, then by membership tier
+class PriorityWaitingPolicy(WaitingPolicy):
+    TIERS = {'staff': 1, 'premium': 2, 'regular': 3}
+    ACCESSIBILITY_PRIORITY = 0
+
+    #initializes the policy, tiers maps a membership tier to its priority (unknown tiers are served last)
+    def __init__(self, tiers=None, accessibility_first=True, max_holds=None):
+        super().__init__(max_holds)
+        self.tiers = dict(tiers) if tiers is not None else dict(self.TIERS)
+        self.accessibility_first = accessibility_first
+
+    def priority(self, customer):
+        if self.accessibility_first and customer.accessibility:
+            return self.ACCESSIBILITY_PRIORITY
+        return self.tiers.get(customer.tier, max(self.tiers.values(), default=0) + 1)
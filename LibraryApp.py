@@ -7,16 +7,24 @@ import os
 
 from Error.BookDoesNotExistException import BookDoesNotExistException
 from Error.CustomException import CustomException
+from Error.HoldLimitExceededException import HoldLimitExceededException
 from Error.NoCopyAvailableException import NoCopyAvailableException
 from Books.Book import Book
 from Library.Customer import Customer
 from Library.Librarian import Librarian
+from Library.LoanLedger import LoanLedger
+from Library.WaitingPolicy import PriorityWaitingPolicy
 from search.Search import Search
-from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy, GenreSearchStrategy, YearSearchStrategy
+from search.LazyResults import LazyResults
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy, GenreSearchStrategy, YearSearchStrategy, \
+    YearRangeSearchStrategy, CopiesRangeSearchStrategy, AvailableCopiesSearchStrategy, FuzzySearchStrategy
 
 
 # initialize the library manegment system application
 class LibraryApp:
+    PAGE_SIZE = 200  # rows added to a treeview at a time
+    HOLD_PERIOD = 3 * 24 * 60 * 60  # three days to pick up a held copy, in seconds
+
     #initialize the root GUI window
     def __init__(self, file_path=None):
         self.root = tk.Tk()
@@ -32,12 +40,23 @@ class LibraryApp:
             base_path = os.path.dirname(os.path.abspath(__file__))
             file_path = os.path.join(base_path, 'files', 'books.csv')
             waiting_list_path = os.path.join(base_path, 'files', 'waiting_list.csv')
+            snapshot_path = os.path.join(base_path, 'files', 'library.snapshot')
+            loans_path = os.path.join(base_path, 'files', 'loans.jsonl')
         else:
             base_dir = os.path.dirname(file_path)
             waiting_list_path = os.path.join(base_dir, 'files', 'waiting_list.csv')
+            snapshot_path = os.path.join(base_dir, 'files', 'library.snapshot')
+            loans_path = os.path.join(base_dir, 'files', 'loans.jsonl')
 
         # create librarian object to manage books and waiting lists
-        self.librarian = Librarian(books_path=file_path, waiting_list_path=waiting_list_path)
+        # the snapshot written on close is used for the next start while the csv files did not change
+        # waiting lists serve accessibility needs first, then by membership tier
+        # loans and their due dates are appended to the loan ledger file
+        # a copy passed to a waiting costumer is held for HOLD_PERIOD, then it passes to the next one
+        self.librarian = Librarian(books_path=file_path, waiting_list_path=waiting_list_path,
+                                   snapshot_path=snapshot_path, waiting_policy=PriorityWaitingPolicy(),
+                                   hold_period=self.HOLD_PERIOD, ledger=LoanLedger(loans_path))
+        self.librarian.start_hold_expiry()
 
         #initialize main menu and login frame
         self.main_menu = tk.Frame(self.root)
@@ -47,6 +66,76 @@ class LibraryApp:
         # load books directly from librarian object
         self.books = self.librarian.books
 
+    #shows the titles starting with what was typed in an entry in a list below it
+    #the list is updated once typing pauses for delay milliseconds, choosing a title fills the entry
+    #enabled is an optional function that tells if suggestions should be shown (e.g. for the search criteria)
+    def add_title_autocomplete(self, entry, enabled=None, limit=8, delay=150):
+        suggestions = tk.Listbox(entry.master, font=("Arial", 11), width=entry.cget("width"), height=limit)
+        pending = [None]
+
+        #fills the list with the completions of the current text
+        def update():
+            pending[0] = None
+            prefix = entry.get()
+            titles = self.librarian.complete_title(prefix, limit) if prefix and (enabled is None or enabled()) else []
+            if titles == [prefix]:
+                titles = []
+            suggestions.delete(0, tk.END)
+            for title in titles:
+                suggestions.insert(tk.END, title)
+            if titles:
+                suggestions.config(height=len(titles))
+                suggestions.pack(after=entry, pady=2)
+            else:
+                suggestions.pack_forget()
+
+        #restarts the delay on every key
+        def on_key(event):
+            if event.keysym in ("Return", "Escape"):
+                suggestions.pack_forget()
+                return
+            if event.keysym == "Down" and suggestions.size():
+                suggestions.focus_set()
+                suggestions.selection_clear(0, tk.END)
+                suggestions.selection_set(0)
+                return
+            if pending[0] is not None:
+                entry.after_cancel(pending[0])
+            pending[0] = entry.after(delay, update)
+
+        #puts the chosen title in the entry
+        def choose(event):
+            selection = suggestions.curselection()
+            if selection:
+                entry.delete(0, tk.END)
+                entry.insert(0, suggestions.get(selection[0]))
+            suggestions.pack_forget()
+            entry.focus_set()
+            entry.icursor(tk.END)
+
+        entry.bind("<KeyRelease>", on_key)
+        suggestions.bind("<<ListboxSelect>>", choose)
+        suggestions.bind("<Return>", choose)
+        return suggestions
+
+    #shows the first page of LazyResults in a treeview, the more button adds the next pages
+    #row_values returns the values of the row of a book, returns the number of books shown
+    def show_paged_results(self, tree, more_button, results, row_values):
+        tree.delete(*tree.get_children())
+        shown = [0]
+
+        #adds the next page to the treeview
+        def show_more():
+            books = results.page(shown[0], self.PAGE_SIZE)
+            for book in books:
+                tree.insert("", "end", values=row_values(book))
+            shown[0] += len(books)
+            more_button.config(state=tk.NORMAL if len(books) == self.PAGE_SIZE else tk.DISABLED)
+
+        more_button.config(command=show_more)
+        show_more()
+        return shown[0]
+
     #handle resizing events to adjust GUI elements dynamically
     def on_resize(self, event):
         new_width = event.width
@@ -166,6 +255,7 @@ class LibraryApp:
             ("View Books", self.view_books_gui),
             ("Search Books", self.search_books_gui),
             ("waiting list", self.show_waiting_lists),
+            ("Held Copies", self.show_holds),
             ("Logout", self.logout),
         ]
 
@@ -189,6 +279,7 @@ class LibraryApp:
 
     #close the main application window
     def close_window(self):
+        self.librarian.close()
         self.root.quit()
 
     #create and display a window for adding a new book to the library
@@ -254,7 +345,6 @@ class LibraryApp:
                     book = Book(title, author, copies, genre, year)  # Create book with is_loaned as "No"
                     self.librarian.added(book)  # Call added function to add the book
                     messagebox.showinfo("Success", f"Book {title} added successfully!")
-                    self.books[title] = book  # add the book to the library
                     # self.librarian.logger.log_info("Book added successfully")
                     add_book_window.destroy()
                 except ValueError as e:
@@ -282,6 +372,7 @@ class LibraryApp:
                  bg="#f0f8ff").pack(pady=10)
         title_entry = tk.Entry(remove_book_window, font=("Arial", 12), width=30)
         title_entry.pack(pady=5)
+        self.add_title_autocomplete(title_entry)
 
         #handles the removal of a book from the library
         def submit():
@@ -330,6 +421,8 @@ class LibraryApp:
                  bg="#f0f8ff").pack(pady=10)
         title_entry = tk.Entry(lend_book_window, font=("Arial", 12), width=30)
         title_entry.pack(pady=5)
+        self.add_title_autocomplete(title_entry)
+        read_customer = self.add_customer_entries(lend_book_window)
 
         #handles the lending process
         def submit():
@@ -339,7 +432,7 @@ class LibraryApp:
                     if title in self.books:
                         book = self.books[title]
                         try:
-                            loaned_successful = self.librarian.loaned(book)
+                            loaned_successful = self.librarian.loaned(book, read_customer())
                             if loaned_successful:
                                 messagebox.showinfo("Lend Book", f"Book '{title}' lent successfully!")
                             lend_book_window.destroy()
@@ -352,6 +445,8 @@ class LibraryApp:
                     else:
                         self.librarian.logger.log_error("Book borrowed  fail")
                         messagebox.showerror("Book not found", f"Book '{title}' not found.")
+                except ValueError as e:
+                    messagebox.showerror("Lend Book", str(e))  # invalid costumer details
                 except Exception as e:
                     messagebox.showerror("Lend Book", f"Unexpected error: {str(e)}")
                     self.librarian.logger.log_error("Book borrowed  fail")
@@ -363,6 +458,28 @@ class LibraryApp:
                                   fg="white", width=20)
         submit_button.pack(pady=10)
 
+    #adds the costumer detail entries of a loan or a return to a window, returns a function reading them
+    #the details are optional: the function returns None when they are all empty, so the loan is recorded
+    #without a costumer (or the oldest loan of the book is returned), and raises ValueError when they are invalid
+    def add_customer_entries(self, window):
+        entries = []
+        for text in ("Customer name (optional):", "Customer phone:", "Customer email:"):
+            tk.Label(window, text=text, font=("Arial", 12), fg="#4b0082", bg="#f0f8ff").pack(pady=5)
+            entry = tk.Entry(window, font=("Arial", 12), width=30)
+            entry.pack(pady=5)
+            entries.append(entry)
+
+        #returns the costumer of the entries, or None
+        def read_customer():
+            name, phone, email = (entry.get().strip() for entry in entries)
+            if not (name or phone or email):
+                return None
+            if not (name and phone and email):
+                raise ValueError("Please fill all the customer fields, or leave them all empty.")
+            return Customer(name, phone, email)
+
+        return read_customer
+
     #create and display a window for the user to input the costumer details to join the waiting list
     def request_customer_details(self, book):
         customer_window = tk.Toplevel(self.root)
@@ -384,6 +501,16 @@ class LibraryApp:
         email_entry = tk.Entry(customer_window, font=("Arial", 12), width=30)
         email_entry.pack(pady=5)
 
+        tk.Label(customer_window, text="Membership:", font=("Arial", 12), fg="#4b0082", bg="#f0f8ff").pack(pady=5)
+        tier_combobox = ttk.Combobox(customer_window, values=list(self.librarian.waiting_policy.tiers),
+                                     state="readonly", width=28)
+        tier_combobox.set('regular')
+        tier_combobox.pack(pady=5)
+
+        accessibility_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(customer_window, text="Needs accessibility priority", variable=accessibility_var,
+                       bg="#f0f8ff").pack(pady=5)
+
         #handles the submission of costumer details to join the waiting list
         def submit_customer_details():
             name = name_entry.get()
@@ -392,12 +519,15 @@ class LibraryApp:
 
             if name and phone and email:
                 try:
-                    customer = Customer(name, phone, email)
+                    customer = Customer(name, phone, email, tier=tier_combobox.get(),
+                                        accessibility=accessibility_var.get())
                     self.librarian.waiting_for_book(book, customer)
                     messagebox.showinfo("Success", f"'{name}' added to waiting list for '{book.title}'.")
                     customer_window.destroy()
                 except ValueError as e:
                     messagebox.showerror("Error", str(e))  # error if costumer is already on the waiting list
+                except HoldLimitExceededException as e:
+                    messagebox.showerror("Error", str(e))
                 except Exception as e:
                     messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
             else:
@@ -417,6 +547,8 @@ class LibraryApp:
                  bg="#f0f8ff").pack(pady=10)
         title_entry = tk.Entry(return_book_window, font=("Arial", 12), width=30)
         title_entry.pack(pady=5)
+        self.add_title_autocomplete(title_entry)
+        read_customer = self.add_customer_entries(return_book_window)
 
         #handles the return process
         def submit():
@@ -425,7 +557,7 @@ class LibraryApp:
                 try:
                     if title in self.books:
                         book = self.books[title]
-                        returned_successful = self.librarian.returned(book)  # attempt to return the book
+                        returned_successful = self.librarian.returned(book, read_customer())  # attempt to return the book
                         if returned_successful:
                             messagebox.showinfo("Return Book", f"Book '{title}' returned successfully!")
                         else:
@@ -439,7 +571,10 @@ class LibraryApp:
                     self.librarian.logger.log_error("book return fail")
 
                 except CustomException as e:
-                    messagebox.showerror("Return Book", f"Error: {str(e)}")
+                    messagebox.showerror("Return Book", f"Error: {str(e)}")  # e.g. the costumer has no loan of it
+
+                except ValueError as e:
+                    messagebox.showerror("Return Book", str(e))  # invalid costumer details
 
                 except Exception as e:
                     # any unexpected error
@@ -463,11 +598,7 @@ class LibraryApp:
         view_books_window.configure(bg="#f0f8ff")
 
         # create a Search object to handle book search queries
-        search = Search(
-            books=self.books,
-            waiting_list=self.librarian.waiting_list,
-            books_borrowed=self.librarian.books_borrowed
-        )
+        search = Search.from_librarian(self.librarian)
 
         # frame to contain buttons
         buttons_frame = tk.Frame(view_books_window, bg="#f0f8ff")
@@ -498,49 +629,38 @@ class LibraryApp:
         genre_combobox = ttk.Combobox(category_frame, values=genres, width=20)
         genre_combobox.pack(side=tk.LEFT, padx=5)
 
+        # button to add the next page of books
+        more_button = tk.Button(view_books_window, text="Load more", font=("Arial", 12), state=tk.DISABLED)
+        more_button.pack(pady=5)
+
+        #returns the values of the row of a book, with a fixed loan status if given
+        def book_row(book, loan_status=None):
+            if loan_status is None:
+                loan_status = "Yes" if book.is_loaned == "Yes" else "No"
+            return (book.title, book.author, book.genre, book.year,
+                    book.available_copies, book.total_copies, loan_status)
+
         #display all books in the system
         def show_all_books():
-            tree.delete(*tree.get_children())   #clear the treeview before populating
-            books = search.display_all_books()  # get all books using the search class
-            for book in books:
-                loan_status = "Yes" if book.is_loaned == "Yes" else "No"
-                tree.insert("", "end", values=(book.title, book.author, book.genre, book.year,
-                                               book.available_copies, book.total_copies, loan_status))
+            books = search.display_all_books_paged()  # get all books using the search class
+            self.show_paged_results(tree, more_button, books, book_row)
 
         #display all available books
         def show_available_books():
-            tree.delete(*tree.get_children())
-            available_books = search.display_available_books() #get available books
-            if available_books:
-                for book in available_books:
-                    loan_status = "No"
-                    tree.insert("", "end", values=(book.title, book.author, book.genre, book.year,
-                                                   book.available_copies, book.total_copies, loan_status))
-            else:
+            available_books = search.display_available_books_paged() #get available books
+            if not self.show_paged_results(tree, more_button, available_books, lambda book: book_row(book, "No")):
                 messagebox.showinfo("Info", "No available books found")
 
         #dispaly all borrowed books
         def show_borrowed_books():
-            tree.delete(*tree.get_children())
-            borrowed_books = search.display_borrowed_books()  # get borrowed books
-            if borrowed_books:
-                for book in borrowed_books:
-                    loan_status = "Yes"
-                    tree.insert("", "end", values=(book.title, book.author, book.genre, book.year,
-                                                   book.available_copies, book.total_copies, loan_status))
-            else:
+            borrowed_books = search.display_borrowed_books_paged()  # get borrowed books
+            if not self.show_paged_results(tree, more_button, borrowed_books, lambda book: book_row(book, "Yes")):
                 messagebox.showinfo("Info", "No borrowed books found")
 
         #display popular books
         def show_popular_books():
-            tree.delete(*tree.get_children())
-            popular_books = search.display_popular_books()  # get popular books
-            if popular_books:
-                for book in popular_books:
-                    loan_status = "Yes" if book.is_loaned == "Yes" else "No"
-                    tree.insert("", "end", values=(book.title, book.author, book.genre, book.year,
-                                                   book.available_copies, book.total_copies, loan_status))
-            else:
+            popular_books = LazyResults.from_list(search.display_popular_books())  # get popular books
+            if not self.show_paged_results(tree, more_button, popular_books, book_row):
                 messagebox.showinfo("Info", "No popular books found")
 
         #display books filtered by genre
@@ -550,14 +670,8 @@ class LibraryApp:
                 messagebox.showwarning("Warning", "Please select a genre first")
                 return
 
-            tree.delete(*tree.get_children())
-            genre_books = search.display_books_by_genre(selected_genre)  # get books by selected genre
-            if genre_books:
-                for book in genre_books:
-                    loan_status = "Yes" if book.is_loaned == "Yes" else "No"
-                    tree.insert("", "end", values=(book.title, book.author, book.genre, book.year,
-                                                   book.available_copies, book.total_copies, loan_status))
-            else:
+            genre_books = search.display_books_by_genre_paged(selected_genre)  # get books by selected genre
+            if not self.show_paged_results(tree, more_button, genre_books, book_row):
                 messagebox.showinfo("Info", "No books found in this category")
         # buttons to display different categories of books
         buttons = [
@@ -582,11 +696,7 @@ class LibraryApp:
         search_window.configure(bg="#f0f8ff")
 
         # creates search books window
-        search = Search(
-            books=self.books,
-            waiting_list=self.librarian.waiting_list,
-            books_borrowed=self.librarian.books_borrowed
-        )
+        search = Search.from_librarian(self.librarian)
 
         # label and entry for entring search query
         tk.Label(search_window, text="Enter search query:", font=("Arial", 20), fg="#4b0082", bg="#f0f8ff").pack(
@@ -596,9 +706,20 @@ class LibraryApp:
 
         #dropdown menu for selecting search criteria
         search_criteria = ["Title", "Author", "Genre", "Year"]  # we added the option to search by year
+        # ranges such as 1940..1960 or >=3
+        search_criteria += ["Year Range", "Copies", "Available Copies"]
+        # several criteria at once, e.g. author:orwell year:1940..1950 available:yes
+        search_criteria += ["Advanced"]
         search_criteria_combobox = ttk.Combobox(search_window, values=search_criteria, font=("Arial", 12), width=28)
         search_criteria_combobox.set(search_criteria[0])
         search_criteria_combobox.pack(pady=10)
+        # most relevant books first instead of the catalog order
+        ranked_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_window, text="Most relevant first", variable=ranked_var, font=("Arial", 12),
+                       bg="#f0f8ff").pack(pady=5)
+
+        # title suggestions while searching by title
+        self.add_title_autocomplete(search_entry, enabled=lambda: search_criteria_combobox.get() == "Title")
 
         #displays search results in a new window
         def display_results(results):
@@ -629,10 +750,14 @@ class LibraryApp:
                     treeview.heading(col, text=heading)
                     treeview.column(col, width=width)
 
-                # add books to the treeview
-                for book in results:
+                # add the books to the treeview a page at a time
+                more_button = tk.Button(result_window, text="Load more", font=("Arial", 12), state=tk.DISABLED)
+                more_button.pack(pady=5)
+
+                #returns the values of the row of a book
+                def result_row(book):
                     status = "Available" if book.available_copies > 0 else "Not Available"
-                    treeview.insert("", "end", values=(
+                    return (
                         book.title,
                         book.author,
                         book.genre,
@@ -640,7 +765,9 @@ class LibraryApp:
                         book.available_copies,
                         book.total_copies,
                         status
-                    ))
+                    )
+
+                self.show_paged_results(treeview, more_button, LazyResults.from_list(results), result_row)
             else:
                 messagebox.showinfo("Search Results", "No books found.")
 
@@ -654,6 +781,7 @@ class LibraryApp:
                 return
 
             # choose the search strategy based on the selected criteria
+            strategy = None
             if criterion == "Title":
                 strategy = TitleSearchStrategy()
             elif criterion == "Author":
@@ -662,12 +790,40 @@ class LibraryApp:
                 strategy = GenreSearchStrategy()
             elif criterion == "Year":
                 strategy = YearSearchStrategy()
+            elif criterion == "Year Range":
+                strategy = YearRangeSearchStrategy()
+            elif criterion == "Copies":
+                strategy = CopiesRangeSearchStrategy()
+            elif criterion == "Available Copies":
+                strategy = AvailableCopiesSearchStrategy()
 
-            #set the chosen search strategy
-            search.set_strategy(strategy)
             try:
-                results = search.search(query)
+                if criterion == "Advanced":
+                    display_results(search.compound_search(query))
+                    return
+
+                #set the chosen search strategy
+                search.set_strategy(strategy)
+                if ranked_var.get():
+                    results = search.search(query, ranked=True, limit=self.PAGE_SIZE)
+                else:
+                    results = search.search(query)
                 display_results(results)
+            except BookDoesNotExistException as e:
+                # a mistyped title or author: offer the closest ones instead
+                if criterion in ("Title", "Author"):
+                    field = 'title' if criterion == "Title" else 'author'
+                    search.set_strategy(FuzzySearchStrategy(fields=(field,)))
+                    try:
+                        results = search.search(query)
+                    except BookDoesNotExistException:
+                        results = []
+                    if results:
+                        messagebox.showinfo("Search Results", f"No exact match for '{query}', showing similar books.")
+                        display_results(results)
+                        return
+                messagebox.showerror("Search Error", f"An error occurred: {str(e)}")
+                search_window.destroy()
             except Exception as e:
                 messagebox.showerror("Search Error", f"An error occurred: {str(e)}")
                 search_window.destroy()
@@ -688,6 +844,7 @@ class LibraryApp:
             pady=25)
         search_entry = tk.Entry(waiting_list_window, font=("Arial", 12), width=30)
         search_entry.pack(pady=5)
+        self.add_title_autocomplete(search_entry)
 
         #handles the submission of the waiting list request
         def submit():
@@ -738,6 +895,45 @@ class LibraryApp:
                 for customer in customers:
                     tree.insert("", "end", values=(title, customer.name, customer.phone, customer.email))
 
+    #displays the copies held for waiting costumers, the selected ones can be marked as picked up
+    def show_holds(self):
+        holds_window = tk.Toplevel(self.root)
+        holds_window.title("Held Copies")
+        holds_window.configure(bg="#f0f8ff")
+
+        # define columns for displaying the held copies
+        columns = ("Book Title", "Customer Name", "Customer Phone", "Hours Left")
+
+        # create treeview widget to display the held copies, earliest deadline first
+        tree = ttk.Treeview(holds_window, columns=columns, show="headings")
+        tree.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+        for col in columns:
+            tree.heading(col, text=col)
+
+        holds = {}  # treeview item -> (title, costumer)
+        now = self.librarian.hold_scheduler.clock()
+        for title, customer, deadline in self.librarian.pending_holds():
+            hours_left = max(0, deadline - now) / 3600
+            item = tree.insert("", "end", values=(title, customer.name, customer.phone, f"{hours_left:.1f}"))
+            holds[item] = (title, customer)
+
+        #marks the selected copies as picked up, so their hold no longer expires
+        def pick_up():
+            for item in tree.selection():
+                title, customer = holds.pop(item)
+                book = self.librarian.books.get(title)
+                if book is None:
+                    messagebox.showerror("Book not found", f"Book '{title}' not found.")
+                else:
+                    try:
+                        self.librarian.picked_up(book, customer)
+                    except CustomException as e:
+                        messagebox.showerror("Held Copies", f"'{title}': {e}")  # the hold already expired
+                tree.delete(item)
+
+        tk.Button(holds_window, text="Picked Up", command=pick_up, font=("Arial", 12), bg="#32cd32",
+                  fg="white").pack(pady=10)
+
     #displays top 10 most demanded books
     def show_most_demanded_books(self):
         demanded_books_window = tk.Toplevel(self.root)
@@ -35,7 +35,6 @@ class TestSearch(unittest.TestCase):
                     genre=row['genre'],
                     year=int(row['year'])
                 )
-                book.is_loaned = row['is_loaned']
                 book.available_copies = int(row['copies']) if row['is_loaned'] == "No" else 0
                 self.books[book.title] = book
 
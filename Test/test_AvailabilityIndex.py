@@ -0,0 +1,84 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from search.AvailabilityIndex import AvailabilityIndex
+from search.Search import Search
+
+#unit tests for the incrementally kept available, borrowed and genre sets
+class TestAvailabilityIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian over a copy of the sample files
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+
+    #checks the displays against the ones scanning the books
+    def assertMatchesScan(self):
+        search = Search.from_librarian(self.librarian)
+        scan = Search(self.librarian.books, self.librarian.waiting_list, self.librarian.books_borrowed)
+        self.assertEqual(search.display_available_books(), scan.display_available_books())
+        self.assertEqual(search.display_borrowed_books(), scan.display_borrowed_books())
+        self.assertEqual(list(search.display_available_books_paged()), scan.display_available_books())
+        for genre in ("Fiction", "fiction", "Dystopian", "Missing"):
+            self.assertEqual(search.display_books_by_genre(genre), scan.display_books_by_genre(genre))
+
+    #tests the sets after loading the catalog
+    def test_rebuild(self):
+        self.assertMatchesScan()
+
+    #tests the sets after loans, returns, added and removed books
+    def test_incremental_updates(self):
+        books = self.librarian.books
+        available = next(book for book in books.values() if book.available_copies == 1)
+        self.librarian.loaned(available)
+        self.assertNotIn(available.title, self.librarian.availability.available)
+        self.assertIn(available.title, self.librarian.availability.borrowed)
+        self.assertMatchesScan()
+
+        borrowed = next(book for book in books.values() if book.total_copies > book.available_copies)
+        while books[borrowed.title].total_copies > books[borrowed.title].available_copies:
+            self.librarian.returned(books[borrowed.title])
+        self.assertNotIn(borrowed.title, self.librarian.availability.borrowed)
+        self.assertMatchesScan()
+
+        self.librarian.added(Book("New Book", "Author", 2, "Fiction", 2000))
+        self.assertMatchesScan()
+        self.librarian.removed(books["New Book"])
+        self.assertMatchesScan()
+
+    #tests the number of books and available books of every genre
+    def test_genre_counts(self):
+        index = AvailabilityIndex()
+        books = {"A": Book("A", "Author", 1, "Fiction", 2000),
+                 "B": Book("B", "Author", 1, "fiction", 2000),
+                 "C": Book("C", "Author", 1, "Poetry", 2000)}
+        books["B"].available_copies = 0
+        index.rebuild(books, {}, {})
+        self.assertEqual(index.genre_counts(), {"Fiction": (2, 1), "Poetry": (1, 1)})
+
+        books["C"].genre = "Fiction"
+        index.book_changed(books["C"], 0)
+        index.book_removed("A")
+        self.assertEqual(index.genre_counts(), {"Fiction": (2, 1)})
+        self.assertEqual(index.genre_titles("fiction"), ["B", "C"])
+        self.assertEqual(index.available_titles(), ["C"])
+        self.assertEqual(index.borrowed_titles(), ["B"])
+
+
+if __name__ == '__main__':
+    unittest.main()
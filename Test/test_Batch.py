@@ -0,0 +1,119 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+
+#unit tests for the batch scope of the librarian
+class TestBatch(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian on a copy of the sample files and counts the csv writes
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+
+        self.writes = []
+        storage = self.librarian.storage
+        original_save_books = storage.save_books
+        original_save_waiting_list = storage.save_waiting_list
+
+        def save_books():
+            if not storage._in_transaction:
+                self.writes.append("books")
+            original_save_books()
+
+        def save_waiting_list():
+            if not storage._in_transaction:
+                self.writes.append("waiting_list")
+            original_save_waiting_list()
+
+        storage.save_books = save_books
+        storage.save_waiting_list = save_waiting_list
+
+        self.notifications = []
+        self.librarian.notification_subject.notify = \
+            lambda book, customers, event_type: self.notifications.append((book.title, len(customers), event_type))
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #tests that a restock for a waiting list writes each file once and sends one notification
+    def test_restock_is_written_once(self):
+        book = self.librarian.books["1984"]
+        customers = [
+            Customer("Customer One", "0501234567", "one@example.com"),
+            Customer("Customer Two", "0521234567", "two@example.com"),
+            Customer("Customer Three", "0531234567", "three@example.com")
+        ]
+        with self.librarian.batch():
+            for customer in customers:
+                self.librarian.waiting_for_book(book, customer)
+        self.writes.clear()
+
+        self.librarian.added(Book("1984", "George Orwell", 3, "Dystopian", 1949))
+
+        self.assertEqual(sorted(self.writes), ["books", "waiting_list"])
+        self.assertEqual(self.notifications, [("1984", 3, "addition")])
+        self.assertEqual(len(self.librarian.waiting_list["1984"]), 0)
+
+    #tests that operations inside a batch are written together at the end of the scope
+    def test_batch_defers_writes(self):
+        with self.librarian.transaction():
+            self.librarian.loaned(self.librarian.books["The Great Gatsby"])
+            self.librarian.loaned(self.librarian.books["The Great Gatsby"])
+            self.librarian.added(Book("Batch Book", "Some Author", 1, "Fiction", 2020))
+            self.assertEqual(self.writes, [])
+        self.assertEqual(self.writes, ["books"])
+
+    #tests that an exception inside a batch rolls the state back and writes nothing
+    def test_batch_rolls_back(self):
+        gatsby = self.librarian.books["The Great Gatsby"]
+        available = gatsby.available_copies
+        with self.assertRaises(RuntimeError):
+            with self.librarian.batch():
+                self.librarian.loaned(gatsby)
+                self.librarian.added(Book("Batch Book", "Some Author", 1, "Fiction", 2020))
+                self.librarian.removed(self.librarian.books["The Catcher in the Rye"])
+                raise RuntimeError("failure")
+
+        self.assertEqual(gatsby.available_copies, available)
+        self.assertNotIn("The Great Gatsby", self.librarian.books_borrowed)
+        self.assertNotIn("Batch Book", self.librarian.books)
+        self.assertIn("The Catcher in the Rye", self.librarian.books)
+        self.assertEqual(self.writes, [])
+
+    #tests that a rolled back batch puts the costumers served from a waiting list back in their place
+    def test_rollback_restores_waiting_list(self):
+        book = self.librarian.books["1984"]
+        self.librarian.waiting_for_book(book, Customer("Jane Roe", "0521234567", "jane@example.com"))
+        self.librarian.waiting_for_book(book, Customer("Jim Poe", "0531234567", "jim@example.com"))
+        del self.writes[:]
+        customer = Customer("John Doe", "0501234567", "john@example.com")
+        with self.assertRaises(RuntimeError):
+            with self.librarian.batch():
+                self.librarian.waiting_for_book(book, customer)
+                self.librarian.returned(book)
+                raise RuntimeError("failure")
+
+        self.assertEqual([customer.name for customer in self.librarian.waiting_list["1984"]], ["Jane Roe", "Jim Poe"])
+        self.assertEqual(self.librarian.waiting_lists_of(customer), [])
+        self.assertEqual(self.writes, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import os
+import csv
+import json
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+from system.BookImporter import BookImporter
+
+#unit tests for bulk catalog ingestion
+class TestBookImporter(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian on a copy of the sample files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+        self.report_path = os.path.join(self.temp_dir, 'rejected.csv')
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #tests that bulk_add merges copies, rejects invalid books and fulfils waiting lists
+    def test_bulk_add(self):
+        customer = Customer("John Doe", "0501234567", "john@example.com")
+        self.librarian.waiting_for_book(self.librarian.books["1984"], customer)
+        total = self.librarian.books["1984"].total_copies
+
+        rejected = []
+        added = self.librarian.bulk_add([
+            Book("Bulk Book", "Some Author", 2, "Fiction", 2020),
+            Book("Bulk Book", "Some Author", 3, "Fiction", 2020),
+            Book("1984", "George Orwell", 2, "Dystopian", 1949),
+            Book("Bad Copies", "Some Author", -1, "Fiction", 2020),
+            Book("Bad Year", "Some Author", 1, "Fiction", "2020")
+        ], rejected)
+
+        self.assertEqual(added, 3)
+        self.assertEqual([book.title for book, _ in rejected], ["Bad Copies", "Bad Year"])
+        self.assertEqual(self.librarian.books["Bulk Book"].total_copies, 5)
+        self.assertEqual(self.librarian.books["1984"].total_copies, total + 2)
+        self.assertEqual(self.librarian.books["1984"].available_copies, 1)
+        self.assertEqual(len(self.librarian.waiting_list["1984"]), 0)
+
+    #tests importing a csv feed with a rejection report
+    def test_import_csv(self):
+        feed_path = os.path.join(self.temp_dir, 'feed.csv')
+        with open(feed_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['title', 'author', 'copies', 'genre', 'year'])
+            writer.writerow(['Feed Book', 'Feed Author', '4', 'Fiction', '2001'])
+            writer.writerow(['No Copies', 'Feed Author', 'four', 'Fiction', '2001'])
+            writer.writerow(['', 'Feed Author', '1', 'Fiction', '2001'])
+
+        importer = BookImporter(self.report_path)
+        self.assertEqual(importer.import_file(self.librarian, feed_path), 1)
+        self.assertEqual(self.librarian.books["Feed Book"].total_copies, 4)
+
+        with open(self.report_path, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual([row[0] for row in rows[1:]], ['3', '4'])
+
+    #tests importing a json lines feed
+    def test_import_jsonl(self):
+        feed_path = os.path.join(self.temp_dir, 'feed.jsonl')
+        with open(feed_path, 'w', encoding='utf-8') as file:
+            file.write(json.dumps({'title': 'Json Book', 'author': 'A', 'copies': 2, 'genre': 'Fiction',
+                                   'year': 1999}) + '\n')
+            file.write('not json\n')
+
+        importer = BookImporter(self.report_path)
+        self.assertEqual(importer.import_file(self.librarian, feed_path), 1)
+        self.assertIn("Json Book", self.librarian.books)
+        self.assertEqual(len(importer.rejected), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import logging
+from unittest.mock import MagicMock
+from Books.Book import Book
+from Books.BookIterator import BookStream, AllBooksIterator, AvailableBooksIterator, BorrowedBooksIterator
+from Error.ConcurrentModificationException import ConcurrentModificationException
+
+#unit tests for the lazy book iterators and streams
+class TestBookIterator(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    #creates a few books, one of them borrowed and one with no copy to loan
+    def setUp(self):
+        self.books = {title: Book(title, "Author", copies, "Genre", year)
+                      for title, copies, year in (("A", 1, 1990), ("B", 2, 1950), ("C", 1, 2010), ("D", 3, 1950))}
+        self.books["B"].available_copies = 1
+        self.books["C"].available_copies = 0
+        self.logger = MagicMock()
+
+    #tests the has_next / next interface, running out of books is not logged
+    def test_has_next_and_next(self):
+        iterator = AvailableBooksIterator(self.books, self.logger)
+        titles = []
+        while iterator.has_next():
+            self.assertTrue(iterator.has_next())
+            titles.append(iterator.next().title)
+        self.assertEqual(titles, ["A", "B", "D"])
+        self.assertRaises(StopIteration, iterator.next)
+        self.logger.log_error.assert_not_called()
+
+    #tests the iterators in for loops
+    def test_iteration(self):
+        self.assertEqual([book.title for book in AllBooksIterator(self.books)], ["A", "B", "C", "D"])
+        self.assertEqual([book.title for book in BorrowedBooksIterator(self.books)], ["B", "C"])
+
+    #tests that the filter reads the books as they are when they are reached
+    def test_live_view(self):
+        iterator = AvailableBooksIterator(self.books)
+        self.assertEqual(next(iterator).title, "A")
+        self.books["C"].available_copies = 1
+        self.books["D"].available_copies = 0
+        self.assertEqual([book.title for book in iterator], ["B", "C"])
+
+    #tests pipelines of filter, map, sort_by and take
+    def test_pipeline(self):
+        stream = BookStream(self.books).filter(lambda book: book.year < 2000) \
+            .sort_by(lambda book: book.year).map(lambda book: book.title)
+        self.assertEqual(stream.to_list(), ["B", "D", "A"])
+        self.assertEqual(BookStream(self.books).map(lambda book: book.title).take(2).to_list(), ["A", "B"])
+        newest = BookStream(self.books).sort_by(lambda book: book.year, reverse=True, limit=3)
+        self.assertEqual([book.title for book in newest], ["C", "A", "B"])
+        # books with the same year stay in catalog order, as with a reverse sort
+        oldest_last = BookStream(self.books).sort_by(lambda book: book.year, reverse=True, limit=4)
+        self.assertEqual(oldest_last.to_list(), sorted(self.books.values(), key=lambda book: book.year, reverse=True))
+
+    #tests that adding or removing a book during the iteration is detected
+    def test_concurrent_modification(self):
+        stream = BookStream(self.books).map(lambda book: book.title)
+        self.assertEqual(next(stream), "A")
+        self.books["E"] = Book("E", "Author", 1, "Genre", 2000)
+        self.assertRaises(ConcurrentModificationException, next, stream)
+
+        iterator = AllBooksIterator(self.books)
+        next(iterator)
+        del self.books["E"]
+        self.assertRaises(ConcurrentModificationException, iterator.has_next)
+
+    #tests that the errors raised by the functions of a pipeline are not reported as concurrent modifications
+    def test_pipeline_errors(self):
+        def failing(book):
+            raise RuntimeError("failure")
+
+        self.assertRaisesRegex(RuntimeError, "failure", BookStream(self.books).filter(failing).to_list)
+        self.assertRaisesRegex(RuntimeError, "failure", BookStream(self.books).map(failing).to_list)
+        self.assertRaisesRegex(RuntimeError, "failure", BookStream(self.books).sort_by(failing, limit=2).to_list)
+
+
+if __name__ == '__main__':
+    unittest.main()
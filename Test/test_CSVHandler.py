@@ -0,0 +1,74 @@
+import unittest
+import os
+import csv
+import shutil
+import tempfile
+from system.CSVHandler import CSVHandler
+
+#unit tests for the csv catalog loaders
+class TestCSVHandler(unittest.TestCase):
+    #sets up the path of the sample books file
+    @classmethod
+    def setUpClass(cls):
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        cls.books_path = os.path.join(cls.base_path, 'files', 'books.csv')
+
+    #creates a temporary directory
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #returns the book fields that are loaded from the file
+    @staticmethod
+    def book_state(books):
+        return [(b.title, b.author, b.is_loaned, b.total_copies, b.available_copies, b.genre, b.year)
+                for b in books.values()]
+
+    #tests that the streaming loader yields the same books as the dict loader
+    def test_iter_books(self):
+        books = CSVHandler.load_books_from_csv(self.books_path)
+        streamed = {book.title: book for book in CSVHandler.iter_books_from_csv(self.books_path)}
+        self.assertEqual(self.book_state(streamed), self.book_state(books))
+        self.assertEqual(books["1984"].available_copies, 0)
+
+    #tests that the parallel loader splits the file on line boundaries without losing rows
+    def test_load_books_parallel(self):
+        books = CSVHandler.load_books_from_csv(self.books_path)
+        parallel = CSVHandler.load_books_parallel(self.books_path, workers=3, min_chunk_size=64)
+        self.assertEqual(self.book_state(parallel), self.book_state(books))
+
+    #tests that a file with line breaks inside quoted values is still loaded correctly
+    def test_load_books_parallel_multiline_values(self):
+        file_path = os.path.join(self.temp_dir, 'books.csv')
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['title', 'author', 'is_loaned', 'copies', 'genre', 'year'])
+            for i in range(50):
+                writer.writerow([f'Title\nPart {i}', 'Author', 'No', 2, 'Fiction', 2000])
+
+        parallel = CSVHandler.load_books_parallel(file_path, workers=3, min_chunk_size=64)
+        self.assertEqual(len(parallel), 50)
+        self.assertIn('Title\nPart 49', parallel)
+
+    #tests that unicode line separators inside values are kept in the values, like the sequential loader does
+    def test_load_books_parallel_unicode_line_breaks(self):
+        file_path = os.path.join(self.temp_dir, 'books.csv')
+        separators = ['\u2028', '\x85', '\x0c', '\x1c', '\u2029']
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['title', 'author', 'is_loaned', 'copies', 'genre', 'year'])
+            for i in range(200):
+                writer.writerow([f'Title{separators[i % len(separators)]}{i}', 'Author', 'No', 2, 'Fiction', 2000])
+
+        books = CSVHandler.load_books_from_csv(file_path)
+        parallel = CSVHandler.load_books_parallel(file_path, workers=3, min_chunk_size=64)
+        self.assertEqual(len(parallel), 200)
+        self.assertEqual(self.book_state(parallel), self.book_state(books))
+        self.assertIn('Title\u20280', parallel)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from Books.Book import Book
+from Books.CatalogStore import CatalogStore
+from search.Search import Search
+from search.SearchStrategy import AuthorSearchStrategy
+
+#unit tests for the compact book representations
+class TestCatalogStore(unittest.TestCase):
+    #creates a store with a few books
+    def setUp(self):
+        books = {
+            "1984": Book("1984", "George Orwell", 3, "Dystopian", 1949),
+            "Animal Farm": Book("Animal Farm", "George Orwell", 1, "Satire", 1945),
+            "The Hobbit": Book("The Hobbit", "J.R.R. Tolkien", 2, "Fantasy", 1937)
+        }
+        self.store = CatalogStore(books)
+
+    #tests that the loan status of a book follows its available copies
+    def test_derived_loan_status(self):
+        book = Book("Test", "Author", 1, "Genre", 2000)
+        self.assertEqual(book.is_loaned, "No")
+        book.available_copies = 0
+        self.assertEqual(book.is_loaned, "Yes")
+        with self.assertRaises(AttributeError):
+            book.unknown_field = 1
+        with self.assertRaises(AttributeError):
+            book.is_loaned = "No"
+        with self.assertRaises(AttributeError):
+            self.store["1984"].is_loaned = "Yes"
+
+    #tests that views read and write the columns of the store
+    def test_views(self):
+        view = self.store["1984"]
+        self.assertEqual((view.title, view.author, view.genre, view.year), ("1984", "George Orwell", "Dystopian", 1949))
+        view.available_copies -= 3
+        self.assertEqual(self.store["1984"].available_copies, 0)
+        self.assertEqual(self.store["1984"].is_loaned, "Yes")
+
+    #tests removing and re-using rows
+    def test_remove_and_add(self):
+        removed = self.store.pop("Animal Farm")
+        self.assertEqual(removed.title, "Animal Farm")
+        self.assertNotIn("Animal Farm", self.store)
+        self.store["Brave New World"] = Book("Brave New World", "Aldous Huxley", 4, "Dystopian", 1932)
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(list(self.store), ["1984", "The Hobbit", "Brave New World"])
+        self.assertEqual(self.store["Brave New World"].total_copies, 4)
+
+    #tests that the store can be searched like the books dict
+    def test_search_on_store(self):
+        search = Search(self.store)
+        search.set_strategy(AuthorSearchStrategy())
+        self.assertEqual([book.title for book in search.search("orwell")], ["1984", "Animal Farm"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+from search.Search import Search
+from search.ColumnarCatalog import ColumnarCatalog
+from search.SearchStrategy import AuthorSearchStrategy, GenreSearchStrategy, YearSearchStrategy, CopiesSearchStrategy
+
+#unit tests for the numpy column mirror, compares every query with the plain dict scan
+@unittest.skipUnless(ColumnarCatalog.is_supported(), "numpy is not installed")
+class TestColumnarCatalog(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian with the column mirror on a copy of the sample files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path, columnar=True)
+        self.librarian.logger.disable_console_logs()
+
+    #removes the temporary files
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #returns a search with the columns and one without
+    def searches(self):
+        columnar = Search.from_librarian(self.librarian)
+        scan = Search(self.librarian.books, self.librarian.waiting_list, self.librarian.books_borrowed)
+        columnar.logger.disable_console_logs()
+        scan.logger.disable_console_logs()
+        return columnar, scan
+
+    #checks that both searches return the same books
+    def assert_same_results(self):
+        columnar, scan = self.searches()
+        self.assertEqual(columnar.display_available_books(), scan.display_available_books())
+        self.assertEqual(columnar.display_borrowed_books(), scan.display_borrowed_books())
+        self.assertEqual(columnar.display_books_by_genre("fiction"), scan.display_books_by_genre("fiction"))
+        for strategy, query in ((AuthorSearchStrategy(), "or"), (GenreSearchStrategy(), "fic"),
+                                (YearSearchStrategy(), "19"), (CopiesSearchStrategy(), "2")):
+            columnar.set_strategy(strategy)
+            scan.set_strategy(strategy)
+            self.assertEqual(columnar.search(query), scan.search(query))
+
+    #tests the mirror right after loading
+    def test_loaded_catalog(self):
+        self.assertIsNotNone(self.librarian.columns)
+        self.assert_same_results()
+
+    #tests that the mirror follows additions, loans, removals and waiting lists
+    def test_follows_changes(self):
+        librarian = self.librarian
+        librarian.added(Book("Columnar Test", "Test Author", 2, "Fiction", 2001))
+        librarian.loaned(librarian.books["Columnar Test"])
+        librarian.loaned(librarian.books["Columnar Test"])
+        librarian.waiting_for_book(librarian.books["Columnar Test"], Customer("Reader", "0501234567", "reader@example.com"))
+        title = next(iter(librarian.books))
+        librarian.removed(librarian.books[title])
+        self.assert_same_results()
+
+        self.assertEqual(librarian.columns.most_demanded(), librarian.get_most_demanded_books())
+        self.assertEqual(librarian.columns.most_demanded(5, only_positive=True),
+                         librarian.demand.top(5, only_positive=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
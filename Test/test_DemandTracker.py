@@ -0,0 +1,90 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Customer import Customer
+from Library.Librarian import Librarian
+from search.Search import Search
+
+#unit tests for the demand scores kept by the librarian
+class TestDemandTracker(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian over a copy of the sample files
+    def setUp(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+
+    #returns the most demanded books by scoring and sorting the whole catalog
+    def expected_most_demanded(self, limit):
+        demand = []
+        for title in self.librarian.books:
+            borrowed_copies = self.librarian.books_borrowed.get(title, 0)
+            waiting_list_count = len(self.librarian.waiting_list.get(title, []))
+            demand.append((title, borrowed_copies + waiting_list_count, borrowed_copies, waiting_list_count))
+        demand.sort(key=lambda x: x[1], reverse=True)
+        return demand[:limit]
+
+    #checks the librarian and the search against the full sort
+    def assertMatchesSort(self):
+        for limit in (1, 10, len(self.librarian.books) + 1):
+            self.assertEqual(self.librarian.get_most_demanded_books(limit), self.expected_most_demanded(limit))
+        search = Search.from_librarian(self.librarian)
+        scan = Search(self.librarian.books, self.librarian.waiting_list, self.librarian.books_borrowed)
+        self.assertEqual(search.display_popular_books(), scan.display_popular_books())
+        paged = search.display_popular_books_paged()
+        self.assertEqual(list(paged), list(scan.display_popular_books_paged()))
+        self.assertEqual(paged.total, len(list(scan.display_popular_books_paged())))
+
+    #tests the scores after loading the catalog
+    def test_rebuild(self):
+        self.assertMatchesSort()
+
+    #tests the scores after loans, returns, waiting lists, added and removed books
+    def test_incremental_updates(self):
+        librarian = self.librarian
+        librarian.added(Book("Demand Test", "Author", 1, "Fiction", 2000))
+        librarian.loaned(librarian.books["Demand Test"])
+        self.assertMatchesSort()
+        for number in range(3):
+            librarian.waiting_for_book(librarian.books["Demand Test"],
+                                       Customer(f"Reader {number}", "0501234567", "reader@example.com"))
+        self.assertIn(("Demand Test", 4, 1, 3), librarian.get_most_demanded_books())
+        self.assertMatchesSort()
+
+        librarian.returned(librarian.books["Demand Test"])
+        self.assertMatchesSort()
+        borrowed = next(title for title, copies in librarian.books_borrowed.items() if copies)
+        librarian.returned(librarian.books[borrowed])
+        self.assertMatchesSort()
+
+        free = next(book for book in librarian.books.values() if book.total_copies == book.available_copies)
+        librarian.removed(free)
+        self.assertMatchesSort()
+
+
+    #tests that a limited read of large buckets of equal scores keeps the catalog order
+    def test_limit_in_large_buckets(self):
+        librarian = self.librarian
+        librarian.bulk_add([Book(f"Tie {number}", "Author", 2, "Fiction", 2000) for number in range(50)])
+        for number in (30, 10, 20, 40):
+            librarian.loaned(librarian.books[f"Tie {number}"])
+        titles = list(librarian.demand.iter_titles())
+        for limit in (0, 1, 3, 12, len(titles), len(titles) + 5):
+            self.assertEqual([title for title, *_ in librarian.demand.top(limit)], titles[:limit])
+        self.assertMatchesSort()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import random
+import logging
+from Books.Book import Book
+from search.FuzzyIndex import FuzzyIndex, edit_distance
+from search.Search import Search
+from search.SearchStrategy import FuzzySearchStrategy
+
+#unit tests for the typo tolerant search
+class TestFuzzySearch(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    #creates a few books and an index over them
+    def setUp(self):
+        self.books = {}
+        for book in (Book("1984", "George Orwell", 3, "Dystopian", 1949),
+                     Book("Animal Farm", "George Orwell", 1, "Satire", 1945),
+                     Book("The Great Gatsby", "F. Scott Fitzgerald", 2, "Classic", 1925),
+                     Book("Tender Is the Night", "F. Scott Fitzgerald", 1, "Classic", 1934),
+                     Book("The Hobbit", "J.R.R. Tolkien", 2, "Fantasy", 1937)):
+            self.books[book.title] = book
+        self.index = FuzzyIndex()
+        self.index.rebuild(self.books, {}, {})
+
+    #tests the distance between words
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("orwel", "orwell", 2), 1)
+        self.assertEqual(edit_distance("fitzgerlad", "fitzgerald", 2), 1)
+        self.assertEqual(edit_distance("hobit", "hobbit", 2), 1)
+        self.assertEqual(edit_distance("gatsby", "gatsby", 2), 0)
+        self.assertEqual(edit_distance("tolkien", "orwell", 2), 3)
+
+    #tests that mistyped names find the right books, closest first
+    def test_mistyped_queries(self):
+        self.assertEqual(self.index.closest("Orwel"), [(1, "1984"), (1, "Animal Farm")])
+        self.assertEqual([title for _, title in self.index.closest("Fitzgerlad")],
+                         ["The Great Gatsby", "Tender Is the Night"])
+        self.assertEqual(self.index.closest("grate gatsbi", fields=('title',)), [(3, "The Great Gatsby")])
+        self.assertEqual(self.index.closest("hobbit", limit=1), [(0, "The Hobbit")])
+        self.assertEqual(self.index.closest("xyzzy"), [])
+        self.assertIsNone(self.index.closest("..."))
+
+    #tests that the index follows added and removed books
+    def test_incremental_updates(self):
+        book = Book("Orwell's Diaries", "Peter Davison", 1, "Biography", 2009)
+        self.books[book.title] = book
+        self.index.book_changed(book, 0)
+        self.assertEqual(self.index.closest("orwel", fields=('title',)), [(1, "Orwell's Diaries")])
+
+        for title in ("1984", "Animal Farm", "Orwell's Diaries"):
+            del self.books[title]
+            self.index.book_removed(title)
+        self.assertEqual(self.index.closest("orwel"), [])
+        self.assertNotIn("orwell", self.index.word_counts)
+
+    #tests that the index ranks like the strategy's scan of every book
+    def test_matches_scan(self):
+        rng = random.Random(13)
+        words = ["tolkien", "orwell", "austen", "bronte", "dickens", "twain", "woolf", "hobbit", "farm", "night"]
+        for i in range(200):
+            title = f"{' '.join(rng.choices(words, k=2))} {i}"
+            self.books[title] = Book(title, ' '.join(rng.choices(words, k=2)), 1, "Genre", 2000)
+        self.index.rebuild(self.books, {}, {})
+
+        for max_distance in (0, 1, 2):
+            strategy = FuzzySearchStrategy(limit=15, max_distance=max_distance)
+            for query in ("tolkein", "orwel austin", "dikens", "brotne", "wolf nigt", "hobit 12", "zzzz"):
+                self.assertEqual(strategy.search_index(query, self.books, self.index),
+                                 strategy.search(query, self.books), (query, max_distance))
+
+    #tests that a smaller distance is applied by the index, and a larger one is left to the scan
+    def test_max_distance(self):
+        self.assertEqual(FuzzySearchStrategy(max_distance=1).search_index("Orwl", self.books, self.index), [])
+        self.assertEqual(self.index.closest("Orwl", max_distance=0), [])
+        self.assertIsNone(FuzzySearchStrategy(max_distance=3).search_index("Orwl", self.books, self.index))
+        search = Search(self.books, indexes=[self.index])
+        search.set_strategy(FuzzySearchStrategy(max_distance=3))
+        self.assertEqual([book.title for book in search.search("Orwl")][:2], ["1984", "Animal Farm"])
+
+    #tests the search with the strategy
+    def test_search(self):
+        search = Search(self.books, indexes=[self.index])
+        search.set_strategy(FuzzySearchStrategy(fields=('author',)))
+        self.assertEqual([book.title for book in search.search("tolkin")], ["The Hobbit"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import logging
+from Books.Book import Book
+from Error.HoldDoesNotExistException import HoldDoesNotExistException
+from Library.Customer import Customer
+from Library.HoldScheduler import HoldScheduler
+from Library.Librarian import Librarian
+from Library.LoanLedger import LoanLedger
+from Library.Observer import Observer
+
+
+#a clock that only moves when the test moves it
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+#records the notifications sent by the librarian
+class RecordingObserver(Observer):
+    def __init__(self):
+        self.events = []
+
+    def update(self, book, customers, event_type):
+        self.events.append((event_type, book.title, [customer.name for customer in customers]))
+
+
+#unit tests for the hold deadlines and the expiry of the holds of the librarian
+class TestHoldScheduler(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian with a pickup window of 10 seconds on a fake clock, and a book with one copy loaned
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.books_path = os.path.join(self.temp_dir, 'books.csv')
+        self.waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), self.books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), self.waiting_list_path)
+        self.clock = FakeClock()
+        self.librarian = Librarian(self.books_path, self.waiting_list_path, hold_period=10, clock=self.clock)
+        self.librarian.logger.disable_console_logs()
+        self.librarian.notification_subject.detach(self.librarian.notification_observer)
+        self.observer = RecordingObserver()
+        self.librarian.notification_subject.attach(self.observer)
+
+        self.librarian.added(Book("Hold Test", "Author", 1, "Fiction", 2000))
+        self.book = self.librarian.books["Hold Test"]
+        self.librarian.loaned(self.book)
+        self.alice = Customer("Alice", "0501234567", "alice@example.com")
+        self.bob = Customer("Bob", "0521234567", "bob@example.com")
+
+    #tests that entries run in deadline order, and that cancelled and rescheduled entries are skipped
+    def test_scheduler(self):
+        clock = FakeClock()
+        expired = []
+        scheduler = HoldScheduler(expired.append, clock)
+        scheduler.schedule("a", 5)
+        scheduler.schedule("b", 3)
+        scheduler.schedule("c", 4)
+        scheduler.schedule("a", 8)
+        self.assertTrue(scheduler.cancel("c"))
+        self.assertFalse(scheduler.cancel("c"))
+
+        clock.now = 6
+        self.assertEqual(scheduler.run_due(), ["b"])
+        self.assertEqual(scheduler.deadline("a"), 8)
+        clock.now = 8
+        scheduler.run_due()
+        self.assertEqual(expired, ["b", "a"])
+        self.assertEqual(len(scheduler), 0)
+
+    #tests that the background thread runs an entry once it is due
+    def test_background_thread(self):
+        done = threading.Event()
+        scheduler = HoldScheduler(lambda key: done.set())
+        scheduler.start()
+        self.addCleanup(scheduler.stop)
+        scheduler.schedule("later", 60)
+        scheduler.schedule("soon", 0.05)
+        self.assertTrue(done.wait(5))
+        self.assertIn("later", scheduler)
+
+    #tests that an uncollected copy passes to the next costumer and then back to the shelf
+    def test_hold_expires(self):
+        self.librarian.waiting_for_book(self.book, self.alice)
+        self.librarian.waiting_for_book(self.book, self.bob)
+        self.librarian.returned(self.book)
+        self.assertEqual([(title, customer.name, deadline) for title, customer, deadline in
+                          self.librarian.pending_holds()], [("Hold Test", "Alice", 10)])
+
+        self.clock.now = 9
+        self.assertEqual(self.librarian.expire_holds(), 0)
+        self.clock.now = 10
+        self.assertEqual(self.librarian.expire_holds(), 1)
+        self.assertEqual(self.observer.events[-2:], [("hold_expired", "Hold Test", ["Alice"]),
+                                                     ("return", "Hold Test", ["Bob"])])
+        self.assertEqual(len(self.librarian.waiting_list["Hold Test"]), 0)
+        self.assertEqual(self.book.available_copies, 0)
+
+        self.clock.now = 20
+        self.librarian.expire_holds()
+        self.assertEqual(self.book.available_copies, 1)
+        self.assertNotIn("Hold Test", self.librarian.books_borrowed)
+        self.assertEqual(self.librarian.pending_holds(), [])
+
+    #tests that a collected copy stays loaned
+    def test_picked_up(self):
+        self.librarian.waiting_for_book(self.book, self.alice)
+        self.librarian.returned(self.book)
+        self.librarian.picked_up(self.book, self.alice)
+        with self.assertRaises(HoldDoesNotExistException):
+            self.librarian.picked_up(self.book, self.alice)
+
+        self.clock.now = 100
+        self.assertEqual(self.librarian.expire_holds(), 0)
+        self.assertEqual(self.book.available_copies, 0)
+
+
+    #tests that the hold ends when the costumer returns the copy, and that the copy of another costumer stays loaned
+    def test_hold_released_on_return(self):
+        carol = Customer("Carol", "0531234567", "carol@example.com")
+        self.librarian.waiting_for_book(self.book, self.alice)
+        self.librarian.returned(self.book)
+        self.librarian.returned(self.book, self.alice)
+        self.assertEqual(self.librarian.pending_holds(), [])
+        self.librarian.loaned(self.book, carol)
+
+        self.clock.now = 100
+        self.assertEqual(self.librarian.expire_holds(), 0)
+        self.assertEqual([loan.title for loan in self.librarian.loans_of(carol)], ["Hold Test"])
+        self.assertEqual(self.book.available_copies, 0)
+
+    #tests that an expired hold does not return a copy the costumer no longer has
+    def test_expire_without_loan(self):
+        carol = Customer("Carol", "0531234567", "carol@example.com")
+        self.librarian.waiting_for_book(self.book, self.alice)
+        self.librarian.returned(self.book)
+        self.librarian.ledger.give_back("Hold Test", self.alice)
+        self.librarian.ledger.lend("Hold Test", carol)
+
+        self.clock.now = 100
+        self.assertEqual(self.librarian.expire_holds(), 1)
+        self.assertEqual(self.librarian.books_borrowed["Hold Test"], 1)
+        self.assertEqual([loan.title for loan in self.librarian.loans_of(carol)], ["Hold Test"])
+
+    #tests that a hold expiring on another thread waits for an open batch, and is not lost when it rolls back
+    def test_expiry_waits_for_batch(self):
+        self.librarian.waiting_for_book(self.book, self.alice)
+        self.librarian.returned(self.book)
+        self.clock.now = 100
+        expiry = threading.Thread(target=self.librarian.expire_holds)
+        with self.assertRaises(ValueError):
+            with self.librarian.batch():
+                expiry.start()
+                expiry.join(0.2)
+                self.assertTrue(expiry.is_alive())
+                raise ValueError()
+        expiry.join()
+        self.assertEqual(self.observer.events, [("return", "Hold Test", ["Alice"]),
+                                                ("hold_expired", "Hold Test", ["Alice"])])
+        self.assertEqual(self.librarian.loans_of(self.alice), [])
+    #tests that the holds are kept in the ledger file, and that the ones past their deadline expire on restart
+    def test_holds_survive_restart(self):
+        wall_clock = FakeClock()  # the ledger clock, the deadlines it records are absolute
+        wall_clock.now = 1000
+        ledger_path = os.path.join(self.temp_dir, 'loans.jsonl')
+
+        #closes the librarian and opens it again on the same files
+        def restart(librarian):
+            librarian.close()
+            librarian = Librarian(self.books_path, self.waiting_list_path, hold_period=10, clock=FakeClock(),
+                                  ledger=LoanLedger(ledger_path, clock=wall_clock))
+            librarian.logger.disable_console_logs()
+            return librarian
+
+        librarian = restart(self.librarian)
+        book = librarian.books["Hold Test"]
+        librarian.waiting_for_book(book, self.alice)
+        librarian.waiting_for_book(book, self.bob)
+        librarian.returned(book)
+
+        wall_clock.now = 1004
+        librarian = restart(librarian)
+        self.assertEqual([(title, customer.name, deadline) for title, customer, deadline in
+                          librarian.pending_holds()], [("Hold Test", "Alice", 6)])
+
+        wall_clock.now = 1012
+        librarian = restart(librarian)
+        self.assertEqual([(title, customer.name) for title, customer, deadline in librarian.pending_holds()],
+                         [("Hold Test", "Bob")])
+        self.assertEqual(librarian.loans_of(self.alice), [])
+        self.assertEqual([loan.hold_until for loan in librarian.loans_of(self.bob)], [1022])
+
+        librarian.picked_up(librarian.books["Hold Test"], self.bob)
+        wall_clock.now = 1100
+        librarian = restart(librarian)
+        self.addCleanup(librarian.close)
+        self.assertEqual(librarian.pending_holds(), [])
+        self.assertEqual([loan.title for loan in librarian.loans_of(self.bob)], ["Hold Test"])
+
+
+if __name__ == '__main__':
+    unittest.main()
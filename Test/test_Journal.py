@@ -0,0 +1,144 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+
+#unit tests for the journal mode of the librarian
+class TestJournal(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #copies the sample files into a temporary directory
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.books_path = os.path.join(self.temp_dir, 'books.csv')
+        self.waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        self.journal_path = os.path.join(self.temp_dir, 'journal.jsonl')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), self.books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), self.waiting_list_path)
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #creates a librarian working in journal mode
+    def create_librarian(self, compact_threshold=10000):
+        librarian = Librarian(self.books_path, self.waiting_list_path,
+                              journal_path=self.journal_path, compact_threshold=compact_threshold)
+        librarian.logger.disable_console_logs()
+        return librarian
+
+    #tests that mutations are appended to the journal and the snapshot is not rewritten
+    def test_mutations_do_not_rewrite_snapshot(self):
+        with open(self.books_path, encoding='utf-8') as file:
+            snapshot = file.read()
+
+        librarian = self.create_librarian()
+        librarian.loaned(librarian.books["The Great Gatsby"])
+        librarian.added(Book("Journal Book", "Some Author", 2, "Fiction", 2020))
+        librarian.close()
+
+        with open(self.books_path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), snapshot)
+        self.assertEqual(librarian.storage.journal.record_count, 2)
+
+    #tests that a new librarian replays the journal on top of the snapshot
+    def test_replay_restores_state(self):
+        librarian = self.create_librarian()
+        librarian.loaned(librarian.books["The Great Gatsby"])
+        librarian.added(Book("Journal Book", "Some Author", 2, "Fiction", 2020))
+        librarian.removed(librarian.books["The Catcher in the Rye"])
+        customer = Customer("John Doe", "0501234567", "john@example.com")
+        librarian.waiting_for_book(librarian.books["1984"], customer)
+        librarian.close()
+
+        restored = self.create_librarian()
+        self.assertEqual(restored.books["The Great Gatsby"].available_copies, 3)
+        self.assertEqual(restored.books_borrowed["The Great Gatsby"], 1)
+        self.assertIn("Journal Book", restored.books)
+        self.assertNotIn("The Catcher in the Rye", restored.books)
+        self.assertEqual([c.name for c in restored.waiting_list["1984"]], ["John Doe"])
+
+    #tests that the records appended after a crash in the middle of a write are replayed
+    def test_torn_write(self):
+        librarian = self.create_librarian()
+        librarian.added(Book("A1", "Some Author", 1, "Fiction", 2020))
+        librarian.close()
+        with open(self.journal_path, mode='a', encoding='utf-8') as file:
+            file.write('{"op": "book", "title": "Lost", "auth')
+
+        librarian = self.create_librarian()
+        self.assertNotIn("Lost", librarian.books)
+        librarian.added(Book("A2", "Some Author", 1, "Fiction", 2020))
+        librarian.added(Book("A3", "Some Author", 1, "Fiction", 2020))
+        librarian.close()
+
+        restored = self.create_librarian()
+        self.assertTrue({"A1", "A2", "A3"} <= set(restored.books))
+        self.assertEqual(restored.storage.journal.record_count, 3)
+        restored.close()
+
+    #tests restarts from a binary snapshot, the journal records it includes are not replayed again
+    def test_restart_from_snapshot(self):
+        snapshot_path = os.path.join(self.temp_dir, 'library.snapshot')
+
+        #creates a librarian in journal mode with a binary snapshot
+        def create_librarian():
+            librarian = Librarian(self.books_path, self.waiting_list_path, journal_path=self.journal_path,
+                                  snapshot_path=snapshot_path)
+            librarian.logger.disable_console_logs()
+            return librarian
+
+        librarian = create_librarian()
+        book = librarian.books["1984"]
+        carol = Customer("Carol", "0501234567", "carol@example.com")
+        librarian.waiting_for_book(book, carol)
+        librarian.remove_from_waiting_lists(carol)
+        librarian.waiting_for_book(book, carol)
+        librarian.waiting_for_book(book, Customer("Dan", "0521234567", "dan@example.com"))
+        librarian.loaned(librarian.books["The Great Gatsby"])
+        librarian.close()
+
+        restored = create_librarian()
+        self.assertEqual([c.name for c in restored.waiting_list["1984"]], ["Carol", "Dan"])
+        self.assertEqual(restored.books_borrowed["The Great Gatsby"], 1)
+        # changes after the snapshot are replayed from the journal when the library stops without a snapshot
+        restored.returned(restored.books["1984"])
+        restored.storage.close()
+
+        restored = create_librarian()
+        self.assertEqual([c.name for c in restored.waiting_list["1984"]], ["Dan"])
+        self.assertEqual(restored.books_borrowed["The Great Gatsby"], 1)
+        restored.close()
+
+        restored = create_librarian()
+        self.assertEqual([c.name for c in restored.waiting_list["1984"]], ["Dan"])
+        restored.close()
+
+    #tests that compaction folds the journal into the snapshot and keeps partial borrow counts
+    def test_compaction(self):
+        librarian = self.create_librarian(compact_threshold=3)
+        gatsby = librarian.books["The Great Gatsby"]
+        librarian.loaned(gatsby)
+        librarian.loaned(gatsby)
+        librarian.added(Book("Journal Book", "Some Author", 2, "Fiction", 2020))
+        librarian.close()
+
+        # the journal only keeps the borrow counts the csv snapshot cannot express
+        self.assertEqual(librarian.storage.journal.record_count, len(librarian.books_borrowed))
+
+        restored = self.create_librarian()
+        self.assertIn("Journal Book", restored.books)
+        self.assertEqual(restored.books["The Great Gatsby"].available_copies, 2)
+        self.assertEqual(restored.books_borrowed["The Great Gatsby"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from search.LazyIndex import LazyIndex
+from search.PrefixIndex import PrefixIndex
+from search.Search import Search
+from search.SearchStrategy import TitleSearchStrategy
+from search.TokenIndex import TokenIndex
+
+#unit tests for the indexes built on their first query
+class TestLazyIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a few books and a lazy index over them
+    def setUp(self):
+        self.books = {}
+        for book in (Book("1984", "George Orwell", 3, "Dystopian", 1949),
+                     Book("Animal Farm", "George Orwell", 1, "Satire", 1945),
+                     Book("The Hobbit", "J.R.R. Tolkien", 2, "Fantasy", 1937)):
+            self.books[book.title] = book
+        self.index = LazyIndex(TokenIndex)
+        self.index.rebuild(self.books, {}, {})
+
+    #tests that the index is built on the first query and follows the changes made before and after it
+    def test_built_on_first_query(self):
+        book = Book("The Hobbit Returns", "New Author", 1, "Fantasy", 2020)
+        self.books[book.title] = book
+        self.index.book_changed(book, 0)
+        self.assertFalse(self.index.is_built())
+
+        self.assertEqual(self.index.lookup('title', "hobbit"), ["The Hobbit", "The Hobbit Returns"])
+        self.assertTrue(self.index.is_built())
+        del self.books["The Hobbit"]
+        self.index.book_removed("The Hobbit")
+        self.assertEqual(self.index.lookup('title', "hobbit"), ["The Hobbit Returns"])
+        self.assertEqual(self.index.name, "TokenIndex")
+
+        self.index.rebuild(self.books, {}, {})
+        self.assertFalse(self.index.is_built())
+
+    #tests that the other methods of the wrapped index are reached through the wrapper
+    def test_wrapped_methods(self):
+        index = LazyIndex(PrefixIndex)
+        index.rebuild(self.books, {}, {})
+        self.assertEqual(index.complete("the"), ["The Hobbit"])
+        self.assertEqual(index.keys["1984"], "1984")
+
+    #tests that the librarian builds its search indexes on use, and after a bulk add on the next query
+    def test_librarian(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path)
+        librarian.logger.disable_console_logs()
+        self.assertFalse(librarian.tokens.is_built())
+
+        search = Search.from_librarian(librarian)
+        self.assertEqual(search.find(TitleSearchStrategy(), "hobbit")[1], "TokenIndex")
+        self.assertTrue(librarian.tokens.is_built())
+
+        librarian.bulk_add([Book(f"Bulk Hobbit {number}", "Author", 1, "Fantasy", 2000) for number in range(100)])
+        self.assertFalse(librarian.tokens.is_built())
+        self.assertEqual(len(search.find(TitleSearchStrategy(), "bulk hobbit")[0]), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from search.LazyResults import LazyResults
+from search.Search import Search
+from search.SearchStrategy import TitleSearchStrategy, GenreSearchStrategy, YearRangeSearchStrategy
+
+#unit tests for the lazily produced, paged results
+class TestLazyResults(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian on a copy of the sample files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+        self.produced = 0
+
+    #removes the temporary files
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #yields numbers and counts how many were produced
+    def numbers(self, count):
+        for number in range(count):
+            self.produced += 1
+            yield number
+
+    #tests that pages only produce the books they need
+    def test_pages_are_lazy(self):
+        results = LazyResults(lambda: self.numbers(1000))
+        self.assertEqual(results.page(0, 10), list(range(10)))
+        self.assertEqual(self.produced, 10)
+        self.assertEqual(results.page(5, 10), list(range(5, 15)))
+        self.assertEqual(self.produced, 15)
+        self.assertEqual(next(iter(results)), 0)
+        self.assertEqual(self.produced, 15)
+        self.assertEqual(results.page(995, 10), list(range(995, 1000)))
+        self.assertEqual(results.total, 1000)
+        self.assertEqual(list(results), list(range(1000)))
+        self.assertEqual(self.produced, 1000)
+        with self.assertRaises(ValueError):
+            results.page(-1, 10)
+
+    #tests ordered results against a full sort
+    def test_ordered_pages(self):
+        values = [5, 3, 9, 3, 1, 8, 1, 7]
+        results = LazyResults(lambda: iter(values), key=lambda value: -value)
+        self.assertEqual(results.page(0, 3), [9, 8, 7])
+        self.assertEqual(results.page(3, 3), [5, 3, 3])
+        self.assertEqual(list(results), sorted(values, reverse=True))
+        self.assertEqual(len(results), 8)
+        self.assertFalse(LazyResults(lambda: iter([]), key=abs))
+
+    #tests that the paged searches give the books of the full searches
+    def test_search_paged(self):
+        for search in (Search.from_librarian(self.librarian), Search(self.librarian.books)):
+            for strategy, query in ((TitleSearchStrategy(), "the"), (GenreSearchStrategy(), "fiction"),
+                                    (YearRangeSearchStrategy(), "1800..1900")):
+                search.set_strategy(strategy)
+                self.assertEqual(list(search.search_paged(query)), search.search(query))
+            search.set_strategy(TitleSearchStrategy())
+            self.assertEqual(search.search_paged("zzzz").page(0, 10), [])
+
+    #tests that the paged displays give the books of the full displays
+    def test_display_paged(self):
+        search = Search(self.librarian.books, self.librarian.waiting_list, self.librarian.books_borrowed)
+        self.assertEqual(list(search.display_all_books_paged()), search.display_all_books())
+        self.assertEqual(list(search.display_available_books_paged()), search.display_available_books())
+        self.assertEqual(list(search.display_borrowed_books_paged()), search.display_borrowed_books())
+        self.assertEqual(list(search.display_books_by_genre_paged("Fiction")), search.display_books_by_genre("Fiction"))
+        self.assertEqual(search.display_popular_books_paged().page(0, 10), search.display_popular_books())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Error.LoanDoesNotExistException import LoanDoesNotExistException
+from Library.Customer import Customer
+from Library.Librarian import Librarian
+from Library.LoanLedger import LoanLedger
+
+
+#a clock that only moves when the test moves it
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+#unit tests for the loan ledger and the loans recorded by the librarian
+class TestLoanLedger(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a temporary directory, a fake clock and a few costumers
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.ledger_path = os.path.join(self.temp_dir, 'loans.jsonl')
+        self.clock = FakeClock()
+        self.alice = Customer("Alice", "0501234567", "alice@example.com")
+        self.bob = Customer("Bob", "0521234567", "bob@example.com")
+
+    #opens the ledger file with a loan period of 10 seconds
+    def open_ledger(self, **kwargs):
+        ledger = LoanLedger(self.ledger_path, loan_period=10, clock=self.clock, **kwargs)
+        self.addCleanup(ledger.close_file)
+        return ledger
+
+    #tests the indexes by costumer and title, returns and renewals
+    def test_indexes(self):
+        ledger = self.open_ledger()
+        first = ledger.lend("1984", self.alice)
+        self.clock.now += 1
+        second = ledger.lend("Dune", self.alice)
+        third = ledger.lend("1984", self.bob)
+        anonymous = ledger.lend("1984")
+
+        self.assertEqual(ledger.loans_of(self.alice), [first, second])
+        self.assertEqual(ledger.loans_for("1984"), [first, third, anonymous])
+        self.assertIs(ledger.give_back("1984", self.bob), third)
+        self.assertIsNone(ledger.give_back("1984", self.bob))
+        self.assertEqual(ledger.loans_for("1984"), [first, anonymous])
+        self.assertIs(ledger.give_back("1984"), first)
+        self.assertEqual(ledger.loans_of(self.alice), [second])
+        self.assertIsNone(ledger.give_back("Missing"))
+
+        ledger.renew(second.loan_id)
+        self.assertEqual((second.due, second.renewals), (1011, 1))
+
+    #tests that only the loans due before now are overdue, earliest first
+    def test_overdue(self):
+        ledger = self.open_ledger()
+        loans = []
+        for number in range(20):
+            self.clock.now = 1000 + number
+            loans.append(ledger.lend(f"Book {number}", self.alice))
+        ledger.give_back("Book 2", self.alice)
+        ledger.renew(loans[0].loan_id)
+
+        self.assertEqual(ledger.overdue(now=1015), [loans[1], loans[3], loans[4]])
+        self.assertEqual(ledger.overdue(now=1010), [])
+        self.assertEqual(ledger.overdue(now=2000)[-2:], [loans[0], loans[19]])
+
+    #tests that the loans are read back from the file, also after it was compacted
+    def test_persistence(self):
+        ledger = self.open_ledger(compact_threshold=4)
+        kept = ledger.lend("1984", self.alice)
+        for _ in range(3):
+            ledger.lend("Dune", self.bob)
+            ledger.give_back("Dune", self.bob)
+        ledger.renew(kept.loan_id)
+        ledger.lend("Dune")
+        ledger.close_file()
+
+        restored = self.open_ledger()
+        self.assertEqual([(loan.loan_id, loan.title, loan.due, loan.renewals) for loan in restored.loans_of(self.alice)],
+                         [(kept.loan_id, "1984", kept.due, 1)])
+        self.assertEqual(len(restored), 2)
+        self.assertEqual(restored.lend("1984").loan_id, ledger.next_id)
+
+    #tests that the holds of loans are read back from the file, also after it was compacted
+    def test_hold_persistence(self):
+        ledger = self.open_ledger(compact_threshold=4)
+        held = ledger.lend("1984", self.alice)
+        picked = ledger.lend("Dune", self.bob)
+        ledger.hold(held.loan_id, 1010)
+        ledger.hold(picked.loan_id, 1005)
+        ledger.release(picked.loan_id)
+        self.assertEqual(ledger.held(), [held])
+        ledger.close_file()
+
+        restored = self.open_ledger(compact_threshold=4)
+        self.assertEqual([(loan.loan_id, loan.hold_until) for loan in restored.held()], [(held.loan_id, 1010)])
+        for _ in range(3):
+            restored.lend("Emma")
+            restored.give_back("Emma")
+        restored.close_file()
+        self.assertEqual([(loan.loan_id, loan.hold_until) for loan in self.open_ledger().held()],
+                         [(held.loan_id, 1010)])
+
+    #tests that the loans made after a crash in the middle of a write are read back
+    def test_torn_write(self):
+        ledger = self.open_ledger()
+        ledger.lend("1984", self.alice)
+        ledger.close_file()
+        with open(self.ledger_path, mode='a', encoding='utf-8') as file:
+            file.write('{"op": "loan", "id": 2, "tit')
+
+        ledger = self.open_ledger()
+        ledger.lend("Dune", self.bob)
+        ledger.close_file()
+        self.assertEqual([loan.title for loan in self.open_ledger().loans_for("Dune")], ["Dune"])
+
+    #tests the loans recorded by the librarian for loans, returns and waiting lists
+    def test_librarian_records_loans(self):
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path, ledger=self.open_ledger())
+        librarian.logger.disable_console_logs()
+
+        librarian.added(Book("Ledger Test", "Author", 1, "Fiction", 2000))
+        book = librarian.books["Ledger Test"]
+        librarian.loaned(book, self.alice)
+        librarian.waiting_for_book(book, self.bob)
+        self.assertEqual([loan.title for loan in librarian.loans_of(self.alice)], ["Ledger Test"])
+
+        librarian.returned(book, self.alice)
+        self.assertEqual(librarian.loans_of(self.alice), [])
+        self.assertEqual([loan.title for loan in librarian.loans_of(self.bob)], ["Ledger Test"])
+
+        self.clock.now += 11
+        self.assertEqual([loan.customer.name for loan in librarian.overdue_loans()], ["Bob"])
+        librarian.renewed(book, self.bob)
+        self.assertEqual(librarian.overdue_loans(), [])
+        with self.assertRaises(LoanDoesNotExistException):
+            librarian.renewed(book, self.alice)
+
+        with self.assertRaises(LoanDoesNotExistException):
+            librarian.returned(book, self.alice)
+        self.assertEqual(librarian.books_borrowed["Ledger Test"], 1)
+        self.assertEqual([loan.title for loan in librarian.loans_of(self.bob)], ["Ledger Test"])
+
+
+if __name__ == '__main__':
+    unittest.main()
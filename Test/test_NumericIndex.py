@@ -0,0 +1,95 @@
+import unittest
+import os
+import random
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from search.NumericIndex import NumericIndex
+from search.Search import Search
+from search.SearchStrategy import RangeSearchStrategy, YearRangeSearchStrategy, CopiesRangeSearchStrategy, \
+    AvailableCopiesSearchStrategy
+from Error.InvalidSearchQueryException import InvalidSearchQueryException
+
+#unit tests for the sorted numeric indexes and the range strategies
+class TestNumericIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates random books and an index over them
+    def setUp(self):
+        rng = random.Random(11)
+        self.books = {}
+        for i in range(300):
+            book = Book(f"Book {i}", "Author", rng.randint(1, 6), "Genre", rng.randint(1900, 2020))
+            book.available_copies = rng.randint(0, book.total_copies)
+            self.books[book.title] = book
+        self.index = NumericIndex()
+        self.index.rebuild(self.books, {}, {})
+
+    #tests the supported query forms
+    def test_parse_range(self):
+        parse = RangeSearchStrategy.parse_range
+        self.assertEqual(parse("1940..1960"), (1940, 1960))
+        self.assertEqual(parse(" 1940 .. "), (1940, None))
+        self.assertEqual(parse("..1960"), (None, 1960))
+        self.assertEqual(parse(">=3"), (3, None))
+        self.assertEqual(parse("> 0"), (1, None))
+        self.assertEqual(parse("<=2"), (None, 2))
+        self.assertEqual(parse("<2"), (None, 1))
+        self.assertEqual(parse("=1949"), (1949, 1949))
+        self.assertEqual(parse("1949"), (1949, 1949))
+        for query in ("", "..", "19x", "1940..1960..1980", ">>3"):
+            with self.assertRaises(InvalidSearchQueryException):
+                parse(query)
+
+    #tests that the index gives the same books as a scan, including after changes
+    def test_matches_scan(self):
+        queries = ["1940..1960", "2000..", "..1910", "=1950", "1960..1940", ">=3", "<2", "0", "> 0"]
+        strategies = [YearRangeSearchStrategy(), CopiesRangeSearchStrategy(), AvailableCopiesSearchStrategy()]
+
+        def check():
+            for strategy in strategies:
+                for query in queries:
+                    self.assertEqual(strategy.search_index(query, self.books, self.index),
+                                     strategy.search(query, self.books), (strategy.field, query))
+
+        check()
+        for title in list(self.books)[::3]:
+            del self.books[title]
+            self.index.book_removed(title)
+        for book in list(self.books.values())[::4]:
+            book.available_copies = 0
+            book.year = 1950
+            self.index.book_changed(book, book.total_copies)
+        check()
+
+    #tests that the librarian keeps the index up to date when books are loaned
+    def test_librarian_updates(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path)
+        librarian.logger.disable_console_logs()
+
+        librarian.added(Book("Range Test", "Author", 1, "Genre", 1066))
+        search = Search.from_librarian(librarian)
+        search.set_strategy(YearRangeSearchStrategy())
+        self.assertEqual([book.title for book in search.search("..1066")], ["The Odyssey", "The Iliad", "ק", "Range Test"])
+
+        search.set_strategy(AvailableCopiesSearchStrategy())
+        self.assertIn("Range Test", [book.title for book in search.search(">0")])
+        librarian.loaned(librarian.books["Range Test"])
+        self.assertIn("Range Test", [book.title for book in search.search("0")])
+        self.assertNotIn("Range Test", [book.title for book in search.search(">0")])
+
+
+if __name__ == '__main__':
+    unittest.main()
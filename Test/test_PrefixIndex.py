@@ -0,0 +1,57 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from search.PrefixIndex import PrefixIndex
+
+#unit tests for the title autocomplete
+class TestPrefixIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a few books and an index over them
+    def setUp(self):
+        self.books = {title: Book(title, "Author", 1, "Genre", 2000)
+                      for title in ("The Hobbit", "the Road", "The Great Gatsby", "Animal Farm", "1984", "Thr")}
+        self.index = PrefixIndex()
+        self.index.rebuild(self.books, {}, {})
+
+    #tests completions in alphabetical order, ignoring case
+    def test_complete(self):
+        self.assertEqual(self.index.complete("the "), ["The Great Gatsby", "The Hobbit", "the Road"])
+        self.assertEqual(self.index.complete("TH", limit=2), ["The Great Gatsby", "The Hobbit"])
+        self.assertEqual(self.index.complete("1"), ["1984"])
+        self.assertEqual(self.index.complete("x"), [])
+
+    #tests that the index follows added and removed books
+    def test_incremental_updates(self):
+        self.index.book_changed(Book("The Hobbit 2", "Author", 1, "Genre", 2000), 0)
+        self.index.book_removed("The Hobbit")
+        self.index.book_removed("Missing")
+        self.assertEqual(self.index.complete("the h"), ["The Hobbit 2"])
+
+    #tests the completions of the librarian after adding and removing books
+    def test_librarian_complete(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path)
+        librarian.logger.disable_console_logs()
+
+        librarian.added(Book("Zzyzx Road", "Author", 1, "Genre", 2000))
+        self.assertEqual(librarian.complete_title("zzy"), ["Zzyzx Road"])
+        librarian.removed(librarian.books["Zzyzx Road"])
+        self.assertEqual(librarian.complete_title("zzy"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
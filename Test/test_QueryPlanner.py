@@ -0,0 +1,85 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from search.Search import Search
+from search.QueryPlanner import QueryPlanner
+from Error.InvalidSearchQueryException import InvalidSearchQueryException
+from Error.BookDoesNotExistException import BookDoesNotExistException
+
+#unit tests for compound queries
+class TestQueryPlanner(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian on a copy of the sample files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+        self.search = Search.from_librarian(self.librarian)
+
+    #removes the temporary files
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #returns the books matching every condition by scanning
+    def scan(self, author=None, genre=None, low=None, high=None, available=None):
+        return {book.title for book in self.librarian.books.values()
+                if (author is None or author in book.author.lower())
+                and (genre is None or genre in book.genre.lower())
+                and (low is None or book.year >= low) and (high is None or book.year <= high)
+                and (available is None or (book.available_copies > 0) == available)}
+
+    #tests parsing fields, quoted values and default title terms
+    def test_parse(self):
+        predicates = QueryPlanner(self.search).parse('author:"george orwell" 1984 Year:1940..1950 available:no')
+        self.assertEqual([str(predicate) for predicate in predicates],
+                         ["author:george orwell", "title:1984", "year:1940..1950", "available:0"])
+        for query in ("", "shelf:3", 'author:""', "year:abc"):
+            with self.assertRaises(InvalidSearchQueryException):
+                self.search.plan(query).execute()
+
+    #tests that compound queries give the same books as a scan
+    def test_results_match_scan(self):
+        cases = [
+            ("author:orwell year:1940..1950", dict(author="orwell", low=1940, high=1950)),
+            ("genre:fiction available:yes", dict(genre="fiction", available=True)),
+            ("genre:fic author:a year:1900..", dict(genre="fic", author="a", low=1900)),
+            ("year:..1900 available:no", dict(high=1900, available=False)),
+        ]
+        for query, conditions in cases:
+            results = self.search.plan(query).execute()
+            self.assertEqual({book.title for book in results}, self.scan(**conditions), query)
+            self.assertEqual(len(results), len(set(results)))
+
+    #tests that the most selective predicate runs first and explain() reports every step
+    def test_plan_order_and_explain(self):
+        plan = self.search.plan("genre:fiction year:1949")
+        self.assertEqual([predicate.field for predicate in plan.predicates], ["year", "genre"])
+        self.assertEqual(len(plan.explain().splitlines()), 2)
+
+        plan.execute()
+        explanation = plan.explain().splitlines()
+        self.assertEqual(len(explanation), 3)
+        self.assertIn("NumericIndex", explanation[0])
+        self.assertTrue(explanation[2].startswith("total"))
+
+    #tests the search entry point
+    def test_compound_search(self):
+        self.assertTrue(self.search.compound_search("author:orwell"))
+        with self.assertRaises(BookDoesNotExistException):
+            self.search.compound_search("author:orwell year:..0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from search.RelevanceRanker import RelevanceRanker
+from search.Search import Search
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy
+
+#unit tests for the relevance ranked search
+class TestRelevanceRanker(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a few books and a ranker over them
+    def setUp(self):
+        self.books = {}
+        for book in (Book("A History of War and Peace", "Historian", 1, "History", 2001),
+                     Book("War and Peace", "Leo Tolstoy", 1, "Classic", 1869),
+                     Book("The Art of War", "Sun Tzu", 1, "Philosophy", -500),
+                     Book("Warriors", "Someone", 1, "Fantasy", 2003),
+                     Book("Peace", "Someone Else", 1, "Poetry", 2010)):
+            self.books[book.title] = book
+        self.ranker = RelevanceRanker()
+        self.ranker.rebuild(self.books, {}, {})
+
+    #tests that exact and full word matches rank first
+    def test_ranking(self):
+        top = self.ranker.top(self.books.values(), "war and peace", 3)
+        self.assertEqual([book.title for book in top], ["War and Peace", "A History of War and Peace", "Peace"])
+        ranked = [book.title for book in self.ranker.top(self.books.values(), "war", 5)]
+        self.assertEqual(ranked[:2], ["War and Peace", "Warriors"])
+        self.assertEqual(ranked[-1], "Peace")
+
+    #tests that demand moves a book up among equally matching books
+    def test_demand_boost(self):
+        self.assertEqual([book.title for book in self.ranker.top(self.books.values(), "war", 2)],
+                         ["War and Peace", "Warriors"])
+        self.ranker.book_changed(self.books["Warriors"], 1)
+        self.ranker.waiting_list_changed("Warriors", 3)
+        self.assertEqual([book.title for book in self.ranker.top(self.books.values(), "war", 2)],
+                         ["Warriors", "War and Peace"])
+
+    #tests that the statistics follow added and removed books
+    def test_incremental_statistics(self):
+        rebuilt = RelevanceRanker()
+        book = Book("War Games", "Author", 1, "Genre", 1983)
+        self.books[book.title] = book
+        self.ranker.book_changed(book, 0)
+        del self.books["Peace"]
+        self.ranker.book_removed("Peace")
+        rebuilt.rebuild(self.books, {}, {})
+        self.assertEqual(self.ranker.document_frequency, rebuilt.document_frequency)
+        self.assertEqual(self.ranker.total_length, rebuilt.total_length)
+
+    #tests ranked searches through the librarian
+    def test_ranked_search(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path)
+        librarian.logger.disable_console_logs()
+        librarian.added(Book("Ranked", "Tester", 1, "Genre", 2000))
+        librarian.added(Book("Ranked Too", "Tester", 1, "Genre", 2000))
+
+        search = Search.from_librarian(librarian)
+        search.set_strategy(AuthorSearchStrategy())
+        self.assertEqual([book.title for book in search.search("tester", ranked=True)], ["Ranked", "Ranked Too"])
+        librarian.waiting_for_book(librarian.books["Ranked Too"], Customer("Reader", "0501234567", "r@x.com"))
+        self.assertEqual([book.title for book in search.search("tester", ranked=True)], ["Ranked Too", "Ranked"])
+
+        search.set_strategy(TitleSearchStrategy())
+        self.assertEqual(len(search.search("the", ranked=True, limit=3)), 3)
+        with self.assertRaises(ValueError):
+            Search(librarian.books, indexes=[]).search("the", ranked=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
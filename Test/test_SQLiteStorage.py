@@ -0,0 +1,72 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+from system.SQLiteStorage import SQLiteStorage
+
+#unit tests for the sqlite storage backend
+class TestSQLiteStorage(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a database imported from the sample csv files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'library.db')
+        storage = SQLiteStorage(self.db_path)
+        storage.import_csv(os.path.join(self.base_path, 'files', 'books.csv'),
+                           os.path.join(self.base_path, 'files', 'waiting_list.csv'))
+        storage.close()
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #creates a librarian on top of the database
+    def create_librarian(self):
+        librarian = Librarian(storage=SQLiteStorage(self.db_path))
+        librarian.logger.disable_console_logs()
+        return librarian
+
+    #tests that the migration keeps the books and borrowed copies of the csv files
+    def test_import_csv(self):
+        librarian = self.create_librarian()
+        self.assertIn("1984", librarian.books)
+        self.assertEqual(librarian.books["1984"].available_copies, 0)
+        self.assertEqual(librarian.books_borrowed["1984"], librarian.books["1984"].total_copies)
+        librarian.close()
+
+    #tests that single changes are persisted and survive a restart
+    def test_changes_persist(self):
+        librarian = self.create_librarian()
+        librarian.loaned(librarian.books["The Great Gatsby"])
+        librarian.added(Book("SQLite Book", "Some Author", 2, "Fiction", 2020))
+        librarian.removed(librarian.books["The Catcher in the Rye"])
+        librarian.waiting_for_book(librarian.books["1984"],
+                                   Customer("John Doe", "0501234567", "john@example.com"))
+        librarian.close()
+
+        restored = self.create_librarian()
+        self.assertEqual(restored.books["The Great Gatsby"].available_copies, 3)
+        self.assertEqual(restored.books_borrowed["The Great Gatsby"], 1)
+        self.assertIn("SQLite Book", restored.books)
+        self.assertNotIn("The Catcher in the Rye", restored.books)
+        self.assertEqual([c.name for c in restored.waiting_list["1984"]], ["John Doe"])
+
+        restored.returned(restored.books["The Great Gatsby"])
+        restored.close()
+
+        restored = self.create_librarian()
+        self.assertNotIn("The Great Gatsby", restored.books_borrowed)
+        restored.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
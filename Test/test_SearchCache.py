@@ -0,0 +1,91 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from search.Search import Search
+from search.SearchCache import SearchCache
+from search.SearchStrategy import TitleSearchStrategy, AvailableCopiesSearchStrategy, FuzzySearchStrategy
+
+#unit tests for the search result cache
+class TestSearchCache(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a librarian on a copy of the sample files
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        books_path = os.path.join(self.temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        self.librarian = Librarian(books_path, waiting_list_path)
+        self.librarian.logger.disable_console_logs()
+        self.librarian.added(Book("Cache Test", "Author", 2, "Genre", 2000))
+        self.search = Search.from_librarian(self.librarian)
+        self.cache = self.librarian.search_cache
+
+    #removes the temporary files
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #runs a search with a strategy and returns the titles
+    def titles(self, strategy, query):
+        self.search.set_strategy(strategy)
+        return [book.title for book in self.search.search(query)]
+
+    #tests that repeated searches are served from the cache, ignoring the case of the query
+    def test_hits(self):
+        first = self.titles(TitleSearchStrategy(), "cache")
+        self.assertEqual(self.titles(TitleSearchStrategy(), "CACHE"), first)
+        self.assertEqual(self.search.find(TitleSearchStrategy(), "cache")[1], "cache")
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+
+    #tests that changes only invalidate the searches that read the changed fields
+    def test_invalidation_by_field(self):
+        self.titles(TitleSearchStrategy(), "cache")
+        self.titles(AvailableCopiesSearchStrategy(), "2")
+        version = self.cache.version
+
+        self.librarian.loaned(self.librarian.books["Cache Test"])
+        self.assertGreater(self.cache.version, version)
+        self.assertEqual(self.search.find(TitleSearchStrategy(), "cache")[1], "cache")
+        self.assertNotEqual(self.search.find(AvailableCopiesSearchStrategy(), "2")[1], "cache")
+        self.assertEqual(self.cache.stats()['invalidations'], 1)
+
+        self.librarian.added(Book("Cache Test 2", "Author", 1, "Genre", 2000))
+        self.assertEqual(self.titles(TitleSearchStrategy(), "cache"), ["Cache Test", "Cache Test 2"])
+        self.librarian.removed(self.librarian.books["Cache Test 2"])
+        self.assertEqual(self.titles(TitleSearchStrategy(), "cache"), ["Cache Test"])
+
+    #tests that waiting list changes do not touch the book fields
+    def test_waiting_list_changes(self):
+        self.titles(TitleSearchStrategy(), "cache")
+        self.librarian.waiting_for_book(self.librarian.books["Cache Test"], Customer("Reader", "0501234567", "r@x.com"))
+        self.assertEqual(self.search.find(TitleSearchStrategy(), "cache")[1], "cache")
+
+    #tests that the least recently used entries are evicted and options are part of the key
+    def test_eviction(self):
+        cache = SearchCache(max_entries=2)
+        strategy = TitleSearchStrategy()
+        cache.put(strategy, "a", [])
+        cache.put(strategy, "b", [])
+        cache.get(strategy, "a")
+        cache.put(strategy, "c", [])
+        self.assertIsNone(cache.get(strategy, "b"))
+        self.assertEqual(cache.get(strategy, "a"), [])
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+        cache.put(FuzzySearchStrategy(limit=5), "a", [])
+        self.assertIsNone(cache.get(FuzzySearchStrategy(limit=10), "a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
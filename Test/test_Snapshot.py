@@ -0,0 +1,87 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Library.Librarian import Librarian
+from Library.Customer import Customer
+from Books.Book import Book
+from system.Snapshot import Snapshot
+
+#unit tests for the binary snapshot
+class TestSnapshot(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #copies the sample files into a temporary directory
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.books_path = os.path.join(self.temp_dir, 'books.csv')
+        self.waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        self.journal_path = os.path.join(self.temp_dir, 'journal.jsonl')
+        self.snapshot_path = os.path.join(self.temp_dir, 'library.snapshot')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), self.books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), self.waiting_list_path)
+
+    #removes the temporary directory
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    #creates a librarian in journal mode with a snapshot
+    def create_librarian(self):
+        librarian = Librarian(self.books_path, self.waiting_list_path, journal_path=self.journal_path,
+                              snapshot_path=self.snapshot_path)
+        librarian.logger.disable_console_logs()
+        return librarian
+
+    #returns the state of a librarian that is compared between loads
+    @staticmethod
+    def state(librarian):
+        books = [(b.title, b.author, b.total_copies, b.available_copies, b.genre, b.year)
+                 for b in librarian.books.values()]
+        waiting = {title: [(c.name, c.phone, c.email) for c in customers]
+                   for title, customers in librarian.waiting_list.items()}
+        return books, waiting, dict(librarian.books_borrowed)
+
+    #tests that the snapshot written on close restores the same state
+    def test_round_trip(self):
+        librarian = self.create_librarian()
+        librarian.loaned(librarian.books["The Great Gatsby"])
+        librarian.added(Book("ספר חדש", "סופר", 2, "Fiction", 2020))
+        librarian.waiting_for_book(librarian.books["1984"],
+                                   Customer("נועה", "0501234567", "noa@example.com"))
+        librarian.close()
+        expected = self.state(librarian)
+
+        snapshot = Snapshot(self.snapshot_path, self.books_path, self.waiting_list_path)
+        self.assertTrue(snapshot.is_fresh())
+        self.assertEqual(self.state(self.create_librarian()), expected)
+
+    #tests that the csv files are used when they changed after the snapshot
+    def test_stale_snapshot_falls_back_to_csv(self):
+        self.create_librarian().close()
+        with open(self.books_path, 'a', encoding='utf-8') as file:
+            file.write("Appended Book,Some Author,No,1,Fiction,2001\n")
+
+        self.assertFalse(Snapshot(self.snapshot_path, self.books_path, self.waiting_list_path).is_fresh())
+        self.assertIn("Appended Book", self.create_librarian().books)
+
+    #tests that a damaged snapshot is rejected by the checksum
+    def test_damaged_snapshot(self):
+        self.create_librarian().close()
+        with open(self.snapshot_path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            last = file.read(1)
+            file.seek(-1, os.SEEK_END)
+            file.write(bytes([last[0] ^ 0xFF]))
+
+        with self.assertRaises(ValueError):
+            Snapshot(self.snapshot_path, self.books_path, self.waiting_list_path).load()
+        self.assertIn("1984", self.create_librarian().books)
+
+
+if __name__ == '__main__':
+    unittest.main()
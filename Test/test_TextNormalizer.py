@@ -0,0 +1,68 @@
+import unittest
+import logging
+from Books.Book import Book
+from system.TextNormalizer import normalize_text
+from search.Search import Search
+from search.TokenIndex import TokenIndex
+from search.TrigramIndex import TrigramIndex
+from search.PrefixIndex import PrefixIndex
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy
+
+#unit tests for the normalized search keys
+class TestTextNormalizer(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    #creates books with accented and Hebrew titles
+    def setUp(self):
+        self.books = {}
+        for book in (Book("Les Misérables", "Victor Hugo", 1, "Classic", 1862),
+                     Book("Die Straße", "Ännchen Groß", 1, "Drama", 1950),
+                     Book("שָׁלוֹם עֲלֵיכֶם", "שלום עליכם", 1, "Fiction", 1900),
+                     Book("ＦＵＬＬ ＷＩＤＴＨ", "Author", 1, "Fiction", 2000)):
+            self.books[book.title] = book
+
+    #tests the keys of single texts
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("Les Misérables"), "les miserables")
+        self.assertEqual(normalize_text("ÉMILE"), normalize_text("emile"))
+        self.assertEqual(normalize_text("Straße"), "strasse")
+        self.assertEqual(normalize_text("ＦＵＬＬ"), "full")
+        self.assertEqual(normalize_text("שָׁלוֹם"), "שלומ")
+        self.assertEqual(normalize_text("עליכם"), normalize_text("עֲלֵיכֶמ"))
+        self.assertEqual(normalize_text("Plain ASCII"), "plain ascii")
+
+    #tests that the keys of a book follow its fields
+    def test_book_keys(self):
+        book = self.books["Les Misérables"]
+        self.assertEqual((book.title_key, book.author_key, book.genre_key), ("les miserables", "victor hugo", "classic"))
+        book.author = "VÍCTOR"
+        self.assertEqual(book.author_key, "victor")
+
+    #tests that searches ignore case, accents, niqqud and final letters, with and without indexes
+    def test_search(self):
+        indexes = [TokenIndex(), TrigramIndex()]
+        for index in indexes:
+            index.rebuild(self.books, {}, {})
+        for search in (Search(self.books), Search(self.books, indexes=indexes[:1]), Search(self.books, indexes=indexes[1:])):
+            search.set_strategy(TitleSearchStrategy())
+            self.assertEqual([book.title for book in search.search("MISERABLES")], ["Les Misérables"])
+            self.assertEqual([book.title for book in search.search("strasse")], ["Die Straße"])
+            self.assertEqual([book.title for book in search.search("שלומ")], ["שָׁלוֹם עֲלֵיכֶם"])
+            self.assertEqual([book.title for book in search.search("full width")], ["ＦＵＬＬ ＷＩＤＴＨ"])
+            search.set_strategy(AuthorSearchStrategy())
+            self.assertEqual([book.title for book in search.search("annchen gross")], ["Die Straße"])
+            self.assertEqual([book.title for book in search.search("עֲלֵיכֶם")], ["שָׁלוֹם עֲלֵיכֶם"])
+
+    #tests autocomplete with normalized prefixes
+    def test_prefix_completion(self):
+        index = PrefixIndex()
+        index.rebuild(self.books, {}, {})
+        self.assertEqual(index.complete("les mis"), ["Les Misérables"])
+        self.assertEqual(index.complete("שָׁל"), ["שָׁלוֹם עֲלֵיכֶם"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import random
+import logging
+from Books.Book import Book
+from search.TokenIndex import TokenIndex
+from search.Search import Search
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy
+
+#unit tests for the inverted word index of the titles and authors
+class TestTokenIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    #creates a few books and an index over them
+    def setUp(self):
+        self.books = {}
+        for book in (Book("1984", "George Orwell", 3, "Dystopian", 1949),
+                     Book("Animal Farm", "George Orwell", 1, "Satire", 1945),
+                     Book("The Hobbit", "J.R.R. Tolkien", 2, "Fantasy", 1937),
+                     Book("The Lord of the Rings", "J.R.R. Tolkien", 2, "Fantasy", 1954),
+                     Book("Gone with the Wind", "Margaret Mitchell", 1, "Romance", 1936)):
+            self.books[book.title] = book
+        self.index = TokenIndex()
+        self.index.rebuild(self.books, {}, {})
+
+    #returns the titles found by a substring scan, the way the search strategies scan
+    def scan(self, field, query):
+        query = query.lower()
+        return [title for title, book in self.books.items() if query in getattr(book, field).lower()]
+
+    #tests word, prefix and inner-word queries
+    def test_lookup(self):
+        self.assertEqual(self.index.lookup('title', "the"), ["The Hobbit", "The Lord of the Rings", "Gone with the Wind"])
+        self.assertEqual(self.index.lookup('title', "hob"), ["The Hobbit"])
+        self.assertEqual(self.index.lookup('author', "WELL"), ["1984", "Animal Farm"])
+        self.assertEqual(self.index.lookup('author', "r.r. tol"), ["The Hobbit", "The Lord of the Rings"])
+        self.assertEqual(self.index.lookup('title', "zzz"), [])
+        self.assertIsNone(self.index.lookup('title', " . "))
+        self.assertIsNone(self.index.lookup('genre', "fantasy"))
+
+    #tests that the index follows added, changed and removed books
+    def test_incremental_updates(self):
+        book = Book("The Hobbit Returns", "New Author", 1, "Fantasy", 2020)
+        self.books[book.title] = book
+        self.index.book_changed(book, 0)
+        self.assertEqual(self.index.lookup('title', "hobbit"), ["The Hobbit", "The Hobbit Returns"])
+
+        del self.books["The Hobbit"]
+        self.index.book_removed("The Hobbit")
+        self.assertEqual(self.index.lookup('title', "hobbit"), ["The Hobbit Returns"])
+        self.assertEqual(self.index.lookup('author', "tolkien"), ["The Lord of the Rings"])
+
+        del self.books["The Lord of the Rings"]
+        self.index.book_removed("The Lord of the Rings")
+        self.assertEqual(self.index.lookup('author', "tolk"), [])
+        self.assertNotIn("tolkien", self.index.postings['author'])
+
+    #tests that random queries give the same books as a scan
+    def test_matches_scan(self):
+        rng = random.Random(9)
+        words = ["the", "war", "peace", "old", "man", "sea", "o'neil", "dark", "tower", "a"]
+        for i in range(300):
+            title = f"{' '.join(rng.choices(words, k=rng.randint(1, 4)))} {i}"
+            author = ' '.join(rng.choices(words, k=2)).title()
+            self.books[title] = Book(title, author, 1, "Genre", 2000)
+        for title in rng.sample(list(self.books), 50):
+            del self.books[title]
+        self.index.rebuild(self.books, {}, {})
+
+        queries = ["the", "ar", "e s", "o'n", "'", "1", "old man", "a", "r 1", "WAR", "dark tower 2"]
+        for _ in range(100):
+            text = rng.choice(list(self.books))
+            start = rng.randrange(len(text))
+            queries.append(text[start:start + rng.randint(1, 6)])
+        for field in ('title', 'author'):
+            for query in queries:
+                found = self.index.lookup(field, query)
+                if found is not None:
+                    self.assertEqual(found, self.scan(field, query), (field, query))
+
+    #tests that the search uses the index and keeps the scan results
+    def test_search_with_index(self):
+        search = Search(self.books, indexes=[self.index])
+        search.set_strategy(AuthorSearchStrategy())
+        self.assertEqual([book.title for book in search.search("orwell")], ["1984", "Animal Farm"])
+        search.set_strategy(TitleSearchStrategy())
+        self.assertEqual([book.title for book in search.search("of the")], ["The Lord of the Rings"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import random
+import logging
+from Books.Book import Book
+from search.TrigramIndex import TrigramIndex
+from search.Search import Search
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy, GenreSearchStrategy
+
+#unit tests for the trigram index of the titles, authors and genres
+class TestTrigramIndex(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    #creates random books and an index over them
+    def setUp(self):
+        self.rng = random.Random(10)
+        self.books = {}
+        alphabet = "abcde .'-"
+        for i in range(400):
+            self.add_book(self.random_text(alphabet, 12) + str(i), self.random_text(alphabet, 8),
+                          self.rng.choice(["Fiction", "Science Fiction", "Drama", "Sci-Fi"]))
+        self.index = TrigramIndex()
+        self.index.rebuild(self.books, {}, {})
+
+    #returns random text of up to length letters
+    def random_text(self, alphabet, length):
+        return ''.join(self.rng.choice(alphabet) for _ in range(self.rng.randint(1, length))).title()
+
+    #adds a book to the dict
+    def add_book(self, title, author, genre):
+        self.books[title] = Book(title, author, 1, genre, 2000)
+        return self.books[title]
+
+    #returns the titles found by the substring scan of the search strategies
+    def scan(self, field, query):
+        query = query.lower()
+        return [title for title, book in self.books.items() if query in getattr(book, field).lower()]
+
+    #returns random queries, most of them taken from the indexed values
+    def random_queries(self):
+        queries = ["a", "ab", "abc", "e .", " ", "'", "fi", "sci-f", "fiction", "zzz", "A B"]
+        values = [getattr(book, field) for book in self.books.values() for field in ('title', 'author', 'genre')]
+        for _ in range(300):
+            value = self.rng.choice(values)
+            start = self.rng.randrange(len(value))
+            queries.append(value[start:start + self.rng.randint(1, 7)])
+        return queries
+
+    #checks every random query against the scan
+    def assert_matches_scan(self):
+        for query in self.random_queries():
+            for field in ('title', 'author', 'genre'):
+                self.assertEqual(self.index.lookup(field, query), self.scan(field, query), (field, query))
+
+    #tests that random queries give exactly the books of a scan
+    def test_matches_scan(self):
+        self.assert_matches_scan()
+
+    #tests that the index stays equal to the scan after books are added, changed and removed
+    def test_matches_scan_after_changes(self):
+        for title in self.rng.sample(list(self.books), 100):
+            del self.books[title]
+            self.index.book_removed(title)
+        for i in range(50):
+            book = self.add_book(f"new {self.random_text('abcde ', 10)} {i}", "Anne Abbe", "Drama")
+            self.index.book_changed(book, 0)
+        book = self.books[self.rng.choice(list(self.books))]
+        book.genre = "Poetry"
+        self.index.book_changed(book, 0)
+        self.assert_matches_scan()
+
+    #tests the lookups that cannot use the index
+    def test_unsupported_queries(self):
+        self.assertIsNone(self.index.lookup('title', ""))
+        self.assertIsNone(self.index.lookup('year', "2000"))
+        self.assertIsNone(self.index.lookup('title', "\u0301"))  # a combining mark is dropped by the normalization
+        self.assertIsNone(self.index.estimate('title', "\u0301"))
+
+    #tests that a query made empty by the normalization gives the books of the scan
+    def test_query_empty_after_normalization(self):
+        indexed = Search(self.books, indexes=[self.index])
+        scanned = Search(self.books)
+        for search in (indexed, scanned):
+            search.set_strategy(TitleSearchStrategy())
+        self.assertEqual(indexed.search("\u0301"), scanned.search("\u0301"))
+
+    #tests that the search gives the same books with and without the index
+    def test_search_with_index(self):
+        indexed = Search(self.books, indexes=[self.index])
+        scanned = Search(self.books)
+        for strategy, query in ((TitleSearchStrategy(), "ab"), (AuthorSearchStrategy(), "e a"),
+                                (GenreSearchStrategy(), "ce fic")):
+            indexed.set_strategy(strategy)
+            scanned.set_strategy(strategy)
+            self.assertEqual(indexed.search(query), scanned.search(query))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from unittest import mock
+from Library.Customer import Customer
+from Library.Librarian import Librarian
+from Library.WaitingList import WaitingList, WaitingQueue
+
+#unit tests for the waiting list queues and the costumer reverse index
+class TestWaitingList(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #creates a few costumers
+    def setUp(self):
+        self.alice = Customer("Alice", "0501234567", "alice@example.com")
+        self.bob = Customer("Bob", "0521234567", "bob@example.com")
+        self.carol = Customer("Carol", "0531234567", "carol@example.com")
+
+    #tests first come first served order and membership by name and phone
+    def test_queue(self):
+        queue = WaitingQueue([self.alice, self.bob])
+        queue.append(self.carol)
+        self.assertIn(Customer("Bob", "0521234567", "other@example.com"), queue)
+        self.assertEqual(queue.popleft(), self.alice)
+        self.assertNotIn(self.alice, queue)
+        self.assertTrue(queue.remove(self.carol))
+        self.assertFalse(queue.remove(self.carol))
+        self.assertEqual(list(queue), [self.bob])
+        self.assertEqual(len(queue), 1)
+
+    #tests that the recorded changes of a queue are undone, putting the costumers back in their place
+    def test_undo_changes(self):
+        waiting_list = WaitingList({"1984": [self.alice, self.bob]})
+        queue = waiting_list["1984"]
+        queue.record_changes()
+        queue.popleft()
+        queue.append(self.carol)
+        queue.remove(self.bob)
+        queue.append(self.alice, priority=-1)
+        queue.undo_changes()
+        self.assertEqual(list(queue), [self.alice, self.bob])
+        self.assertEqual(waiting_list.titles_of(self.carol), [])
+        self.assertEqual(waiting_list.titles_of(self.alice), ["1984"])
+        self.assertEqual(queue.priority_of(self.alice), 0)
+
+        queue.record_changes()
+        queue.popleft()
+        queue.forget_changes()
+        queue.undo_changes()
+        self.assertEqual(list(queue), [self.bob])
+
+    #tests that a costumer leaving from the middle of the list only marks the entry, which is skipped when served
+    def test_lazy_remove(self):
+        customers = [Customer(f"Customer {number}", f"05012345{number:02d}", "c@example.com") for number in range(100)]
+        queue = WaitingQueue(customers)
+        queue.remove(customers[50])
+        self.assertEqual(len(queue.heap), 100)
+        self.assertEqual(len(queue), 99)
+        self.assertNotIn(customers[50], queue)
+
+        queue.record_changes()
+        queue.remove(customers[0])
+        self.assertEqual(queue.popleft(), customers[1])
+        queue.undo_changes()
+        self.assertEqual(queue.popleft(), customers[0])
+
+        for customer in customers[2:]:
+            queue.remove(customer)
+        self.assertEqual(list(queue), [customers[1]])
+        self.assertLess(len(queue.heap), 70)
+        self.assertEqual(queue.popleft(), customers[1])
+        self.assertEqual((len(queue), len(queue.members)), (0, 0))
+        with self.assertRaises(IndexError):
+            queue.popleft()
+
+    #tests that the next costumer is read from the top of the heap, skipping removed entries, without sorting
+    def test_peek(self):
+        queue = WaitingQueue([self.alice, self.bob])
+        queue.append(self.carol, priority=-1)
+        with mock.patch.object(queue, 'entries', side_effect=AssertionError("the list was sorted")):
+            self.assertEqual(queue.peek(), self.carol)
+            queue.remove(self.carol)
+            self.assertEqual(queue[0], self.alice)
+            queue.remove(self.alice)
+            queue.remove(self.bob)
+            with self.assertRaises(IndexError):
+                queue.peek()
+        self.assertEqual(queue.heap, [])
+
+    #tests that the reverse index follows the queues
+    def test_reverse_index(self):
+        waiting_list = WaitingList({"1984": [self.alice, self.bob]})
+        waiting_list.setdefault("Dune").append(self.alice)
+        self.assertEqual(waiting_list.titles_of(self.alice), ["1984", "Dune"])
+        self.assertEqual(waiting_list.titles_of(self.carol), [])
+
+        waiting_list["1984"].popleft()
+        self.assertEqual(waiting_list.titles_of(self.alice), ["Dune"])
+        waiting_list["Dune"] = [self.carol]
+        self.assertEqual(waiting_list.titles_of(self.alice), [])
+        self.assertEqual(waiting_list.titles_of(self.carol), ["Dune"])
+        waiting_list.pop("Dune")
+        self.assertEqual(waiting_list.titles_of(self.carol), [])
+        self.assertEqual(waiting_list.remove_customer(self.bob), ["1984"])
+        self.assertEqual(waiting_list.customer_titles, {})
+
+    #tests removing a costumer from every list of the librarian, and that the file keeps its format
+    def test_librarian_remove_from_waiting_lists(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), waiting_list_path)
+        librarian = Librarian(books_path, waiting_list_path)
+        librarian.logger.disable_console_logs()
+
+        librarian.waiting_for_book(librarian.books["1984"], self.alice)
+        librarian.waiting_for_book(librarian.books["1984"], self.bob)
+        librarian.waiting_for_book(librarian.books["Moby Dick"], self.alice)
+        with self.assertRaises(ValueError):
+            librarian.waiting_for_book(librarian.books["Moby Dick"], self.alice)
+        self.assertEqual(librarian.waiting_lists_of(self.alice), ["1984", "Moby Dick"])
+
+        self.assertEqual(librarian.remove_from_waiting_lists(self.alice), ["1984", "Moby Dick"])
+        self.assertEqual(librarian.waiting_lists_of(self.alice), [])
+
+        with open(waiting_list_path, encoding='utf-8') as file:
+            self.assertEqual(file.readline().strip(), "Book Title,Customer Name,Customer Phone,Customer Email,Priority")
+            self.assertNotIn("Alice", file.read())
+        restored = Librarian(books_path, waiting_list_path)
+        self.assertEqual([customer.name for customer in restored.waiting_list["1984"]][-1:], ["Bob"])
+        self.assertEqual(restored.waiting_lists_of(self.bob), ["1984"])
+
+
+if __name__ == '__main__':
+    unittest.main()
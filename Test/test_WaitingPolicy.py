@@ -0,0 +1,142 @@
+import unittest
+import os
+import shutil
+import tempfile
+import logging
+from Books.Book import Book
+from Error.HoldLimitExceededException import HoldLimitExceededException
+from Library.Customer import Customer
+from Library.Librarian import Librarian
+from Library.WaitingList import WaitingQueue
+from Library.WaitingPolicy import PriorityWaitingPolicy
+from system.SQLiteStorage import SQLiteStorage
+
+#unit tests for the waiting list priorities and the limit of waiting lists per costumer
+class TestWaitingPolicy(unittest.TestCase):
+    #disables logging for the whole suite
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    #copies the sample files and creates costumers of every tier
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.books_path = os.path.join(self.temp_dir, 'books.csv')
+        self.waiting_list_path = os.path.join(self.temp_dir, 'waiting_list.csv')
+        shutil.copy2(os.path.join(self.base_path, 'files', 'books.csv'), self.books_path)
+        shutil.copy2(os.path.join(self.base_path, 'files', 'waiting_list.csv'), self.waiting_list_path)
+        self.regular = Customer("Regular", "0501234567", "regular@example.com")
+        self.regular_too = Customer("Regular Too", "0521234567", "regular2@example.com")
+        self.premium = Customer("Premium", "0531234567", "premium@example.com", tier='premium')
+        self.accessible = Customer("Accessible", "0541234567", "accessible@example.com", accessibility=True)
+
+    #creates a librarian over the copied files
+    def create_librarian(self, **kwargs):
+        librarian = Librarian(self.books_path, self.waiting_list_path, **kwargs)
+        librarian.logger.disable_console_logs()
+        return librarian
+
+    #joins the waiting list of 1984 with the costumers in a mixed order
+    def join_all(self, librarian):
+        for customer in (self.regular, self.premium, self.regular_too, self.accessible):
+            librarian.waiting_for_book(librarian.books["1984"], customer)
+
+    #tests lower priorities first and the joining order for the same priority
+    def test_queue_order(self):
+        queue = WaitingQueue()
+        for customer, priority in ((self.regular, 3), (self.premium, 2), (self.regular_too, 3), (self.accessible, 0)):
+            queue.append(customer, priority)
+        self.assertEqual([customer.name for customer in queue], ["Accessible", "Premium", "Regular", "Regular Too"])
+        queue.remove(self.premium)
+        self.assertEqual([queue.popleft().name for _ in range(3)], ["Accessible", "Regular", "Regular Too"])
+
+    #tests that the default policy stays first come first served
+    def test_default_policy(self):
+        librarian = self.create_librarian()
+        self.join_all(librarian)
+        self.assertEqual([customer.name for customer in librarian.waiting_list["1984"]][-4:],
+                         ["Regular", "Premium", "Regular Too", "Accessible"])
+
+    #tests that returned copies go to the costumers by priority, and that the priorities are saved
+    def test_priority_policy(self):
+        librarian = self.create_librarian(waiting_policy=PriorityWaitingPolicy())
+        librarian.waiting_list.pop("1984", None)
+        self.join_all(librarian)
+        librarian.returned(librarian.books["1984"])
+        librarian.returned(librarian.books["1984"])
+        self.assertEqual([customer.name for customer in librarian.waiting_list["1984"]], ["Regular", "Regular Too"])
+
+        restored = self.create_librarian()
+        self.assertEqual([(customer.name, priority) for customer, priority in restored.waiting_list["1984"].entries()],
+                         [("Regular", 3), ("Regular Too", 3)])
+
+    #tests that the priorities are kept by the sqlite storage and the binary snapshot
+    def test_priorities_round_trip(self):
+        storage = SQLiteStorage(os.path.join(self.temp_dir, 'library.db'))
+        storage.import_csv(self.books_path, self.waiting_list_path)
+        librarian = Librarian(storage=storage, waiting_policy=PriorityWaitingPolicy())
+        librarian.logger.disable_console_logs()
+        librarian.waiting_list.pop("1984", None)
+        self.join_all(librarian)
+        expected = librarian.waiting_list["1984"].entries()
+        storage.close()
+
+        storage = SQLiteStorage(os.path.join(self.temp_dir, 'library.db'))
+        self.addCleanup(storage.close)
+        restored = Librarian(storage=storage)
+        self.assertEqual([(customer.name, priority) for customer, priority in restored.waiting_list["1984"].entries()],
+                         [(customer.name, priority) for customer, priority in expected])
+
+        snapshot_path = os.path.join(self.temp_dir, 'library.snap')
+        librarian = self.create_librarian(snapshot_path=snapshot_path, waiting_policy=PriorityWaitingPolicy())
+        librarian.waiting_list.pop("1984", None)
+        self.join_all(librarian)
+        librarian.close()
+        restored = self.create_librarian(snapshot_path=snapshot_path)
+        self.assertEqual([customer.name for customer in restored.waiting_list["1984"]],
+                         ["Accessible", "Premium", "Regular", "Regular Too"])
+
+    #tests a costumer joining a waiting list and served inside one batch, with the journal and sqlite storages
+    def test_join_and_serve_in_batch(self):
+        db_path = os.path.join(self.temp_dir, 'library.db')
+        journal_path = os.path.join(self.temp_dir, 'journal.jsonl')
+        storage = SQLiteStorage(db_path)
+        storage.import_csv(self.books_path, self.waiting_list_path)
+        storage.close()
+        factories = (lambda: self.create_librarian(storage=SQLiteStorage(db_path)),
+                     lambda: self.create_librarian(journal_path=journal_path))
+
+        for create in factories:
+            librarian = create()
+            librarian.waiting_policy = PriorityWaitingPolicy()
+            librarian.added(Book("Batch Book", "Author", 1, "Fiction", 2000))
+            book = librarian.books["Batch Book"]
+            librarian.loaned(book, self.regular)
+            with librarian.batch():
+                librarian.waiting_for_book(book, self.premium)
+                librarian.returned(book, self.regular)
+            self.assertEqual(len(librarian.waiting_list["Batch Book"]), 0)
+            self.assertEqual([loan.title for loan in librarian.loans_of(self.premium)], ["Batch Book"])
+            librarian.storage.close()
+
+            restored = create()
+            self.addCleanup(restored.storage.close)
+            self.assertEqual(len(restored.waiting_list.get("Batch Book", ())), 0)
+            self.assertEqual((restored.books["Batch Book"].available_copies, restored.books_borrowed["Batch Book"]),
+                             (0, 1))
+
+    #tests the limit of waiting lists per costumer
+    def test_hold_limit(self):
+        librarian = self.create_librarian(waiting_policy=PriorityWaitingPolicy(max_holds=2))
+        librarian.waiting_for_book(librarian.books["1984"], self.regular)
+        librarian.waiting_for_book(librarian.books["Moby Dick"], self.regular)
+        with self.assertRaises(HoldLimitExceededException):
+            librarian.waiting_for_book(librarian.books["The Hobbit"], self.regular)
+        librarian.remove_from_waiting_lists(self.regular)
+        librarian.waiting_for_book(librarian.books["The Hobbit"], self.regular)
+
+
+if __name__ == '__main__':
+    unittest.main()
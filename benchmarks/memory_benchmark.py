@@ -0,0 +1,73 @@
+import os
+import sys
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Books.Book import Book
+from Books.CatalogStore import CatalogStore
+
+GENRES = ["Fiction", "Dystopian", "Classic", "Adventure", "Romance", "Fantasy"]
+
+
+#the dict-backed book the library used before, kept here as the baseline
+class DictBook:
+    def __init__(self, title, author, copies, genre, year):
+        self.title = title
+        self.author = author
+        self.is_loaned = "No"
+        self.total_copies = copies
+        self.available_copies = copies
+        self.genre = genre
+        self.year = year
+
+
+#builds the field values of a book the way a csv reader would (fresh strings for every row)
+def book_fields(i):
+    return f'Title {i}', ''.join(['Author ', str(i % 5000)]), i % 5 + 1, ''.join([GENRES[i % 6]]), 1900 + i % 120
+
+
+#measures the memory allocated by a function
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+#compares the memory of the book representations
+#usage: python benchmarks/memory_benchmark.py [--books 1000000]
+def main():
+    parser = argparse.ArgumentParser(description="Memory per book of the catalog representations")
+    parser.add_argument('--books', type=int, default=1000000)
+    args = parser.parse_args()
+
+    def build_dict_books():
+        return {fields[0]: DictBook(*fields) for fields in map(book_fields, range(args.books))}
+
+    def build_slotted_books():
+        return {fields[0]: Book(*fields) for fields in map(book_fields, range(args.books))}
+
+    def build_store():
+        store = CatalogStore()
+        for fields in map(book_fields, range(args.books)):
+            store.add(*fields)
+        return store
+
+    print(f"books: {args.books}")
+    baseline = None
+    for name, build in (("dict-backed Book", build_dict_books),
+                        ("__slots__ Book", build_slotted_books),
+                        ("CatalogStore", build_store)):
+        result, size = measure(build)
+        per_book = size / args.books
+        baseline = baseline or per_book
+        print(f"{name:18} {size / 1024 / 1024:8.1f} MB  {per_book:6.1f} bytes/book  "
+              f"({100 * per_book / baseline:.0f}%)")
+        del result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import csv
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from system.Storage import CSVStorage
+
+#compares the startup time of the csv files with the binary snapshot
+#usage: python benchmarks/startup_benchmark.py [--books 200000] [--waiting 20000]
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark: csv files vs binary snapshot")
+    parser.add_argument('--books', type=int, default=200000)
+    parser.add_argument('--waiting', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        books_path = os.path.join(temp_dir, 'books.csv')
+        waiting_list_path = os.path.join(temp_dir, 'waiting_list.csv')
+        snapshot_path = os.path.join(temp_dir, 'library.snapshot')
+        genres = ["Fiction", "Dystopian", "Classic", "Adventure", "Romance", "Fantasy"]
+
+        with open(books_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['title', 'author', 'is_loaned', 'copies', 'genre', 'year'])
+            for i in range(args.books):
+                writer.writerow([f'Title {i}', f'Author {i % 5000}', 'Yes' if i % 10 == 0 else 'No',
+                                 i % 5 + 1, genres[i % len(genres)], 1900 + i % 120])
+
+        with open(waiting_list_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Book Title', 'Customer Name', 'Customer Phone', 'Customer Email'])
+            for i in range(args.waiting):
+                writer.writerow([f'Title {i * 10 % args.books}', f'Customer {i}', f'050{i:07d}',
+                                 f'customer{i}@example.com'])
+
+        storage = CSVStorage(books_path, waiting_list_path, snapshot_path=snapshot_path)
+        storage.load()
+        storage.write_snapshot()
+
+        csv_times = []
+        snapshot_times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            CSVStorage(books_path, waiting_list_path).load()
+            csv_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            CSVStorage(books_path, waiting_list_path, snapshot_path=snapshot_path).load()
+            snapshot_times.append(time.perf_counter() - start)
+
+        print(f"books: {args.books}, waiting list entries: {args.waiting}")
+        print(f"csv files:       {min(csv_times):.3f}s")
+        print(f"binary snapshot: {min(snapshot_times):.3f}s "
+              f"({os.path.getsize(snapshot_path) / 1024 / 1024:.1f} MB)")
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+from search.CatalogIndex import CatalogIndex
+
+
+#the titles of the available books, of the borrowed books and of every genre, kept up to date as books
+#are added, loaned, returned and removed, so listing them reads only the books in the list
+#lists are returned in catalog order
+class AvailabilityIndex(CatalogIndex):
+    #initializes empty sets
+    def __init__(self):
+        self.available = set()  # titles with at least one copy to loan
+        self.borrowed = set()  # titles with at least one borrowed copy
+        self.genres = {}  # genre search key -> titles
+        self.available_by_genre = {}  # genre search key -> number of available titles
+        self.genre_names = {}  # genre search key -> genre as written in the catalog
+        self.book_genres = {}  # title -> genre search key
+        self.order = {}  # title -> position in the catalog
+        self.next_position = 0
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__()
+        for book in books.values():
+            self.book_changed(book, 0)
+
+    def book_changed(self, book, borrowed_copies):
+        title = book.title
+        if title in self.book_genres:
+            self._forget(title)
+        else:
+            self.order[title] = self.next_position
+            self.next_position += 1
+
+        genre = book.genre_key
+        self.book_genres[title] = genre
+        self.genres.setdefault(genre, set()).add(title)
+        self.genre_names.setdefault(genre, book.genre)
+        if book.available_copies > 0:
+            self.available.add(title)
+            self.available_by_genre[genre] = self.available_by_genre.get(genre, 0) + 1
+        if book.total_copies > book.available_copies:
+            self.borrowed.add(title)
+
+    def book_removed(self, title):
+        if title in self.book_genres:
+            self._forget(title)
+            del self.order[title]
+
+    #removes a title from the sets and the counts, its position in the catalog is kept
+    def _forget(self, title):
+        genre = self.book_genres.pop(title)
+        titles = self.genres[genre]
+        titles.discard(title)
+        if title in self.available:
+            self.available.discard(title)
+            self.available_by_genre[genre] -= 1
+        self.borrowed.discard(title)
+        if not titles:
+            del self.genres[genre]
+            del self.genre_names[genre]
+            self.available_by_genre.pop(genre, None)
+
+    #returns titles in catalog order
+    def _in_order(self, titles):
+        return sorted(titles, key=self.order.__getitem__)
+
+    #titles of the books with at least one copy to loan
+    def available_titles(self):
+        return self._in_order(self.available)
+
+    #titles of the books with at least one borrowed copy
+    def borrowed_titles(self):
+        return self._in_order(self.borrowed)
+
+    #titles of the books of a genre, genre is a search key (see normalize_text)
+    def genre_titles(self, genre):
+        return self._in_order(self.genres.get(genre, ()))
+
+    #returns genre -> (number of books, number of available books) for every genre in the catalog
+    def genre_counts(self):
+        return {self.genre_names[genre]: (len(titles), self.available_by_genre.get(genre, 0))
+                for genre, titles in self.genres.items()}
@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+
+#base class for the structures the librarian keeps up to date next to the catalog (search indexes,
+#columnar mirrors, statistics). the librarian calls these methods whenever a book or a waiting list changes
+class CatalogIndex(ABC):
+    #returns the name of the index, reported as the source of the searches it answers
+    @property
+    def name(self):
+        return type(self).__name__
+
+    #builds the index from the whole catalog
+    @abstractmethod
+    def rebuild(self, books: dict, books_borrowed: dict, waiting_list: dict):
+        pass
+
+    #called when a book was added or its copies changed
+    @abstractmethod
+    def book_changed(self, book, borrowed_copies: int):
+        pass
+
+    #called when a book was removed from the catalog
+    @abstractmethod
+    def book_removed(self, title: str):
+        pass
+
+    #called when costumers joined or left the waiting list of a book
+    def waiting_list_changed(self, title: str, waiting_count: int):
+        pass
+
+    #returns the titles of the books whose field contains the query, or None when the index cannot answer it
+    def lookup(self, field: str, query: str):
+        return None
+
+    #returns the titles of the books whose field is between low and high, or None when the index cannot answer it
+    def range(self, field: str, low=None, high=None):
+        return None
+
+    #returns an upper bound of the number of books lookup() finds, or None when the index cannot tell
+    def estimate(self, field: str, query: str):
+        return None
+
+    #returns the number of books range() finds, or None when the index cannot tell
+    def count_range(self, field: str, low=None, high=None):
+        return None
+
+    #returns up to limit (distance, title) pairs of the books closest to the query with up to max_distance
+    #typos per word, or None when the index cannot answer it
+    def closest(self, query: str, fields=None, limit=10, max_distance=None):
+        return None
@@ -0,0 +1,178 @@
+from search.CatalogIndex import CatalogIndex
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the library falls back to scanning the books dict
+    np = None
+
+#a numpy column mirror of the catalog used for vectorized filtering
+#integer columns hold year, copies, borrowed copies and waiting list length, genres and authors are
+#dictionary encoded. rows are only appended, removed books are marked dead and the arrays are compacted
+#once half of the rows are dead, so the row order always follows the order of the books dict
+class ColumnarCatalog(CatalogIndex):
+    INITIAL_CAPACITY = 1024
+
+    #checks if numpy is installed
+    @staticmethod
+    def is_supported():
+        return np is not None
+
+    #initializes empty columns
+    def __init__(self):
+        if np is None:
+            raise ImportError("ColumnarCatalog requires numpy")
+        self._allocate(self.INITIAL_CAPACITY)
+        self.size = 0
+        self.dead = 0
+        self.titles = []
+        self.rows = {}  # title -> row
+        self.genres = []  # code -> genre
+        self.genre_codes = {}
+        self.authors = []  # code -> author
+        self.author_codes = {}
+        self.waiting = {}  # waiting list lengths of titles that are not in the catalog yet
+
+    #creates empty arrays with the given capacity
+    def _allocate(self, capacity):
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.year = np.zeros(capacity, dtype=np.int32)
+        self.total_copies = np.zeros(capacity, dtype=np.int32)
+        self.available_copies = np.zeros(capacity, dtype=np.int32)
+        self.borrowed = np.zeros(capacity, dtype=np.int32)
+        self.waiting_count = np.zeros(capacity, dtype=np.int32)
+        self.genre = np.zeros(capacity, dtype=np.int32)
+        self.author = np.zeros(capacity, dtype=np.int32)
+
+    #doubles the capacity of every column
+    def _grow(self):
+        capacity = len(self.alive) * 2
+        for name in ('alive', 'year', 'total_copies', 'available_copies', 'borrowed', 'waiting_count',
+                     'genre', 'author'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    #returns the code of a dictionary encoded value
+    @staticmethod
+    def _encode(value, values, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self._allocate(max(self.INITIAL_CAPACITY, len(books) * 2))
+        self.size = 0
+        self.dead = 0
+        self.titles = []
+        self.rows = {}
+        self.waiting = {title: len(customers) for title, customers in waiting_list.items()}
+        for book in books.values():
+            self.book_changed(book, books_borrowed.get(book.title, 0))
+
+    def book_changed(self, book, borrowed_copies):
+        row = self.rows.get(book.title)
+        if row is None:
+            if self.size == len(self.alive):
+                self._grow()
+            row = self.size
+            self.size += 1
+            self.rows[book.title] = row
+            self.titles.append(book.title)
+            self.alive[row] = True
+            self.waiting_count[row] = self.waiting.get(book.title, 0)
+
+        self.year[row] = book.year
+        self.total_copies[row] = book.total_copies
+        self.available_copies[row] = book.available_copies
+        self.borrowed[row] = borrowed_copies
+        self.genre[row] = self._encode(book.genre, self.genres, self.genre_codes)
+        self.author[row] = self._encode(book.author, self.authors, self.author_codes)
+
+    def book_removed(self, title):
+        row = self.rows.pop(title, None)
+        if row is None:
+            return
+        self.alive[row] = False
+        self.dead += 1
+        if self.dead * 2 > self.size:
+            self._compact()
+
+    def waiting_list_changed(self, title, waiting_count):
+        self.waiting[title] = waiting_count
+        row = self.rows.get(title)
+        if row is not None:
+            self.waiting_count[row] = waiting_count
+
+    #drops the dead rows
+    def _compact(self):
+        keep = np.flatnonzero(self.alive[:self.size])
+        capacity = max(self.INITIAL_CAPACITY, len(keep) * 2)
+        for name in ('alive', 'year', 'total_copies', 'available_copies', 'borrowed', 'waiting_count',
+                     'genre', 'author'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(keep)] = old[keep]
+            setattr(self, name, new)
+        self.titles = [self.titles[row] for row in keep]
+        self.rows = {title: row for row, title in enumerate(self.titles)}
+        self.size = len(keep)
+        self.dead = 0
+
+    #returns the titles of the rows selected by a boolean mask
+    def titles_where(self, mask):
+        titles = self.titles
+        return [titles[row] for row in np.flatnonzero(mask)]
+
+    #returns a mask of the rows that are in the catalog
+    def live(self):
+        return self.alive[:self.size]
+
+    #titles with at least one available copy
+    def available_titles(self):
+        return self.titles_where(self.live() & (self.available_copies[:self.size] > 0))
+
+    #titles with at least one borrowed copy
+    def borrowed_titles(self):
+        return self.titles_where(self.live() & (self.total_copies[:self.size] > self.available_copies[:self.size]))
+
+    #titles whose genre or author matches a predicate, the predicate runs once per distinct value
+    def titles_with_code(self, column, values, predicate):
+        codes = [code for code, value in enumerate(values) if predicate(value)]
+        if not codes:
+            return []
+        return self.titles_where(self.live() & np.isin(getattr(self, column)[:self.size], codes))
+
+    #titles whose integer column matches a predicate, the predicate runs once per distinct value
+    def titles_with_value(self, column, predicate):
+        data = getattr(self, column)[:self.size]
+        live = self.live()
+        values = np.unique(data[live])
+        matching = [value for value in values.tolist() if predicate(value)]
+        if not matching:
+            return []
+        return self.titles_where(live & np.isin(data, matching))
+
+    #returns the top rows by demand (borrowed copies + waiting list) as
+    #(title, total demand, borrowed copies, waiting list length), highest first
+    def most_demanded(self, limit=10, only_positive=False):
+        demand = (self.borrowed[:self.size] + self.waiting_count[:self.size]).astype(np.int64)
+        live = self.live()
+        if only_positive:
+            live = live & (demand > 0)
+        rows = np.flatnonzero(live)
+        if len(rows) == 0 or limit <= 0:
+            return []
+        if len(rows) > limit:
+            # argpartition finds the limit-th highest score in linear time, every row that ties with it
+            # is kept so that the catalog order decides between equal scores, as a stable sort would
+            scores = demand[rows]
+            kth = scores[np.argpartition(-scores, limit - 1)[limit - 1]]
+            higher = rows[scores > kth]
+            rows = np.concatenate((higher, rows[scores == kth][:limit - len(higher)]))
+        # stable sort on (-demand, row) keeps the catalog order between equal scores
+        rows = rows[np.lexsort((rows, -demand[rows]))][:limit]
+        return [(self.titles[row], int(demand[row]), int(self.borrowed[row]), int(self.waiting_count[row]))
+                for row in rows.tolist()]
@@ -0,0 +1,99 @@
+from bisect import bisect_left, insort
+from itertools import islice
+from search.CatalogIndex import CatalogIndex
+
+
+#the demand score of every book (borrowed copies + waiting list length), kept up to date as books are
+#loaned, returned and waited for. the books are grouped in buckets by score and the scores in use are
+#kept sorted, so the most demanded books are read from the highest buckets without sorting the catalog.
+#every bucket is kept in catalog order, so the first books of a bucket are read without sorting it
+class DemandTracker(CatalogIndex):
+    #initializes empty scores
+    def __init__(self):
+        self.borrowed = {}  # title -> borrowed copies, for the books of the catalog
+        self.waiting = {}  # title -> waiting list length
+        self.scores = {}  # title -> demand score
+        self.buckets = {}  # score above zero -> (position in the catalog, title) of the books with that score, sorted
+        self.sorted_scores = []  # the keys of self.buckets, lowest first
+        self.order = {}  # title -> position in the catalog, in catalog order
+        self.next_position = 0
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__()
+        self.waiting = {title: len(customers) for title, customers in waiting_list.items()}
+        for book in books.values():
+            self.book_changed(book, books_borrowed.get(book.title, 0))
+
+    def book_changed(self, book, borrowed_copies):
+        title = book.title
+        if title not in self.order:
+            self.order[title] = self.next_position
+            self.next_position += 1
+        self.borrowed[title] = borrowed_copies
+        self._update(title)
+
+    def book_removed(self, title):
+        if title not in self.order:
+            return
+        self._set_score(title, 0)
+        del self.scores[title]
+        del self.borrowed[title]
+        del self.order[title]
+
+    def waiting_list_changed(self, title, waiting_count):
+        self.waiting[title] = waiting_count
+        if title in self.order:
+            self._update(title)
+
+    #recomputes the score of a book of the catalog
+    def _update(self, title):
+        self._set_score(title, self.borrowed[title] + self.waiting.get(title, 0))
+
+    #moves a book to the bucket of its new score, books with no demand are kept out of the buckets
+    def _set_score(self, title, score):
+        old_score = self.scores.get(title, 0)
+        self.scores[title] = score
+        if old_score == score:
+            return
+        entry = (self.order[title], title)
+        if old_score:
+            bucket = self.buckets[old_score]
+            del bucket[bisect_left(bucket, entry)]
+            if not bucket:
+                del self.buckets[old_score]
+                self.sorted_scores.remove(old_score)
+        if score:
+            bucket = self.buckets.get(score)
+            if bucket is None:
+                bucket = self.buckets[score] = []
+                insort(self.sorted_scores, score)
+            insort(bucket, entry)
+
+    #returns the demand score of a book
+    def score(self, title):
+        return self.scores.get(title, 0)
+
+    #returns the number of books with a demand score above zero
+    def demanded_count(self):
+        return sum(len(bucket) for bucket in self.buckets.values())
+
+    #yields the titles from the most demanded, books with the same score in catalog order
+    #the books with no demand come last unless only_positive is True
+    #a bucket is copied when it is reached, so the books can be read page by page while scores change
+    def iter_titles(self, only_positive=False):
+        for score in reversed(self.sorted_scores[:]):
+            yield from [title for _, title in self.buckets.get(score, ())]
+        if not only_positive:
+            yield from (title for title in self.order if not self.scores[title])
+
+    #returns up to limit (title, demand score, borrowed copies, waiting list length) tuples, most demanded first
+    #only the first limit books of the highest buckets are read
+    def top(self, limit=10, only_positive=False):
+        titles = []
+        for score in reversed(self.sorted_scores):
+            if len(titles) >= limit:
+                break
+            titles.extend(title for _, title in self.buckets[score][:limit - len(titles)])
+        if not only_positive and len(titles) < limit:
+            titles.extend(islice((title for title in self.order if not self.scores[title]), limit - len(titles)))
+        return [(title, self.scores[title], self.borrowed[title], self.waiting.get(title, 0)) for title in titles]
@@ -0,0 +1,179 @@
+import heapq
+from search.CatalogIndex import CatalogIndex
+from search.TokenIndex import TokenIndex
+from system.TextNormalizer import normalize_text
+
+
+#returns the number of insertions, deletions, substitutions and swaps of neighbouring letters that turn
+#one word into the other, or max_distance + 1 once it is clear the distance is larger than max_distance
+def edit_distance(first, second, max_distance):
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    previous_row = None
+    row = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        before_previous_row, previous_row = previous_row, row
+        row = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if (i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]):
+                row[j] = min(row[j], before_previous_row[j - 2] + 1)
+        if min(row) > max_distance:
+            return max_distance + 1
+    return row[-1]
+
+
+#a typo tolerant index of the words of the titles and authors (symmetric delete spelling correction)
+#every word is stored under the variants of its first letters with up to max_distance letters deleted.
+#the variants of a mistyped word share an entry with the variants of the right word, so the words close
+#to a query are found with a few dictionary lookups and only those are compared letter by letter
+class FuzzyIndex(CatalogIndex):
+    #initializes an empty index over the given book fields
+    #only the first prefix_length letters of a word are used for the variants, which keeps the index small
+    def __init__(self, fields=('title', 'author'), max_distance=2, prefix_length=7):
+        self.fields = tuple(fields)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.postings = {field: {} for field in self.fields}  # field -> word -> titles
+        self.deletes = {}  # variant -> words of any field
+        self.word_counts = {}  # word -> number of (field, title) pairs using it
+        self.texts = {}  # title -> indexed search keys, in the order of self.fields
+        self.order = {}  # title -> position in the catalog
+        self.next_position = 0
+
+    #returns the variants of the start of a word with up to max_distance letters deleted
+    def variants(self, word):
+        word = word[:self.prefix_length]
+        variants = {word}
+        edge = {word}
+        for _ in range(self.max_distance):
+            edge = {variant[:i] + variant[i + 1:] for variant in edge for i in range(len(variant))}
+            variants |= edge
+        return variants
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__(self.fields, self.max_distance, self.prefix_length)
+        for book in books.values():
+            self.book_changed(book, 0)
+
+    def book_changed(self, book, borrowed_copies):
+        texts = tuple(getattr(book, f'{field}_key') for field in self.fields)
+        old_texts = self.texts.get(book.title)
+        if old_texts == texts:
+            return
+        if old_texts is None:
+            self.order[book.title] = self.next_position
+            self.next_position += 1
+        else:
+            self._remove_texts(book.title, old_texts)
+
+        self.texts[book.title] = texts
+        for field, text in zip(self.fields, texts):
+            postings = self.postings[field]
+            for word in set(TokenIndex.tokenize(text)):
+                titles = postings.get(word)
+                if titles is None:
+                    titles = postings[word] = set()
+                titles.add(book.title)
+                self._add_word(word)
+
+    def book_removed(self, title):
+        texts = self.texts.pop(title, None)
+        if texts is None:
+            return
+        self._remove_texts(title, texts)
+        del self.order[title]
+
+    #removes a title from the postings of its words
+    def _remove_texts(self, title, texts):
+        for field, text in zip(self.fields, texts):
+            postings = self.postings[field]
+            for word in set(TokenIndex.tokenize(text)):
+                titles = postings[word]
+                titles.discard(title)
+                if not titles:
+                    del postings[word]
+                self._remove_word(word)
+
+    #counts a use of a word, a new word is added under all its variants
+    def _add_word(self, word):
+        count = self.word_counts.get(word, 0)
+        self.word_counts[word] = count + 1
+        if count:
+            return
+        for variant in self.variants(word):
+            words = self.deletes.get(variant)
+            if words is None:
+                words = self.deletes[variant] = set()
+            words.add(word)
+
+    #removes a use of a word, a word that is no longer used is removed from its variants
+    def _remove_word(self, word):
+        count = self.word_counts[word] - 1
+        if count:
+            self.word_counts[word] = count
+            return
+        del self.word_counts[word]
+        for variant in self.variants(word):
+            words = self.deletes[variant]
+            words.discard(word)
+            if not words:
+                del self.deletes[variant]
+
+    #returns the indexed words within max_distance (the one of the index by default) of a word as word -> distance
+    def close_words(self, word, max_distance=None):
+        max_distance = self.max_distance if max_distance is None else max_distance
+        candidates = set()
+        for variant in self.variants(word):
+            candidates.update(self.deletes.get(variant, ()))
+        close = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                close[candidate] = distance
+        return close
+
+    #returns the titles of the books whose field has a word close to every word of the query,
+    #as title -> sum of the distances of the closest words
+    def _field_distances(self, field, words, close_words):
+        postings = self.postings[field]
+        distances = None
+        # the word with the fewest close words usually matches the fewest books
+        for word in sorted(words, key=lambda word: len(close_words[word])):
+            word_distances = {}
+            for candidate, distance in close_words[word].items():
+                for title in postings.get(candidate, ()):
+                    if distance < word_distances.get(title, self.max_distance + 1):
+                        word_distances[title] = distance
+            if distances is None:
+                distances = word_distances
+            else:
+                distances = {title: distance + word_distances[title]
+                             for title, distance in distances.items() if title in word_distances}
+            if not distances:
+                break
+        return distances or {}
+
+    #returns up to limit (distance, title) pairs for the books closest to the query, closest first and
+    #then in catalog order. the distance of a book is the sum of the distances between the words of the
+    #query and the closest words of the best matching field, each at most max_distance (the one of the index
+    #by default)
+    #returns None when none of the fields is indexed, the query has no words or max_distance is larger than
+    #the one the index was built for
+    def closest(self, query, fields=None, limit=10, max_distance=None):
+        fields = [field for field in (fields or self.fields) if field in self.postings]
+        words = list(dict.fromkeys(TokenIndex.tokenize(normalize_text(query))))
+        if not fields or not words or (max_distance is not None and max_distance > self.max_distance):
+            return None
+
+        close_words = {word: self.close_words(word, max_distance) for word in words}
+        best = {}
+        for field in fields:
+            for title, distance in self._field_distances(field, words, close_words).items():
+                if distance < best.get(title, len(words) * self.max_distance + 1):
+                    best[title] = distance
+
+        order = self.order
+        closest = heapq.nsmallest(limit, best.items(), key=lambda item: (item[1], order[item[0]]))
+        return [(distance, title) for title, distance in closest]
@@ -0,0 +1,74 @@
+import threading
+from search.CatalogIndex import CatalogIndex
+
+
+#an index that is only built the first time it is queried, so a large catalog starts without paying for
+#search structures it may never use. until then the changes of the catalog are ignored, the index is built
+#from the whole catalog when it is first needed and then kept up to date like any other index.
+#rebuild() drops the built index, so a bulk change of the catalog is indexed once on the next query
+class LazyIndex(CatalogIndex):
+    #initializes the wrapper, factory creates the empty index (e.g. the TokenIndex class)
+    #lock is held while the index is built, so the catalog does not change under it
+    def __init__(self, factory, lock=None):
+        self.factory = factory
+        self.lock = lock if lock is not None else threading.RLock()
+        self.index = None
+        self.catalog = ({}, {}, {})  # (books, books_borrowed, waiting_list) the index is built from
+
+    #returns the name of the wrapped index
+    @property
+    def name(self):
+        return getattr(self.factory, '__name__', type(self).__name__)
+
+    #checks if the index was built
+    def is_built(self):
+        return self.index is not None
+
+    #returns the wrapped index, building it from the catalog the first time
+    def built(self):
+        if self.index is None:
+            with self.lock:
+                if self.index is None:
+                    index = self.factory()
+                    index.rebuild(*self.catalog)
+                    self.index = index
+        return self.index
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        with self.lock:
+            self.catalog = (books, books_borrowed, waiting_list)
+            self.index = None
+
+    def book_changed(self, book, borrowed_copies):
+        if self.index is not None:
+            self.index.book_changed(book, borrowed_copies)
+
+    def book_removed(self, title):
+        if self.index is not None:
+            self.index.book_removed(title)
+
+    def waiting_list_changed(self, title, waiting_count):
+        if self.index is not None:
+            self.index.waiting_list_changed(title, waiting_count)
+
+    def lookup(self, field, query):
+        return self.built().lookup(field, query)
+
+    def range(self, field, low=None, high=None):
+        return self.built().range(field, low, high)
+
+    def estimate(self, field, query):
+        return self.built().estimate(field, query)
+
+    def count_range(self, field, low=None, high=None):
+        return self.built().count_range(field, low, high)
+
+    def closest(self, query, fields=None, limit=10, max_distance=None):
+        return self.built().closest(query, fields, limit, max_distance)
+
+    #the other methods and attributes (e.g. complete of PrefixIndex, top of RelevanceRanker) are the ones
+    #of the wrapped index
+    def __getattr__(self, name):
+        if name in ('factory', 'lock', 'index', 'catalog'):
+            raise AttributeError(name)
+        return getattr(self.built(), name)
@@ -0,0 +1,83 @@
+import heapq
+from itertools import islice
+
+
+#results of a search or a display that are only produced when they are read
+#source is a function returning a new iterator over the books (usually a generator), the books are
+#pulled from it as pages are requested and kept, so every book is produced at most once.
+#when key is given the results are ordered by it, and a page is taken with a top-k selection instead of
+#sorting every book. total is the number of books when it is known without producing them
+class LazyResults:
+    def __init__(self, source, key=None, total=None):
+        self._source = source
+        self._key = key
+        self._total = total
+        self._iterator = None
+        self._produced = []  # books already pulled from the iterator, in order
+        self._exhausted = False
+
+    #creates results from a list that is already built
+    @classmethod
+    def from_list(cls, books):
+        results = cls(lambda: iter(books), total=len(books))
+        results._produced = books
+        results._exhausted = True
+        return results
+
+    #pulls books from the source until count books were produced or it runs out
+    def _produce(self, count):
+        if self._exhausted or len(self._produced) >= count:
+            return
+        if self._iterator is None:
+            self._iterator = iter(self._source())
+        self._produced.extend(islice(self._iterator, count - len(self._produced)))
+        if len(self._produced) < count:
+            self._exhausted = True
+            self._iterator = None
+            self._total = len(self._produced)
+
+    #returns limit books starting at offset
+    def page(self, offset, limit):
+        if offset < 0 or limit < 0:
+            raise ValueError("offset and limit must not be negative")
+        if self._key is not None and not self._exhausted and len(self._produced) < offset + limit:
+            # only the books up to the end of the page are kept ordered
+            self._produced = heapq.nsmallest(offset + limit, self._source(), key=self._key)
+            if len(self._produced) < offset + limit:
+                self._exhausted = True
+                self._total = len(self._produced)
+        elif self._key is None:
+            self._produce(offset + limit)
+        return self._produced[offset:offset + limit]
+
+    #returns the number of books, counting them with one pass over the source when it is not known
+    @property
+    def total(self):
+        if self._total is None:
+            self._total = sum(1 for _ in self._source())
+        return self._total
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        return bool(self.page(0, 1))
+
+    #iterates over the books, the books are produced one at a time as the iteration goes
+    def __iter__(self):
+        if self._exhausted:
+            return iter(self._produced)
+        if self._key is not None:
+            return iter(sorted(self._source(), key=self._key))
+        return self._iterate()
+
+    #yields the books already produced, then keeps pulling new ones
+    def _iterate(self):
+        position = 0
+        while True:
+            if position == len(self._produced):
+                self._produce(position + 1)
+                if position == len(self._produced):
+                    return
+            yield self._produced[position]
+            position += 1
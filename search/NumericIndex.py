@@ -0,0 +1,80 @@
+from bisect import bisect_left, bisect_right, insort
+from search.CatalogIndex import CatalogIndex
+
+
+#sorted indexes of the integer fields of the books (year, total and available copies)
+#every field keeps a sorted list of (value, position in the catalog, title), so the books in a range of
+#values are found with two binary searches and are returned ordered by value, then by catalog order
+class NumericIndex(CatalogIndex):
+    #initializes empty indexes for the given book fields
+    def __init__(self, fields=('year', 'total_copies', 'available_copies')):
+        self.fields = tuple(fields)
+        self.entries = {field: [] for field in self.fields}  # field -> sorted (value, position, title)
+        self.values = {}  # title -> indexed values, in the order of self.fields
+        self.order = {}  # title -> position in the catalog
+        self.next_position = 0
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__(self.fields)
+        for book in books.values():
+            values = tuple(getattr(book, field) for field in self.fields)
+            self.values[book.title] = values
+            self.order[book.title] = self.next_position
+            for field, value in zip(self.fields, values):
+                self.entries[field].append((value, self.next_position, book.title))
+            self.next_position += 1
+        for entries in self.entries.values():
+            entries.sort()
+
+    def book_changed(self, book, borrowed_copies):
+        values = tuple(getattr(book, field) for field in self.fields)
+        old_values = self.values.get(book.title)
+        if old_values == values:
+            return
+        position = self.order.get(book.title)
+        if position is None:
+            position = self.order[book.title] = self.next_position
+            self.next_position += 1
+            old_values = (None,) * len(self.fields)
+
+        self.values[book.title] = values
+        for field, old_value, value in zip(self.fields, old_values, values):
+            if old_value == value:
+                continue
+            entries = self.entries[field]
+            if old_value is not None:
+                del entries[bisect_left(entries, (old_value, position, book.title))]
+            insort(entries, (value, position, book.title))
+
+    def book_removed(self, title):
+        values = self.values.pop(title, None)
+        if values is None:
+            return
+        position = self.order.pop(title)
+        for field, value in zip(self.fields, values):
+            entries = self.entries[field]
+            del entries[bisect_left(entries, (value, position, title))]
+
+    #returns the positions in the sorted list of a field of the first entry in the range and of the entry after it
+    @staticmethod
+    def _bounds(entries, low, high):
+        start = 0 if low is None else bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect_right(entries, (high, float('inf')))
+        return start, max(start, end)
+
+    #returns the titles of the books whose field is between low and high (both included, None for no bound)
+    #returns None when the field is not indexed
+    def range(self, field, low=None, high=None):
+        entries = self.entries.get(field)
+        if entries is None:
+            return None
+        start, end = self._bounds(entries, low, high)
+        return [title for _, _, title in entries[start:end]]
+
+    #returns the number of books whose field is between low and high without building the list
+    def count_range(self, field, low=None, high=None):
+        entries = self.entries.get(field)
+        if entries is None:
+            return None
+        start, end = self._bounds(entries, low, high)
+        return end - start
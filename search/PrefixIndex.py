@@ -0,0 +1,38 @@
+from bisect import bisect_left, insort
+from search.CatalogIndex import CatalogIndex
+from system.TextNormalizer import normalize_text
+
+
+#a sorted array of the normalized titles used for autocomplete
+#the titles starting with a prefix are next to each other in the array, so the first completions are
+#found with one binary search and reading the next few entries
+class PrefixIndex(CatalogIndex):
+    #initializes an empty index
+    def __init__(self):
+        self.entries = []  # sorted (title search key, title)
+        self.keys = {}  # title -> title search key
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.keys = {book.title: book.title_key for book in books.values()}
+        self.entries = sorted((key, title) for title, key in self.keys.items())
+
+    def book_changed(self, book, borrowed_copies):
+        if book.title not in self.keys:
+            key = self.keys[book.title] = book.title_key
+            insort(self.entries, (key, book.title))
+
+    def book_removed(self, title):
+        key = self.keys.pop(title, None)
+        if key is not None:
+            del self.entries[bisect_left(self.entries, (key, title))]
+
+    #returns up to limit titles starting with the prefix, in alphabetical order
+    def complete(self, prefix, limit=10):
+        prefix = normalize_text(prefix)
+        entries = self.entries
+        completions = []
+        position = bisect_left(entries, (prefix,))
+        while position < len(entries) and len(completions) < limit and entries[position][0].startswith(prefix):
+            completions.append(entries[position][1])
+            position += 1
+        return completions
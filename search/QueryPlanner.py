@@ -0,0 +1,125 @@
+import re
+import time
+from Error.InvalidSearchQueryException import InvalidSearchQueryException
+from search.SearchStrategy import TitleSearchStrategy, AuthorSearchStrategy, GenreSearchStrategy, \
+    YearRangeSearchStrategy, CopiesRangeSearchStrategy, AvailableCopiesSearchStrategy
+
+TERM_PATTERN = re.compile(r'\s*(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+
+
+#one condition of a compound query, run with one of the search strategies
+class Predicate:
+    def __init__(self, field: str, strategy, query: str):
+        self.field = field
+        self.strategy = strategy
+        self.query = query
+        self.estimate = None
+
+    def __str__(self):
+        return f"{self.field}:{self.query}"
+
+
+#the order in which the predicates of a compound query are run, and what each step did
+class QueryPlan:
+    def __init__(self, search, predicates):
+        self.search = search
+        self.predicates = predicates
+        self.steps = []  # (predicate, method, estimate, number of books after the step, milliseconds)
+
+    #runs the predicates from the most selective one, the first one finds the candidates and the others
+    #either intersect their own results with them or, when there are fewer candidates than they would
+    #find, check the candidates directly
+    #the books are returned in the order the first step found them
+    def execute(self):
+        self.steps = []
+        candidates = None
+        for predicate in self.predicates:
+            start = time.perf_counter()
+            if candidates is None:
+                candidates, method = self.search.find(predicate.strategy, predicate.query)
+            elif not candidates:
+                method = "skipped"
+            elif predicate.estimate is None or len(candidates) <= predicate.estimate:
+                subset = {book.title: book for book in candidates}
+                found = {book.title for book in predicate.strategy.search(predicate.query, subset)}
+                candidates = [book for book in candidates if book.title in found]
+                method = "filter"
+            else:
+                results, method = self.search.find(predicate.strategy, predicate.query)
+                found = {book.title for book in results}
+                candidates = [book for book in candidates if book.title in found]
+                method = f"{method} + intersect"
+            elapsed = (time.perf_counter() - start) * 1000
+            self.steps.append((predicate, method, predicate.estimate, len(candidates), elapsed))
+        return candidates if candidates is not None else []
+
+    #returns a description of the plan, with the timings of the last execution
+    def explain(self):
+        lines = []
+        if not self.steps:
+            for number, predicate in enumerate(self.predicates, 1):
+                estimate = "?" if predicate.estimate is None else predicate.estimate
+                lines.append(f"{number}. {predicate}  estimate={estimate}")
+            return "\n".join(lines)
+
+        total = 0
+        for number, (predicate, method, estimate, rows, elapsed) in enumerate(self.steps, 1):
+            total += elapsed
+            estimate = "?" if estimate is None else estimate
+            lines.append(f"{number}. {predicate}  estimate={estimate}  via {method}  rows={rows}  {elapsed:.3f} ms")
+        lines.append(f"total {total:.3f} ms")
+        return "\n".join(lines)
+
+
+#parses compound queries and orders their predicates by selectivity
+#a query is a list of field:value terms, values with spaces are quoted and a term without a field
+#searches the title, for example: author:orwell genre:dystopian year:1940..1950 available:yes
+#year, copies and available take the ranges of RangeSearchStrategy, available also takes yes / no
+class QueryPlanner:
+    STRATEGIES = {
+        'title': TitleSearchStrategy,
+        'author': AuthorSearchStrategy,
+        'genre': GenreSearchStrategy,
+        'year': YearRangeSearchStrategy,
+        'copies': CopiesRangeSearchStrategy,
+        'available': AvailableCopiesSearchStrategy
+    }
+    AVAILABLE_VALUES = {'yes': ">0", 'no': "0"}
+
+    #initializes the planner for a search over the books
+    def __init__(self, search):
+        self.search = search
+
+    #splits a query into predicates
+    def parse(self, query: str):
+        predicates = []
+        position = 0
+        query = query.rstrip()
+        while position < len(query):
+            match = TERM_PATTERN.match(query, position)
+            if not match or match.end() == position:
+                raise InvalidSearchQueryException(f"Invalid query near: '{query[position:]}'")
+            position = match.end()
+
+            field = (match.group(1) or 'title').lower()
+            value = match.group(2) if match.group(2) is not None else match.group(3)
+            if field not in self.STRATEGIES:
+                raise InvalidSearchQueryException(f"Unknown search field: '{field}'")
+            if not value:
+                raise InvalidSearchQueryException(f"Missing value for search field: '{field}'")
+            if field == 'available':
+                value = self.AVAILABLE_VALUES.get(value.lower(), value)
+            predicates.append(Predicate(field, self.STRATEGIES[field](), value))
+
+        if not predicates:
+            raise InvalidSearchQueryException("Empty query.")
+        return predicates
+
+    #parses a query and orders its predicates by the number of books they are estimated to find,
+    #predicates no index can estimate are run last since they need a scan
+    def plan(self, query: str):
+        predicates = self.parse(query)
+        for predicate in predicates:
+            predicate.estimate = self.search.estimate(predicate.strategy, predicate.query)
+        predicates.sort(key=lambda predicate: (predicate.estimate is None, predicate.estimate or 0))
+        return QueryPlan(self.search, predicates)
@@ -0,0 +1,119 @@
+import heapq
+import math
+from collections import Counter
+from search.CatalogIndex import CatalogIndex
+from search.TokenIndex import TokenIndex
+from system.TextNormalizer import normalize_text
+
+
+#orders search results by relevance (BM25 over the words of the titles and authors)
+#the word counts, document frequencies and lengths it needs, and the demand of every book (borrowed copies
+#and waiting list length), are kept up to date with the catalog, so ranking only reads the matched books
+class RelevanceRanker(CatalogIndex):
+    K1 = 1.2
+    B = 0.75
+    FIELD_WEIGHTS = {'title': 1.0, 'author': 0.6}
+    PREFIX_WEIGHT = 0.5  # a word of the book starting with a word of the query counts as half a match
+    EXACT_BOOST = 5.0  # the query is the whole title or author
+    PREFIX_BOOST = 2.0  # the title or author starts with the query
+    DEMAND_BOOST = 0.5  # multiplied by log(1 + borrowed copies + waiting list length)
+
+    #initializes empty statistics
+    def __init__(self):
+        self.fields = tuple(self.FIELD_WEIGHTS)
+        self.documents = {}  # title -> (search keys, word counts of every field)
+        self.document_frequency = {field: Counter() for field in self.fields}  # field -> word -> books
+        self.total_length = dict.fromkeys(self.fields, 0)  # field -> words in all the books
+        self.borrowed = {}  # title -> borrowed copies
+        self.waiting = {}  # title -> waiting list length
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__()
+        self.waiting = {title: len(customers) for title, customers in waiting_list.items()}
+        for book in books.values():
+            self.book_changed(book, books_borrowed.get(book.title, 0))
+
+    def book_changed(self, book, borrowed_copies):
+        self.borrowed[book.title] = borrowed_copies
+        texts = tuple(getattr(book, f'{field}_key') for field in self.fields)
+        document = self.documents.get(book.title)
+        if document is not None and document[0] == texts:
+            return
+        if document is not None:
+            self._remove_document(document)
+
+        counts = tuple(Counter(TokenIndex.tokenize(text)) for text in texts)
+        self.documents[book.title] = (texts, counts)
+        for field, field_counts in zip(self.fields, counts):
+            self.document_frequency[field].update(field_counts.keys())
+            self.total_length[field] += sum(field_counts.values())
+
+    def book_removed(self, title):
+        document = self.documents.pop(title, None)
+        if document is not None:
+            self._remove_document(document)
+        self.borrowed.pop(title, None)
+
+    def waiting_list_changed(self, title, waiting_count):
+        self.waiting[title] = waiting_count
+
+    #removes the words of a book from the statistics
+    def _remove_document(self, document):
+        for field, field_counts in zip(self.fields, document[1]):
+            frequencies = self.document_frequency[field]
+            for word in field_counts:
+                frequencies[word] -= 1
+                if not frequencies[word]:
+                    del frequencies[word]
+            self.total_length[field] -= sum(field_counts.values())
+
+    #returns the BM25 score of a field of a book for the words of a query
+    def _field_score(self, field, field_counts, words):
+        document_count = len(self.documents)
+        frequencies = self.document_frequency[field]
+        length = sum(field_counts.values())
+        average_length = self.total_length[field] / document_count if document_count else 0
+        normalization = self.K1 * (1 - self.B + self.B * length / average_length) if average_length else self.K1
+
+        score = 0.0
+        for word in words:
+            frequency = field_counts.get(word, 0)
+            if not frequency:
+                frequency = self.PREFIX_WEIGHT * sum(count for book_word, count in field_counts.items()
+                                                     if book_word.startswith(word))
+                if not frequency:
+                    continue
+            # a word that is only a prefix in the catalog is treated as rare
+            containing = frequencies.get(word, 0) or 1
+            idf = math.log((document_count - containing + 0.5) / (containing + 0.5) + 1)
+            score += idf * frequency * (self.K1 + 1) / (frequency + normalization)
+        return score
+
+    #returns the relevance of a book for a query
+    def score(self, title, query):
+        query = normalize_text(query).strip()
+        return self._score(title, query, TokenIndex.tokenize(query))
+
+    #returns the relevance of a book for a normalized query and its words
+    def _score(self, title, query, words):
+        document = self.documents.get(title)
+        if document is None:
+            return 0.0
+        texts, counts = document
+
+        score = 0.0
+        for field, text, field_counts in zip(self.fields, texts, counts):
+            score += self.FIELD_WEIGHTS[field] * self._field_score(field, field_counts, words)
+            if query and text == query:
+                score += self.EXACT_BOOST
+            elif query and text.startswith(query):
+                score += self.PREFIX_BOOST
+        demand = self.borrowed.get(title, 0) + self.waiting.get(title, 0)
+        return score + self.DEMAND_BOOST * math.log1p(demand)
+
+    #returns the k most relevant books, most relevant first and in their given order when they score
+    #the same, using a heap of k books
+    def top(self, books, query, k=10):
+        query = normalize_text(query).strip()
+        words = TokenIndex.tokenize(query)
+        return heapq.nlargest(k, books, key=lambda book: self._score(book.title, query, words))
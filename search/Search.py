@@ -1,19 +1,54 @@
 from functools import wraps
-from Books.BookIterator import AllBooksIterator, AvailableBooksIterator, BorrowedBooksIterator
+from Books.BookIterator import BookStream, AllBooksIterator, AvailableBooksIterator, BorrowedBooksIterator
 from Error.BookDoesNotExistException import BookDoesNotExistException
 from Library.Librarian import log_operation
 from system.Logger import Logger
+from system.TextNormalizer import normalize_text
+from search.QueryPlanner import QueryPlanner
+from search.LazyResults import LazyResults
 #provides search functionality for books in the library
 class Search:
     #initializes search class
-    def __init__(self, books: dict, waiting_list=None, books_borrowed=None):
+    #indexes are optional indexes of the books (TokenIndex, TrigramIndex, NumericIndex, FuzzyIndex), tried in order
+    #columns is an optional ColumnarCatalog mirror of the books used for vectorized filtering
+    #cache is an optional SearchCache kept up to date with the books
+    #ranker is an optional RelevanceRanker used by ranked searches
+    #availability is an optional AvailabilityIndex used by the displays of available, borrowed and genre books
+    #demand is an optional DemandTracker used by the displays of popular books
+    def __init__(self, books: dict, waiting_list=None, books_borrowed=None, columns=None, indexes=None, cache=None,
+                 ranker=None, availability=None, demand=None):
         self.books = books
         self.waiting_list = waiting_list if waiting_list is not None else {}
         self.books_borrowed = books_borrowed if books_borrowed is not None else {}
+        self.columns = columns
+        self.indexes = list(indexes) if indexes is not None else []
+        self.cache = cache
+        self.ranker = ranker
+        self.availability = availability
+        self.demand = demand
         self.strategy = None
         self.logger = Logger()
         self.logger.disable_console_logs()
 
+    #creates a search over the catalog of a librarian, using the structures it keeps up to date
+    @classmethod
+    def from_librarian(cls, librarian):
+        return cls(
+            books=librarian.books,
+            waiting_list=librarian.waiting_list,
+            books_borrowed=librarian.books_borrowed,
+            columns=librarian.columns,
+            indexes=[librarian.tokens, librarian.trigrams, librarian.numbers, librarian.fuzzy],
+            cache=librarian.search_cache,
+            ranker=librarian.ranker,
+            availability=librarian.availability,
+            demand=librarian.demand
+        )
+
+    #returns a lazy stream over the books of the library, for pipelines of filter, map, take and sort_by
+    def stream(self):
+        return BookStream(self.books)
+
     #returns an iterator for all books in the library
     def __iter__(self):
         return AllBooksIterator(self.books, self.logger)
@@ -30,12 +65,71 @@ class Search:
     def set_strategy(self, strategy):
         self.strategy = strategy
 
+    #returns the cached results of a strategy or runs it on the first index that can answer the query,
+    #then on the columns, then by scanning (unless scan is False)
+    #returns the books and the name of what answered the query, or (None, None) when nothing did
+    def find(self, strategy, query: str, scan=True):
+        if self.cache is not None:
+            results = self.cache.get(strategy, query)
+            if results is not None:
+                return results, "cache"
+        results, source = self._find_indexed(strategy, query)
+        if results is None:
+            if not scan:
+                return None, None
+            results, source = strategy.search(query, self.books), "scan"
+        if self.cache is not None:
+            self.cache.put(strategy, query, results)
+        return results, source
+
+    #runs a strategy on the indexes and the columns, returns (None, None) when none can answer the query
+    def _find_indexed(self, strategy, query: str):
+        for index in self.indexes:
+            results = strategy.search_index(query, self.books, index)
+            if results is not None:
+                return results, index.name
+        if self.columns is not None:
+            results = strategy.search_columns(query, self.books, self.columns)
+            if results is not None:
+                return results, type(self.columns).__name__
+        return None, None
+
+    #estimates the number of books a strategy finds, using the first index that can tell
+    #returns None when no index can estimate the query
+    def estimate(self, strategy, query: str):
+        for index in self.indexes:
+            estimate = strategy.estimate_index(query, index)
+            if estimate is not None:
+                return estimate
+        return None
+
+    #creates the plan of a compound query such as "author:orwell genre:dystopian year:1940..1950"
+    def plan(self, query: str):
+        return QueryPlanner(self).plan(query)
+
+    #runs a compound query, see QueryPlanner for the syntax
+    def compound_search(self, query: str):
+        try:
+            results = self.plan(query).execute()
+            if not results:
+                raise BookDoesNotExistException(f"No books found matching the query: '{query}'")
+            self.logger.log_info(f'Compound search "{query}" completed successfully')
+            return results
+        except Exception as e:
+            self.logger.log_error(f'Compound search "{query}" completed fail')
+            raise e
+
     # preforms a search using set strategy
-    def search(self, query: str):
+    #with ranked=True only the limit most relevant books are returned, most relevant first (needs a ranker)
+    def search(self, query: str, ranked=False, limit=10):
         if not self.strategy:
             raise ValueError("No search strategy set.")
+        if ranked and self.ranker is None:
+            raise ValueError("Ranked search needs a relevance ranker.")
         try:
-            results = self.strategy.search(query, self.books)
+            results, _ = self.find(self.strategy, query)
+            if ranked:
+                results = self.ranker.top(results, query, limit)
             if not results:
                 # self.logger.log_error(f'Search book "{query}" by {self.strategy.get_search_type()} completed fail')
                 raise BookDoesNotExistException(f"No books found matching the query: '{query}'")
@@ -45,57 +139,102 @@ class Search:
             self.logger.log_error(f'Search book "{query}" by {self.strategy.get_search_type()} completed fail')
             raise e
 
+    #preforms a search using set strategy and returns LazyResults, books that need a scan are only
+    #produced when their page is read. unlike search() no results is not an error
+    def search_paged(self, query: str):
+        if not self.strategy:
+            raise ValueError("No search strategy set.")
+        strategy = self.strategy
+        results, _ = self.find(strategy, query, scan=False)
+        self.logger.log_info(f'Search book "{query}" by {strategy.get_search_type()} completed successfully')
+        if results is not None:
+            return LazyResults.from_list(results)
+        return LazyResults(lambda: strategy.iter_search(query, self.books), key=strategy.sort_key())
+
     #displays all books in the library
     @log_operation("Display all books")
     def display_all_books(self):
-        books = []
-        iterator = self.__iter__()
-        while iterator.has_next():
-            books.append(iterator.next())
-        return books
+        return self.__iter__().to_list()
 
     #displays all available books in the library
     @log_operation("Display available books")
     def display_available_books(self):
-        books = []
-        iterator = self.get_available_iterator()
-        while iterator.has_next():
-            books.append(iterator.next())
-        return books
+        if self.availability is not None:
+            return [self.books[title] for title in self.availability.available_titles()]
+        if self.columns is not None:
+            return [self.books[title] for title in self.columns.available_titles()]
+        return self.get_available_iterator().to_list()
 
     #displays all borrowed books in the library
     @log_operation("Display borrowed books")
     def display_borrowed_books(self):
-        books = []
-        iterator = self.get_borrowed_iterator()
-        while iterator.has_next():
-            books.append(iterator.next())
-        return books
+        if self.availability is not None:
+            return [self.books[title] for title in self.availability.borrowed_titles()]
+        if self.columns is not None:
+            return [self.books[title] for title in self.columns.borrowed_titles()]
+        return self.get_borrowed_iterator().to_list()
 
     #displays books filtered by genre
     @log_operation("Display books by category")
     def display_books_by_genre(self, genre: str):
-        books = []
-        for book in self.books.values():
-            if book.genre.lower() == genre.lower():
-                books.append(book)
-        return books
+        if self.availability is not None:
+            return [self.books[title] for title in self.availability.genre_titles(normalize_text(genre))]
+        if self.columns is not None:
+            genre = normalize_text(genre)
+            return [self.books[title] for title in
+                    self.columns.titles_with_code('genre', self.columns.genres,
+                                                  lambda value: normalize_text(value) == genre)]
+        genre = normalize_text(genre)
+        return self.stream().filter(lambda book: book.genre_key == genre).to_list()
 
     #displays the most popular books based on borrow count and waiting list
     @log_operation("Display popular books")
     def display_popular_books(self):
-        popular_books = []
+        if self.demand is not None:
+            return [self.books[title] for title, *_ in self.demand.top(10, only_positive=True)]
+        if self.columns is not None:
+            return [self.books[title] for title, *_ in self.columns.most_demanded(10, only_positive=True)]
+        #the 10 books with the highest popularity score (a.k.a. demand score) above zero
+        return self.stream().filter(lambda book: self.popularity(book) > 0) \
+            .sort_by(self.popularity, reverse=True, limit=10).to_list()
 
-        for book in self.books.values():
-            borrowed_copies = self.books_borrowed.get(book.title, 0)
-            waiting_list_count = len(self.waiting_list.get(book.title, []))
-            popularity_score = borrowed_copies + waiting_list_count
+    #returns the popularity score of a book, its borrowed copies plus the length of its waiting list
+    def popularity(self, book):
+        return self.books_borrowed.get(book.title, 0) + len(self.waiting_list.get(book.title, []))
 
-            if popularity_score > 0:
-                popular_books.append((book, popularity_score))
+    #all books as LazyResults
+    @log_operation("Display all books")
+    def display_all_books_paged(self):
+        return LazyResults(self.__iter__, total=len(self.books))
 
-        #sort by popularity score (a.k.a. demand score)
-        popular_books.sort(key=lambda x: x[1], reverse=True)
+    #available books as LazyResults
+    @log_operation("Display available books")
+    def display_available_books_paged(self):
+        if self.availability is not None or self.columns is not None:
+            return LazyResults.from_list(self.display_available_books())
+        return LazyResults(self.get_available_iterator)
 
-        # returns top of list without the pupolarity score
-        return [book for book, _ in popular_books[:10]]
\ No newline at end of file
+    #borrowed books as LazyResults
+    @log_operation("Display borrowed books")
+    def display_borrowed_books_paged(self):
+        if self.availability is not None or self.columns is not None:
+            return LazyResults.from_list(self.display_borrowed_books())
+        return LazyResults(self.get_borrowed_iterator)
+
+    #books of a genre as LazyResults
+    @log_operation("Display books by category")
+    def display_books_by_genre_paged(self, genre: str):
+        if self.availability is not None or self.columns is not None:
+            return LazyResults.from_list(self.display_books_by_genre(genre))
+        genre = normalize_text(genre)
+        return LazyResults(lambda: self.stream().filter(lambda book: book.genre_key == genre))
+
+    #every book with a popularity score above zero as LazyResults, most popular first
+    #display_popular_books() is the first page of 10
+    @log_operation("Display popular books")
+    def display_popular_books_paged(self):
+        if self.demand is not None:
+            return LazyResults(lambda: (self.books[title] for title in self.demand.iter_titles(only_positive=True)),
+                               total=self.demand.demanded_count())
+        return LazyResults(lambda: self.stream().filter(lambda book: self.popularity(book) > 0),
+                           key=lambda book: -self.popularity(book))
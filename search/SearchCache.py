@@ -0,0 +1,97 @@
+from collections import OrderedDict
+from search.CatalogIndex import CatalogIndex
+from system.TextNormalizer import normalize_text
+
+
+#a size bounded cache of search results, the least recently used entry is evicted when it is full
+#the cache follows the catalog like an index: every change bumps the catalog version and the versions of
+#the book fields that changed, and an entry is only used while the fields its strategy reads did not
+#change since it was stored, so loaning a book does not drop the cached title searches
+class SearchCache(CatalogIndex):
+    FIELDS = ('title', 'author', 'genre', 'year', 'total_copies', 'available_copies')
+
+    #initializes an empty cache holding up to max_entries results
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (field versions, results)
+        self.version = 0
+        self.field_versions = dict.fromkeys(self.FIELDS + ('waiting_list',), 0)
+        self.values = {}  # title -> values of self.FIELDS when the book last changed
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    #bumps the catalog version and the versions of the given fields
+    def _bump(self, fields):
+        self.version += 1
+        for field in fields:
+            self.field_versions[field] += 1
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.values = {book.title: tuple(getattr(book, field) for field in self.FIELDS) for book in books.values()}
+        self.entries.clear()
+        self._bump(self.field_versions)
+
+    def book_changed(self, book, borrowed_copies):
+        values = tuple(getattr(book, field) for field in self.FIELDS)
+        old_values = self.values.get(book.title)
+        if old_values == values:
+            return
+        self.values[book.title] = values
+        if old_values is None:
+            # a new book can match any search
+            self._bump(self.field_versions)
+        else:
+            self._bump([field for field, old, new in zip(self.FIELDS, old_values, values) if old != new])
+
+    def book_removed(self, title):
+        if self.values.pop(title, None) is not None:
+            self._bump(self.field_versions)
+
+    def waiting_list_changed(self, title, waiting_count):
+        self._bump(['waiting_list'])
+
+    #returns the key of a search
+    @staticmethod
+    def key(strategy, query):
+        return strategy.cache_key(), normalize_text(query)
+
+    #returns the cached results of a search, or None when they are missing or out of date
+    def get(self, strategy, query):
+        key = self.key(strategy, query)
+        entry = self.entries.get(key)
+        if entry is not None:
+            versions, results = entry
+            if versions == self._versions(strategy):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return list(results)
+            del self.entries[key]
+            self.invalidations += 1
+        self.misses += 1
+        return None
+
+    #stores the results of a search
+    def put(self, strategy, query, results):
+        key = self.key(strategy, query)
+        self.entries[key] = (self._versions(strategy), list(results))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    #returns the current versions of the fields a strategy reads, all of them when it does not tell
+    def _versions(self, strategy):
+        return tuple(self.field_versions[field] for field in strategy.fields_used() or self.field_versions)
+
+    #returns the hit, miss, eviction and invalidation counters
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'version': self.version
+        }
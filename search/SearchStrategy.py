@@ -1,59 +1,283 @@
+import re
+import heapq
 from abc import ABC, abstractmethod
+from search.TokenIndex import TokenIndex
+from search.FuzzyIndex import edit_distance
+from Error.InvalidSearchQueryException import InvalidSearchQueryException
+from system.TextNormalizer import normalize_text
 
 
 # base class for search strategies
 class SearchStrategy(ABC):
+    field = None
+
     #abstract method to search for books based on the strategy
     @abstractmethod
     def search(self, query: str, books: dict):
         pass
 
+    #searches like search() but yields the books one at a time
+    def iter_search(self, query: str, books: dict):
+        return iter(self.search(query, books))
+
+    #returns the key the results are ordered by, None when they follow the catalog order
+    def sort_key(self):
+        return None
+
+    #returns what identifies the strategy in a SearchCache
+    def cache_key(self):
+        return type(self).__name__
+
+    #returns the book fields the results depend on, None when they may depend on anything
+    def fields_used(self):
+        return (self.field,) if self.field else None
+
+    #searches using an index of the books (TokenIndex, TrigramIndex), returns None when the index
+    #cannot answer the query for the field of the strategy
+    def search_index(self, query: str, books: dict, index):
+        titles = index.lookup(self.field, query)
+        return None if titles is None else [books[title] for title in titles]
+
+    #estimates the number of books search_index() finds, returns None when the index cannot tell
+    def estimate_index(self, query: str, index):
+        return index.estimate(self.field, query)
+
+    #searches using a ColumnarCatalog mirror of the books, returns None when the strategy cannot use it
+    def search_columns(self, query: str, books: dict, columns):
+        return None
+
 #search strategy for finding books by their title
 class TitleSearchStrategy(SearchStrategy):
+    field = 'title'
+
     #searches for books whose titles contain the query
     def search(self, query: str, books: dict):
-        query = query.lower()
-        return [book for book in books.values() if query in book.title.lower()]
+        query = normalize_text(query)
+        return [book for book in books.values() if query in book.title_key]
+
+    #yields the matching books as the scan finds them
+    def iter_search(self, query: str, books: dict):
+        query = normalize_text(query)
+        return (book for book in books.values() if query in book.title_key)
 
     def get_search_type(self) -> str:
         return "name"
 
 #search strategy for finding books by their author
 class AuthorSearchStrategy(SearchStrategy):
+    field = 'author'
+
     #searches for books whose authors contain the query
     def search(self, query: str, books: dict):
-        query = query.lower()
-        return [book for book in books.values() if query in book.author.lower()]
+        query = normalize_text(query)
+        return [book for book in books.values() if query in book.author_key]
+
+    #yields the matching books as the scan finds them
+    def iter_search(self, query: str, books: dict):
+        query = normalize_text(query)
+        return (book for book in books.values() if query in book.author_key)
+
+    #matches each distinct author once and selects its books with a mask
+    def search_columns(self, query: str, books: dict, columns):
+        query = normalize_text(query)
+        titles = columns.titles_with_code('author', columns.authors, lambda author: query in normalize_text(author))
+        return [books[title] for title in titles]
 
     def get_search_type(self) -> str:
         return "author name"
 
 #search strategy for finding books based on their genre
 class GenreSearchStrategy(SearchStrategy):
+    field = 'genre'
+
     #searches for books whose genre contains the query
     def search(self, query: str, books: dict):
-        query = query.lower()
-        return [book for book in books.values() if query in book.genre.lower()]
+        query = normalize_text(query)
+        return [book for book in books.values() if query in book.genre_key]
+
+    #yields the matching books as the scan finds them
+    def iter_search(self, query: str, books: dict):
+        query = normalize_text(query)
+        return (book for book in books.values() if query in book.genre_key)
+
+    #matches each distinct genre once and selects its books with a mask
+    def search_columns(self, query: str, books: dict, columns):
+        query = normalize_text(query)
+        titles = columns.titles_with_code('genre', columns.genres, lambda genre: query in normalize_text(genre))
+        return [books[title] for title in titles]
 
     def get_search_type(self) -> str:
         return "genre"
 
 #search strategy for finding books based on their publication year
 class YearSearchStrategy(SearchStrategy):
+    field = 'year'
+
     #searches for books published in a specific year
     def search(self, query: str, books: dict):
         query = query.lower()
         return [book for book in books.values() if query in str(book.year).lower()]
 
+    #yields the matching books as the scan finds them
+    def iter_search(self, query: str, books: dict):
+        query = query.lower()
+        return (book for book in books.values() if query in str(book.year).lower())
+
+    #matches each distinct year once and selects its books with a mask
+    def search_columns(self, query: str, books: dict, columns):
+        query = query.lower()
+        titles = columns.titles_with_value('year', lambda year: query in str(year))
+        return [books[title] for title in titles]
+
     def get_search_type(self) -> str:
         return "year"
 
 #search strategy for finding books based on the total number of copies
 class CopiesSearchStrategy(SearchStrategy):
+    field = 'total_copies'
+
     #searches for books with a specific number of total copies
     def search(self, query: str, books: dict):
         query = query.lower()
         return [book for book in books.values() if query in str(book.total_copies).lower()]
 
+    #yields the matching books as the scan finds them
+    def iter_search(self, query: str, books: dict):
+        query = query.lower()
+        return (book for book in books.values() if query in str(book.total_copies).lower())
+
+    #matches each distinct number of copies once and selects its books with a mask
+    def search_columns(self, query: str, books: dict, columns):
+        query = query.lower()
+        titles = columns.titles_with_value('total_copies', lambda copies: query in str(copies))
+        return [books[title] for title in titles]
+
+    def get_search_type(self) -> str:
+        return "copies"
+
+
+#base class for strategies that find books by a range of values of an integer field
+#queries look like "1940..1960", "1940..", "..1960", ">=3", ">3", "<=3", "<3", "=3" or "3",
+#results are ordered by value and then by catalog order
+class RangeSearchStrategy(SearchStrategy):
+    RANGE_PATTERN = re.compile(r'^\s*(-?\d+)?\s*\.\.\s*(-?\d+)?\s*$')
+    COMPARISON_PATTERN = re.compile(r'^\s*(>=|<=|>|<|=)?\s*(-?\d+)\s*$')
+
+    #returns the (low, high) bounds of a query, both included and None for no bound
+    @classmethod
+    def parse_range(cls, query: str):
+        match = cls.RANGE_PATTERN.match(query)
+        if match and (match.group(1) or match.group(2)):
+            low, high = match.groups()
+            return (int(low) if low else None), (int(high) if high else None)
+
+        match = cls.COMPARISON_PATTERN.match(query)
+        if not match:
+            raise InvalidSearchQueryException(f"Invalid range: '{query}'")
+        operator, value = match.group(1) or '=', int(match.group(2))
+        if operator == '>=':
+            return value, None
+        if operator == '>':
+            return value + 1, None
+        if operator == '<=':
+            return None, value
+        if operator == '<':
+            return None, value - 1
+        return value, value
+
+    #scans the books whose field is in the range
+    def search(self, query: str, books: dict):
+        results = list(self.iter_search(query, books))
+        results.sort(key=self.sort_key())
+        return results
+
+    #yields the books in the range in catalog order, sort_key() orders them
+    def iter_search(self, query: str, books: dict):
+        low, high = self.parse_range(query)
+        field = self.field
+        return (book for book in books.values()
+                if (low is None or getattr(book, field) >= low) and (high is None or getattr(book, field) <= high))
+
+    def sort_key(self):
+        field = self.field
+        return lambda book: getattr(book, field)
+
+    #finds the range in a sorted NumericIndex with two binary searches
+    def search_index(self, query: str, books: dict, index):
+        low, high = self.parse_range(query)
+        titles = index.range(self.field, low, high)
+        return None if titles is None else [books[title] for title in titles]
+
+    #counts the books in the range with the same binary searches
+    def estimate_index(self, query: str, index):
+        low, high = self.parse_range(query)
+        return index.count_range(self.field, low, high)
+
+#search strategy for finding books published in a range of years
+class YearRangeSearchStrategy(RangeSearchStrategy):
+    field = 'year'
+
+    def get_search_type(self) -> str:
+        return "year range"
+
+#search strategy for finding books by a range of total copies
+class CopiesRangeSearchStrategy(RangeSearchStrategy):
+    field = 'total_copies'
+
+    def get_search_type(self) -> str:
+        return "copies range"
+
+#search strategy for finding books by a range of available copies
+class AvailableCopiesSearchStrategy(RangeSearchStrategy):
+    field = 'available_copies'
+
+    def get_search_type(self) -> str:
+        return "available copies"
+
+#search strategy for finding the titles and authors closest to a mistyped query
+#returns up to limit books ranked by the number of typos (see FuzzyIndex), closest first
+class FuzzySearchStrategy(SearchStrategy):
+    #initializes the strategy with the fields to compare and the number of books to return
+    def __init__(self, fields=('title', 'author'), limit=10, max_distance=2):
+        self.fields = tuple(fields)
+        self.limit = limit
+        self.max_distance = max_distance
+
+    #compares the query with the words of every book
+    def search(self, query: str, books: dict):
+        words = list(dict.fromkeys(TokenIndex.tokenize(normalize_text(query))))
+        if not words:
+            return []
+        not_found = self.max_distance + 1
+        scored = []
+        for position, book in enumerate(books.values()):
+            best = None
+            for field in self.fields:
+                book_words = set(TokenIndex.tokenize(getattr(book, f'{field}_key')))
+                total = 0
+                for word in words:
+                    distance = min((edit_distance(word, book_word, self.max_distance) for book_word in book_words),
+                                   default=not_found)
+                    if distance > self.max_distance:
+                        break
+                    total += distance
+                else:
+                    best = total if best is None else min(best, total)
+            if best is not None:
+                scored.append((best, position, book))
+        return [book for _, _, book in heapq.nsmallest(self.limit, scored, key=lambda item: item[:2])]
+
+    #looks the words of the query up in the typo tolerant index
+    def search_index(self, query: str, books: dict, index):
+        closest = index.closest(query, self.fields, self.limit, self.max_distance)
+        return None if closest is None else [books[title] for _, title in closest]
+
+    #results depend on the options as well
+    def cache_key(self):
+        return type(self).__name__, self.fields, self.limit, self.max_distance
+
+    def fields_used(self):
+        return self.fields
+
     def get_search_type(self) -> str:
-        return "copies"
\ No newline at end of file
+        return "similar title or author"
@@ -0,0 +1,144 @@
+import re
+from bisect import bisect_left, insort
+from search.CatalogIndex import CatalogIndex
+from system.TextNormalizer import normalize_text
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+#an inverted index from the words of the normalized titles and authors to the titles of the books
+#every word is also stored by its suffixes in a sorted list, so any part of a word is found with a
+#binary search. lookups give the same books as the substring scans of the search strategies, in catalog
+#order, and their cost depends on the number of matches instead of the size of the catalog
+class TokenIndex(CatalogIndex):
+    #initializes an empty index over the given book fields
+    def __init__(self, fields=('title', 'author')):
+        self.fields = tuple(fields)
+        self.postings = {field: {} for field in self.fields}  # field -> word -> titles
+        self.suffixes = {field: {} for field in self.fields}  # field -> suffix -> words ending with it
+        self.sorted_suffixes = {field: [] for field in self.fields}
+        self.texts = {}  # title -> indexed search keys, in the order of self.fields
+        self.order = {}  # title -> position in the catalog
+        self.next_position = 0
+        self._rebuilding = False
+
+    #splits a search key into words
+    @staticmethod
+    def tokenize(text):
+        return TOKEN_PATTERN.findall(text)
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__(self.fields)
+        # the suffix lists are sorted once at the end instead of on every new word
+        self._rebuilding = True
+        for book in books.values():
+            self.book_changed(book, 0)
+        self._rebuilding = False
+        for field in self.fields:
+            self.sorted_suffixes[field] = sorted(self.suffixes[field])
+
+    def book_changed(self, book, borrowed_copies):
+        texts = tuple(getattr(book, f'{field}_key') for field in self.fields)
+        old_texts = self.texts.get(book.title)
+        if old_texts == texts:
+            return
+        if old_texts is None:
+            self.order[book.title] = self.next_position
+            self.next_position += 1
+        else:
+            self._remove_texts(book.title, old_texts)
+
+        self.texts[book.title] = texts
+        for field, text in zip(self.fields, texts):
+            postings = self.postings[field]
+            for word in set(self.tokenize(text)):
+                titles = postings.get(word)
+                if titles is None:
+                    titles = postings[word] = set()
+                    self._add_word(field, word)
+                titles.add(book.title)
+
+    def book_removed(self, title):
+        texts = self.texts.pop(title, None)
+        if texts is None:
+            return
+        self._remove_texts(title, texts)
+        del self.order[title]
+
+    #removes a title from the postings of its words
+    def _remove_texts(self, title, texts):
+        for field, text in zip(self.fields, texts):
+            postings = self.postings[field]
+            for word in set(self.tokenize(text)):
+                titles = postings[word]
+                titles.discard(title)
+                if not titles:
+                    del postings[word]
+                    self._remove_word(field, word)
+
+    #adds every suffix of a new word
+    def _add_word(self, field, word):
+        suffixes = self.suffixes[field]
+        for start in range(len(word)):
+            suffix = word[start:]
+            words = suffixes.get(suffix)
+            if words is None:
+                words = suffixes[suffix] = set()
+                if not self._rebuilding:
+                    insort(self.sorted_suffixes[field], suffix)
+            words.add(word)
+
+    #removes the suffixes of a word that is no longer in the catalog
+    def _remove_word(self, field, word):
+        suffixes = self.suffixes[field]
+        sorted_suffixes = self.sorted_suffixes[field]
+        for start in range(len(word)):
+            suffix = word[start:]
+            words = suffixes[suffix]
+            words.discard(word)
+            if not words:
+                del suffixes[suffix]
+                del sorted_suffixes[bisect_left(sorted_suffixes, suffix)]
+
+    #returns the indexed words that contain a part of a word
+    def words_containing(self, field, part):
+        sorted_suffixes = self.sorted_suffixes[field]
+        suffixes = self.suffixes[field]
+        words = set()
+        position = bisect_left(sorted_suffixes, part)
+        while position < len(sorted_suffixes) and sorted_suffixes[position].startswith(part):
+            words.update(suffixes[sorted_suffixes[position]])
+            position += 1
+        return words
+
+    #returns the titles of the books whose field contains the words of the query
+    def _candidates(self, field, parts):
+        candidates = None
+        postings = self.postings[field]
+        # longer parts usually match fewer books, starting with them keeps the intersections small
+        for part in sorted(parts, key=len, reverse=True):
+            titles = set()
+            for word in self.words_containing(field, part):
+                titles.update(postings[word])
+            candidates = titles if candidates is None else candidates & titles
+            if not candidates:
+                return set()
+        return candidates
+
+    #returns the titles of the books whose field contains the query, in catalog order
+    #returns None when the field is not indexed or the query has no words, the caller then scans the books
+    def lookup(self, field, query):
+        if field not in self.postings:
+            return None
+        query = normalize_text(query)
+        parts = self.tokenize(query)
+        if not parts:
+            return None
+
+        titles = self._candidates(field, parts)
+        if len(parts) > 1 or parts[0] != query:
+            # the query spans several words or contains punctuation, the candidates contain every
+            # word of it and are checked against the whole value
+            position = self.fields.index(field)
+            titles = [title for title in titles if query in self.texts[title][position]]
+        return sorted(titles, key=self.order.__getitem__)
@@ -0,0 +1,123 @@
+from search.CatalogIndex import CatalogIndex
+from system.TextNormalizer import normalize_text
+
+
+#an index from the three letter sequences (trigrams) of the normalized titles, authors and genres to the
+#titles of the books. a query of three letters or more only has to be checked against the books that
+#contain all of its trigrams, so lookups give exactly the books of a substring scan without scanning.
+#shorter queries are answered directly from the one and two letter sequences of the values
+class TrigramIndex(CatalogIndex):
+    #initializes an empty index over the given book fields
+    def __init__(self, fields=('title', 'author', 'genre')):
+        self.fields = tuple(fields)
+        self.postings = {field: {} for field in self.fields}  # field -> trigram -> titles
+        self.short_postings = {field: {} for field in self.fields}  # field -> letter or letter pair -> titles
+        self.texts = {}  # title -> indexed search keys, in the order of self.fields
+        self.order = {}  # title -> position in the catalog
+        self.next_position = 0
+
+    #returns the distinct sequences of n letters of a value
+    @staticmethod
+    def grams(text, n):
+        return {text[start:start + n] for start in range(len(text) - n + 1)}
+
+    def rebuild(self, books, books_borrowed, waiting_list):
+        self.__init__(self.fields)
+        for book in books.values():
+            self.book_changed(book, 0)
+
+    def book_changed(self, book, borrowed_copies):
+        texts = tuple(getattr(book, f'{field}_key') for field in self.fields)
+        old_texts = self.texts.get(book.title)
+        if old_texts == texts:
+            return
+        if old_texts is None:
+            self.order[book.title] = self.next_position
+            self.next_position += 1
+        else:
+            self._remove_texts(book.title, old_texts)
+
+        self.texts[book.title] = texts
+        for field, text in zip(self.fields, texts):
+            self._add_grams(self.postings[field], self.grams(text, 3), book.title)
+            self._add_grams(self.short_postings[field], self.grams(text, 1) | self.grams(text, 2), book.title)
+
+    def book_removed(self, title):
+        texts = self.texts.pop(title, None)
+        if texts is None:
+            return
+        self._remove_texts(title, texts)
+        del self.order[title]
+
+    #adds a title to the postings of its grams
+    @staticmethod
+    def _add_grams(postings, grams, title):
+        for gram in grams:
+            titles = postings.get(gram)
+            if titles is None:
+                titles = postings[gram] = set()
+            titles.add(title)
+
+    #removes a title from the postings of its grams
+    @staticmethod
+    def _remove_grams(postings, grams, title):
+        for gram in grams:
+            titles = postings[gram]
+            titles.discard(title)
+            if not titles:
+                del postings[gram]
+
+    #removes a title from every posting of its old values
+    def _remove_texts(self, title, texts):
+        for field, text in zip(self.fields, texts):
+            self._remove_grams(self.postings[field], self.grams(text, 3), title)
+            self._remove_grams(self.short_postings[field], self.grams(text, 1) | self.grams(text, 2), title)
+
+    #returns the titles of the books whose field contains the query, in catalog order
+    #returns None when the field is not indexed or the query is empty (e.g. only combining marks, which the
+    #normalization drops), the caller then scans the books
+    def lookup(self, field, query):
+        if field not in self.postings:
+            return None
+        query = normalize_text(query)
+        if not query:
+            return None
+
+        if len(query) < 3:
+            # a letter or a pair of letters is its own posting list, no check is needed
+            titles = self.short_postings[field].get(query, ())
+            return sorted(titles, key=self.order.__getitem__)
+
+        postings = self.postings[field]
+        posting_lists = []
+        for gram in self.grams(query, 3):
+            titles = postings.get(gram)
+            if titles is None:
+                return []
+            posting_lists.append(titles)
+
+        # intersecting from the shortest list keeps every intermediate set small
+        posting_lists.sort(key=len)
+        candidates = posting_lists[0]
+        for titles in posting_lists[1:]:
+            candidates = candidates & titles
+            if not candidates:
+                return []
+
+        if len(query) > 3:
+            # sharing all the trigrams does not mean they appear in the same order
+            position = self.fields.index(field)
+            candidates = [title for title in candidates if query in self.texts[title][position]]
+        return sorted(candidates, key=self.order.__getitem__)
+
+    #returns the size of the shortest posting list of the query, an upper bound of the books lookup() finds
+    def estimate(self, field, query):
+        if field not in self.postings:
+            return None
+        query = normalize_text(query)
+        if not query:
+            return None
+        if len(query) < 3:
+            return len(self.short_postings[field].get(query, ()))
+        postings = self.postings[field]
+        return min(len(postings.get(gram, ())) for gram in self.grams(query, 3))
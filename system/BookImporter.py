@@ -0,0 +1,115 @@
+import os
+import csv
+import json
+from Books.Book import Book
+from Error.InvalidBookDataException import InvalidBookDataException
+from Error.NegativeCopiesException import NegativeCopiesException
+from Error.NonIntegerValueException import NonIntegerValueException
+
+#streams books from an acquisitions feed (csv or jsonl) into the library
+#rows are validated one at a time as they are read, invalid rows go to a rejection report
+class BookImporter:
+    FIELDS = ('title', 'author', 'copies', 'genre', 'year')
+
+    #initializes the importer, rejection_report_path is the csv the rejected rows are written to
+    def __init__(self, rejection_report_path=None):
+        self.rejection_report_path = rejection_report_path
+        self.rejected = []  # (row number, title, reason)
+
+    #imports a csv or jsonl file into the librarian and returns the number of books added
+    def import_file(self, librarian, file_path):
+        if file_path.lower().endswith(('.jsonl', '.json')):
+            rows = self.read_jsonl(file_path)
+        else:
+            rows = self.read_csv(file_path)
+        return self.import_rows(librarian, rows)
+
+    #imports (row number, row dict) pairs into the librarian with a single commit
+    def import_rows(self, librarian, rows):
+        self.rejected = []
+        invalid_books = []
+        added_count = librarian.bulk_add(self.validate(rows), invalid_books)
+        # rows are validated by parse_row before reaching bulk_add, so this only catches rule changes
+        for book, reason in invalid_books:
+            self.rejected.append(('', book.title, reason))
+        self.write_rejection_report()
+        return added_count
+
+    #reads the rows of a csv file, resolving the column positions once
+    @staticmethod
+    def read_csv(file_path):
+        with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            positions = {name.strip(): index for index, name in enumerate(header)}
+            columns = [(name, positions.get(name)) for name in BookImporter.FIELDS]
+            for row_number, row in enumerate(reader, start=2):
+                if not row:
+                    continue
+                yield row_number, {name: row[index] if index is not None and index < len(row) else None
+                                   for name, index in columns}
+
+    #reads the rows of a json lines file
+    @staticmethod
+    def read_jsonl(file_path):
+        with open(file_path, mode='r', encoding='utf-8') as file:
+            for row_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                if not isinstance(row, dict):
+                    yield row_number, {}
+                else:
+                    yield row_number, row
+
+    #lazily turns rows into books, rejected rows are recorded and skipped
+    def validate(self, rows):
+        for row_number, row in rows:
+            try:
+                book = self.parse_row(row)
+            except (InvalidBookDataException, NonIntegerValueException, NegativeCopiesException) as e:
+                self.rejected.append((row_number, row.get('title') or '', str(e)))
+                continue
+            yield book
+
+    #creates a book from a row, raising the library exceptions for invalid data
+    @staticmethod
+    def parse_row(row):
+        title = row.get('title')
+        author = row.get('author')
+        genre = row.get('genre')
+        copies = row.get('copies')
+        year = row.get('year')
+
+        if not title or not author or not genre or copies in (None, '') or year in (None, ''):
+            raise InvalidBookDataException("Missing title, author, copies, genre or year.")
+
+        # str() makes json floats such as 3.5 fail instead of being truncated
+        try:
+            copies = copies if type(copies) is int else int(str(copies))
+            year = year if type(year) is int else int(str(year))
+        except (TypeError, ValueError):
+            raise NonIntegerValueException()
+
+        if copies <= 0:
+            raise NegativeCopiesException()
+
+        return Book(title, author, copies, genre, year)
+
+    #writes the rejected rows to the rejection report
+    def write_rejection_report(self):
+        if self.rejection_report_path is None:
+            return
+        directory = os.path.dirname(self.rejection_report_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(self.rejection_report_path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['row', 'title', 'reason'])
+            writer.writerows(self.rejected)
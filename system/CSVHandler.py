@@ -1,37 +1,104 @@
+import io
 import os
 import csv
+from concurrent.futures import ProcessPoolExecutor
 from Books.Book import Book
 from Library.Customer import Customer
+from Library.WaitingList import WaitingList
 
 #a utility class for handling CVS file operations for books and waiting lists in the library
 class CSVHandler:
+    BOOK_COLUMNS = ('title', 'author', 'is_loaned', 'copies', 'genre', 'year')
+
     #loads books from CVS file and returns a dictionary of book objects
     @staticmethod
     def load_books_from_csv(file_path=None):
         books = {}
         try:
-            if file_path is None:
-                base_path = os.path.dirname(os.path.abspath(__file__))
-                file_path = os.path.join(base_path, '../files', 'books.csv')
-
-            with open(file_path, mode='r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    book = Book(
-                        title=row['title'],
-                        author=row['author'],
-                        copies=int(row['copies']),
-                        genre=row['genre'],
-                        year=int(row['year'])
-                    )
-                    # קריאת מצב השאלה
-                    book.is_loaned = row['is_loaned']
-                    book.available_copies = int(row['copies']) if row['is_loaned'] == "No" else 0
-                    books[book.title] = book
+            for book in CSVHandler.iter_books_from_csv(file_path):
+                books[book.title] = book
         except FileNotFoundError:
             print(f"File not found: {file_path}, starting with empty library.")
         return books
 
+    #lazily yields the books of a CVS file one at a time, so scanning the catalog keeps memory flat
+    @staticmethod
+    def iter_books_from_csv(file_path=None):
+        if file_path is None:
+            base_path = os.path.dirname(os.path.abspath(__file__))
+            file_path = os.path.join(base_path, '../files', 'books.csv')
+
+        with open(file_path, mode='r', newline='', encoding='utf-8') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            # resolve the column positions once instead of building a dict per row
+            title_i, author_i, is_loaned_i, copies_i, genre_i, year_i = CSVHandler._book_column_positions(header)
+            for row in reader:
+                if not row:
+                    continue
+                yield CSVHandler._create_book(row[title_i], row[author_i], row[is_loaned_i],
+                                              int(row[copies_i]), row[genre_i], int(row[year_i]))
+
+    #loads a large CVS file by splitting it on line boundaries and parsing the parts in a process pool
+    #files with line breaks inside quoted values are loaded sequentially instead
+    @staticmethod
+    def load_books_parallel(file_path=None, workers=None, min_chunk_size=1 << 20):
+        if file_path is None:
+            base_path = os.path.dirname(os.path.abspath(__file__))
+            file_path = os.path.join(base_path, '../files', 'books.csv')
+
+        if not os.path.exists(file_path):
+            print(f"File not found: {file_path}, starting with empty library.")
+            return {}
+
+        workers = workers or os.cpu_count() or 1
+        with open(file_path, mode='rb') as file:
+            header_line = file.readline()
+            data_start = file.tell()
+            file_size = os.fstat(file.fileno()).st_size
+
+            chunk_size = max(min_chunk_size, (file_size - data_start) // workers + 1)
+            if workers == 1 or file_size - data_start <= chunk_size:
+                return CSVHandler.load_books_from_csv(file_path)
+
+            # move every chunk end to the start of the next line
+            offsets = [data_start]
+            while offsets[-1] < file_size:
+                file.seek(min(offsets[-1] + chunk_size, file_size))
+                file.readline()
+                offsets.append(min(file.tell(), file_size))
+
+        header = next(csv.reader([header_line.decode('utf-8-sig')]))
+        positions = CSVHandler._book_column_positions(header)
+        books = {}
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_parse_books_chunk, file_path, start, end, positions)
+                           for start, end in zip(offsets, offsets[1:])]
+                for future in futures:
+                    for title, author, is_loaned, copies, genre, year in future.result():
+                        books[title] = CSVHandler._create_book(title, author, is_loaned, copies, genre, year)
+        except (ValueError, IndexError, csv.Error):
+            # a quoted value spans several lines (or a row is malformed), the file cannot be split safely
+            return CSVHandler.load_books_from_csv(file_path)
+        return books
+
+    #returns the positions of the book columns in the header row
+    @staticmethod
+    def _book_column_positions(header):
+        positions = {name.strip().lstrip('\ufeff'): index for index, name in enumerate(header)}
+        return tuple(positions[column] for column in CSVHandler.BOOK_COLUMNS)
+
+    #creates a book from the values of a CVS row
+    @staticmethod
+    def _create_book(title, author, is_loaned, copies, genre, year):
+        book = Book(title=title, author=author, copies=copies, genre=genre, year=year)
+        # קריאת מצב השאלה
+        book.available_copies = copies if is_loaned == "No" else 0
+        return book
+
     #saves books to a cvs file
     @staticmethod
     def save_books_to_csv(books, file_path=None):
@@ -65,7 +132,7 @@ class CSVHandler:
     #loads waiting list from CVS file
     @staticmethod
     def load_waiting_list_from_csv(file_path=None):
-        waiting_list = {}
+        waiting_list = WaitingList()
         try:
             # if no path is given, uses default path
             if file_path is None:
@@ -82,9 +149,8 @@ class CSVHandler:
                             phone=row['Customer Phone'],
                             email=row['Customer Email']
                         )
-                        if book_title not in waiting_list:
-                            waiting_list[book_title] = []
-                        waiting_list[book_title].append(customer)
+                        # files written before priorities were added have no Priority column
+                        waiting_list.setdefault(book_title).append(customer, int(row.get('Priority') or 0))
         except Exception as e:
             print(f"Error loading waiting list from {file_path}: {str(e)}")
         return waiting_list
@@ -104,18 +170,37 @@ class CSVHandler:
                 os.makedirs(directory)
 
             with open(file_path, mode='w', newline='', encoding='utf-8') as file:
-                fieldnames = ['Book Title', 'Customer Name', 'Customer Phone', 'Customer Email']
+                fieldnames = ['Book Title', 'Customer Name', 'Customer Phone', 'Customer Email', 'Priority']
                 writer = csv.DictWriter(file, fieldnames=fieldnames)
 
                 writer.writeheader()
 
                 for book_title, customers in waiting_list.items():
-                    for customer in customers:
+                    for customer, priority in customers.entries():
                         writer.writerow({
                             'Book Title': book_title,
                             'Customer Name': customer.name,
                             'Customer Phone': customer.phone,
-                            'Customer Email': customer.email
+                            'Customer Email': customer.email,
+                            'Priority': priority
                         })
         except Exception as e:
-            print(f"Error saving waiting list to {file_path}: {str(e)}")
\ No newline at end of file
+            print(f"Error saving waiting list to {file_path}: {str(e)}")
+
+
+#parses the rows between two byte offsets of a books CVS file into tuples, runs in a worker process
+def _parse_books_chunk(file_path, start, end, positions):
+    title_i, author_i, is_loaned_i, copies_i, genre_i, year_i = positions
+    with open(file_path, mode='rb') as file:
+        file.seek(start)
+        data = file.read(end - start).decode('utf-8')
+
+    # only \n ends a line, the other line breaks of str.splitlines() are ordinary characters of a value
+    rows = [row for row in csv.reader(io.StringIO(data, newline='')) if row]
+    if len(rows) != sum(1 for line in data.split('\n') if line.rstrip('\r')):
+        raise ValueError("Quoted value spans several lines")
+    width = max(positions) + 1
+    if any(len(row) < width for row in rows):
+        raise ValueError("Row has missing values")
+    return [(row[title_i], row[author_i], row[is_loaned_i], int(row[copies_i]), row[genre_i], int(row[year_i]))
+            for row in rows]
@@ -0,0 +1,151 @@
+import os
+import json
+from Books.Book import Book
+from Library.Customer import Customer
+
+#an append-only journal of library mutations
+#each change is written as a single json line instead of rewriting the whole catalog,
+#and the journal is replayed on top of the last csv snapshot when the library starts
+class Journal:
+    #initializes the journal with the path of its file
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.record_count = 0
+        self._file = None
+
+    #builds the record describing the current state of a book
+    @staticmethod
+    def book_record(book, borrowed_copies=0):
+        return {
+            'op': 'book',
+            'title': book.title,
+            'author': book.author,
+            'copies': book.total_copies,
+            'available': book.available_copies,
+            'borrowed': borrowed_copies,
+            'genre': book.genre,
+            'year': book.year
+        }
+
+    #builds the record for a removed book
+    @staticmethod
+    def remove_record(title):
+        return {'op': 'remove', 'title': title}
+
+    #builds the record for a costumer joining a waiting list
+    @staticmethod
+    def wait_add_record(title, customer, priority=0):
+        return {'op': 'wait_add', 'title': title, 'name': customer.name,
+                'phone': customer.phone, 'email': customer.email, 'priority': priority}
+
+    #builds the record for a costumer leaving a waiting list
+    @staticmethod
+    def wait_remove_record(title, customer):
+        return {'op': 'wait_remove', 'title': title, 'name': customer.name, 'phone': customer.phone}
+
+    #appends a single record to the end of the journal
+    def append(self, record):
+        self.append_many([record])
+
+    #appends several records with a single write
+    def append_many(self, records):
+        lines = [json.dumps(record, ensure_ascii=False) + '\n' for record in records]
+        if not lines:
+            return
+        if self._file is None:
+            directory = os.path.dirname(self.file_path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            self._file = open(self.file_path, mode='a', encoding='utf-8')
+        self._file.write(''.join(lines))
+        self._file.flush()
+        self.record_count += len(lines)
+
+    #reads the records of the journal in the order they were written
+    #a partially written last line left over from a crash is cut off the file, so the records written
+    #next start on a line of their own instead of being appended to the broken one
+    def read(self):
+        if not os.path.exists(self.file_path):
+            return
+        valid_end = 0  # offset of the end of the last complete record
+        missing_newline = False
+        with open(self.file_path, mode='rb') as file:
+            for line in file:
+                try:
+                    record = json.loads(line) if line.strip() else None
+                except ValueError:
+                    break
+                valid_end += len(line)
+                missing_newline = not line.endswith(b'\n')
+                if record is not None:
+                    yield record
+        if missing_newline or os.path.getsize(self.file_path) != valid_end:
+            with open(self.file_path, mode='r+b') as file:
+                file.truncate(valid_end)
+                if missing_newline:
+                    file.seek(valid_end)
+                    file.write(b'\n')
+
+    #applies the journal records on top of a loaded snapshot, the first skip records are already in it
+    def replay_into(self, books, waiting_list, books_borrowed, skip=0):
+        count = 0
+        for record in self.read():
+            if count >= skip:
+                self.apply(record, books, waiting_list, books_borrowed)
+            count += 1
+        self.record_count = count
+        return count
+
+    #applies a single record, replaying the same record twice leaves the same state
+    @staticmethod
+    def apply(record, books, waiting_list, books_borrowed):
+        op = record.get('op')
+        title = record.get('title')
+
+        if op == 'book':
+            book = books.get(title)
+            if book is None:
+                book = Book(title, record['author'], record['copies'], record['genre'], record['year'])
+                books[title] = book
+            else:
+                book.author = record['author']
+                book.total_copies = record['copies']
+                book.genre = record['genre']
+                book.year = record['year']
+            book.available_copies = record['available']
+
+            if record.get('borrowed', 0) > 0:
+                books_borrowed[title] = record['borrowed']
+            else:
+                books_borrowed.pop(title, None)
+
+        elif op == 'remove':
+            books.pop(title, None)
+            books_borrowed.pop(title, None)
+
+        elif op == 'wait_add':
+            customer = Customer(record['name'], record['phone'], record['email'])
+            customers = waiting_list.setdefault(title)
+            if customer not in customers:
+                customers.append(customer, record.get('priority', 0))
+
+        elif op == 'wait_remove':
+            customers = waiting_list.get(title)
+            if customers:
+                customers.remove(Customer.from_trusted(record['name'], record['phone'], ''))
+
+    #replaces the content of the journal with the given records (used after compaction)
+    def reset(self, records=()):
+        self.close()
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, mode='w', encoding='utf-8') as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(temp_path, self.file_path)
+        self.record_count = len(records)
+
+    #closes the journal file
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
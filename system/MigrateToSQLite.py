@@ -0,0 +1,26 @@
+import os
+import argparse
+from system.SQLiteStorage import SQLiteStorage
+
+#imports the csv files of the library into a sqlite database
+#usage: python -m system.MigrateToSQLite [--books files/books.csv] [--waiting-list files/waiting_list.csv] [--db files/library.db]
+def main(argv=None):
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    files_dir = os.path.join(base_path, 'files')
+
+    parser = argparse.ArgumentParser(description="Import the library csv files into a sqlite database")
+    parser.add_argument('--books', default=os.path.join(files_dir, 'books.csv'))
+    parser.add_argument('--waiting-list', default=os.path.join(files_dir, 'waiting_list.csv'))
+    parser.add_argument('--db', default=os.path.join(files_dir, 'library.db'))
+    args = parser.parse_args(argv)
+
+    storage = SQLiteStorage(args.db)
+    try:
+        count = storage.import_csv(args.books, args.waiting_list)
+    finally:
+        storage.close()
+    print(f"Imported {count} books into {args.db}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+from Books.Book import Book
+from Library.Customer import Customer
+from Library.WaitingList import WaitingList
+from system.Storage import LibraryStorage, CSVStorage
+
+#storage that keeps the library state in a sqlite database
+#every change is a single row update inside a transaction, so its cost does not depend on the catalog size
+class SQLiteStorage(LibraryStorage):
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            title TEXT PRIMARY KEY,
+            author TEXT NOT NULL,
+            genre TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            total_copies INTEGER NOT NULL,
+            available_copies INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_books_author ON books(author);
+        CREATE INDEX IF NOT EXISTS idx_books_genre ON books(genre);
+        CREATE INDEX IF NOT EXISTS idx_books_year ON books(year);
+
+        CREATE TABLE IF NOT EXISTS borrowed (
+            title TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS waiting_list (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            name TEXT NOT NULL,
+            phone TEXT NOT NULL,
+            email TEXT NOT NULL,
+            priority INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (title, name, phone)
+        );
+        CREATE INDEX IF NOT EXISTS idx_waiting_list_title ON waiting_list(title, id);
+    """
+
+    #initializes the storage and creates the tables if needed
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.executescript(self.SCHEMA)
+        # databases created before priorities were added
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(waiting_list)")]
+        if 'priority' not in columns:
+            self.connection.execute("ALTER TABLE waiting_list ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+            self.connection.commit()
+        self._in_transaction = False
+
+    #loads books, borrow counts and waiting list from the database
+    def load(self):
+        self.books = {}
+        self.waiting_list = WaitingList()
+        self.books_borrowed = {}
+
+        for title, author, genre, year, total_copies, available_copies in self.connection.execute(
+                "SELECT title, author, genre, year, total_copies, available_copies FROM books ORDER BY rowid"):
+            book = Book(title, author, total_copies, genre, year)
+            book.available_copies = available_copies
+            self.books[title] = book
+
+        for title, count in self.connection.execute("SELECT title, count FROM borrowed"):
+            self.books_borrowed[title] = count
+
+        for title, name, phone, email, priority in self.connection.execute(
+                "SELECT title, name, phone, email, priority FROM waiting_list ORDER BY id"):
+            self.waiting_list.setdefault(title).append(Customer(name, phone, email), priority)
+
+        return self.books, self.waiting_list, self.books_borrowed
+
+    def save_book(self, book, borrowed_copies):
+        with self._write():
+            self._write_book(book, borrowed_copies)
+
+    def delete_book(self, title):
+        with self._write():
+            self.connection.execute("DELETE FROM books WHERE title = ?", (title,))
+            self.connection.execute("DELETE FROM borrowed WHERE title = ?", (title,))
+
+    def add_waiting(self, title, customer, priority=0):
+        with self._write():
+            self.connection.execute(
+                "INSERT OR IGNORE INTO waiting_list (title, name, phone, email, priority) VALUES (?, ?, ?, ?, ?)",
+                (title, customer.name, customer.phone, customer.email, priority))
+
+    def remove_waiting(self, title, customers):
+        with self._write():
+            self.connection.executemany(
+                "DELETE FROM waiting_list WHERE title = ? AND name = ? AND phone = ?",
+                [(title, customer.name, customer.phone) for customer in customers])
+
+    #rewrites the books and borrowed tables
+    def save_books(self):
+        with self._write():
+            self.connection.execute("DELETE FROM books")
+            self.connection.execute("DELETE FROM borrowed")
+            self.connection.executemany(
+                "INSERT INTO books (title, author, genre, year, total_copies, available_copies) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(book.title, book.author, book.genre, book.year, book.total_copies, book.available_copies)
+                 for book in self.books.values()])
+            self.connection.executemany(
+                "INSERT INTO borrowed (title, count) VALUES (?, ?)",
+                [(title, count) for title, count in self.books_borrowed.items()
+                 if count > 0 and title in self.books])
+
+    #rewrites the waiting list table
+    def save_waiting_list(self):
+        with self._write():
+            self.connection.execute("DELETE FROM waiting_list")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO waiting_list (title, name, phone, email, priority) VALUES (?, ?, ?, ?, ?)",
+                [(title, customer.name, customer.phone, customer.email, priority)
+                 for title, customers in self.waiting_list.items() for customer, priority in customers.entries()])
+
+    #runs all the statements of the scope in one sql transaction
+    @contextmanager
+    def transaction(self):
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        try:
+            with self.connection:
+                yield self
+        finally:
+            self._in_transaction = False
+
+    #opens a sql transaction for a single change unless one is already open
+    @contextmanager
+    def _write(self):
+        if self._in_transaction:
+            yield
+        else:
+            with self.connection:
+                yield
+
+    #writes a single book row and its borrow count, must run inside a transaction
+    def _write_book(self, book, borrowed_copies):
+        self.connection.execute(
+            "INSERT INTO books (title, author, genre, year, total_copies, available_copies) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(title) DO UPDATE SET author = excluded.author, genre = excluded.genre, "
+            "year = excluded.year, total_copies = excluded.total_copies, "
+            "available_copies = excluded.available_copies",
+            (book.title, book.author, book.genre, book.year, book.total_copies, book.available_copies))
+        if borrowed_copies > 0:
+            self.connection.execute(
+                "INSERT INTO borrowed (title, count) VALUES (?, ?) "
+                "ON CONFLICT(title) DO UPDATE SET count = excluded.count",
+                (book.title, borrowed_copies))
+        else:
+            self.connection.execute("DELETE FROM borrowed WHERE title = ?", (book.title,))
+
+    #imports books.csv and waiting_list.csv into the database, replacing its content
+    def import_csv(self, books_path=None, waiting_list_path=None):
+        self.books, self.waiting_list, self.books_borrowed = CSVStorage(books_path, waiting_list_path).load()
+        self.save_books()
+        self.save_waiting_list()
+        return len(self.books)
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,178 @@
+import os
+import sys
+import mmap
+import struct
+import zlib
+from array import array
+from Books.Book import Book
+from Library.Customer import Customer
+from Library.WaitingList import WaitingList
+
+#a compact binary snapshot of the library state (books, borrow counts and waiting lists)
+#strings are stored once in an interned string table and every other value is a fixed width integer column,
+#so loading is a checksum check, one utf-8 decode and a few array copies out of a memory mapped file
+class Snapshot:
+    MAGIC = b'LIBSNAP3'
+    # magic, checksum, payload length, books.csv mtime/size, waiting_list.csv mtime/size, journal records
+    HEADER = struct.Struct('<8sIQqqqqq')
+
+    #initializes the snapshot with its path and the csv files it was taken from
+    def __init__(self, file_path, books_path=None, waiting_list_path=None):
+        self.file_path = file_path
+        self.books_path = books_path
+        self.waiting_list_path = waiting_list_path
+        self.journal_records = 0  # journal records already in the loaded snapshot
+
+    #writes the state into the snapshot file
+    #journal_records is the number of journal records the state already includes, they are not replayed on load
+    def write(self, books, waiting_list, books_borrowed, journal_records=0):
+        strings = {}
+
+        #returns the id of a string in the string table
+        def intern(value):
+            string_id = strings.get(value)
+            if string_id is None:
+                string_id = strings[value] = len(strings)
+            return string_id
+
+        titles, authors, genres = array('I'), array('I'), array('I')
+        years, total_copies, available_copies, borrowed = array('i'), array('i'), array('i'), array('i')
+        for book in books.values():
+            titles.append(intern(book.title))
+            authors.append(intern(book.author))
+            genres.append(intern(book.genre))
+            years.append(book.year)
+            total_copies.append(book.total_copies)
+            available_copies.append(book.available_copies)
+            borrowed.append(books_borrowed.get(book.title, 0))
+
+        waiting_titles, names, phones, emails = array('I'), array('I'), array('I'), array('I')
+        priorities = array('i')
+        for title, customers in waiting_list.items():
+            for customer, priority in customers.entries():
+                waiting_titles.append(intern(title))
+                names.append(intern(customer.name))
+                phones.append(intern(customer.phone))
+                emails.append(intern(customer.email))
+                priorities.append(priority)
+
+        # offsets are in characters of the decoded text, so a single decode serves every string
+        offsets = array('Q', [0])
+        for value in strings:
+            offsets.append(offsets[-1] + len(value))
+        text = ''.join(strings).encode('utf-8')
+
+        parts = [struct.pack('<QQQQ', len(strings), len(text), len(books), len(waiting_titles)),
+                 self._to_bytes(offsets), text]
+        parts += [self._to_bytes(column) for column in
+                  (titles, authors, genres, years, total_copies, available_copies, borrowed)]
+        parts += [self._to_bytes(column) for column in (waiting_titles, names, phones, emails, priorities)]
+        payload = b''.join(parts)
+
+        header = self.HEADER.pack(self.MAGIC, zlib.crc32(payload), len(payload),
+                                  *self._file_stat(self.books_path), *self._file_stat(self.waiting_list_path),
+                                  journal_records)
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, mode='wb') as file:
+            file.write(header)
+            file.write(payload)
+        os.replace(temp_path, self.file_path)
+
+    #checks that the snapshot exists and the csv files did not change since it was written
+    def is_fresh(self):
+        if not os.path.exists(self.file_path):
+            return False
+        with open(self.file_path, mode='rb') as file:
+            header = file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return False
+        magic, _, _, books_mtime, books_size, waiting_mtime, waiting_size, _ = self.HEADER.unpack(header)
+        return (magic == self.MAGIC
+                and (books_mtime, books_size) == self._file_stat(self.books_path)
+                and (waiting_mtime, waiting_size) == self._file_stat(self.waiting_list_path))
+
+    #loads the state from the snapshot and returns (books, waiting_list, books_borrowed)
+    #raises ValueError if the file is damaged
+    def load(self):
+        with open(self.file_path, mode='rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return self._parse(view)
+                finally:
+                    view.release()
+
+    #parses the memory mapped snapshot
+    def _parse(self, view):
+        if len(view) < self.HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        header = self.HEADER.unpack_from(view)
+        magic, checksum, length = header[:3]
+        with view[self.HEADER.size:self.HEADER.size + length] as payload:
+            state = self._parse_payload(payload, magic, checksum, length)
+        self.journal_records = header[-1]
+        return state
+
+    #parses the payload after the header
+    def _parse_payload(self, payload, magic, checksum, length):
+        if magic != self.MAGIC or len(payload) != length or zlib.crc32(payload) != checksum:
+            raise ValueError("Snapshot is damaged")
+
+        string_count, text_length, book_count, waiting_count = struct.unpack_from('<QQQQ', payload)
+        position = 32
+        offsets, position = self._read_column(payload, position, 'Q', string_count + 1)
+        text = str(payload[position:position + text_length], 'utf-8')
+        position += text_length
+        strings = [text[offsets[i]:offsets[i + 1]] for i in range(string_count)]
+
+        columns = []
+        for typecode in ('I', 'I', 'I', 'i', 'i', 'i', 'i'):
+            column, position = self._read_column(payload, position, typecode, book_count)
+            columns.append(column)
+        waiting_columns = []
+        for typecode in ('I', 'I', 'I', 'I', 'i'):
+            column, position = self._read_column(payload, position, typecode, waiting_count)
+            waiting_columns.append(column)
+
+        books = {}
+        books_borrowed = {}
+        for title_id, author_id, genre_id, year, total, available, borrowed in zip(*columns):
+            title = strings[title_id]
+            book = Book(title, strings[author_id], total, strings[genre_id], year)
+            book.available_copies = available
+            books[title] = book
+            if borrowed:
+                books_borrowed[title] = borrowed
+
+        waiting_list = WaitingList()
+        for title_id, name_id, phone_id, email_id, priority in zip(*waiting_columns):
+            waiting_list.setdefault(strings[title_id]).append(
+                Customer.from_trusted(strings[name_id], strings[phone_id], strings[email_id]), priority)
+
+        return books, waiting_list, books_borrowed
+
+    #reads a fixed width integer column
+    @staticmethod
+    def _read_column(payload, position, typecode, count):
+        column = array(typecode)
+        end = position + count * column.itemsize
+        column.frombytes(payload[position:end])
+        if sys.byteorder != 'little':
+            column.byteswap()
+        return column, end
+
+    #returns the bytes of a column in little endian order
+    @staticmethod
+    def _to_bytes(column):
+        if sys.byteorder != 'little':
+            column = array(column.typecode, column)
+            column.byteswap()
+        return column.tobytes()
+
+    #returns (mtime in ns, size) of a file, or (0, -1) if it does not exist
+    @staticmethod
+    def _file_stat(file_path):
+        if file_path is None or not os.path.exists(file_path):
+            return 0, -1
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
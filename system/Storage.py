@@ -0,0 +1,231 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from Library.WaitingList import WaitingList
+from system.CSVHandler import CSVHandler
+from system.Journal import Journal
+from system.Snapshot import Snapshot
+
+#abstract base class for the places the library state is persisted in
+#a storage loads the books, waiting list and borrow counts once and then receives every single change
+class LibraryStorage(ABC):
+    #initializes the storage with empty state
+    def __init__(self):
+        self.books = {}
+        self.waiting_list = WaitingList()
+        self.books_borrowed = {}
+
+    #loads the state and returns (books, waiting_list, books_borrowed)
+    @abstractmethod
+    def load(self):
+        pass
+
+    #persists the state of a single book and its borrow count
+    @abstractmethod
+    def save_book(self, book, borrowed_copies):
+        pass
+
+    #persists the removal of a book
+    @abstractmethod
+    def delete_book(self, title):
+        pass
+
+    #persists a costumer joining the waiting list of a book with the given priority
+    @abstractmethod
+    def add_waiting(self, title, customer, priority=0):
+        pass
+
+    #persists costumers leaving the waiting list of a book
+    @abstractmethod
+    def remove_waiting(self, title, customers):
+        pass
+
+    #writes all the books
+    @abstractmethod
+    def save_books(self):
+        pass
+
+    #writes the whole waiting list
+    @abstractmethod
+    def save_waiting_list(self):
+        pass
+
+    #groups the changes made inside the scope into a single write
+    @contextmanager
+    def transaction(self):
+        yield self
+
+    #writes a full snapshot of the state
+    def compact(self):
+        self.save_books()
+        self.save_waiting_list()
+
+    #writes a binary snapshot for fast startup, if the storage supports it
+    def write_snapshot(self):
+        pass
+
+    #releases any open resources
+    def close(self):
+        pass
+
+
+#storage that keeps the state in books.csv and waiting_list.csv and rewrites the file on each change
+class CSVStorage(LibraryStorage):
+    #initializes the storage with the paths of the csv files
+    #load_workers > 1 parses books.csv in a process pool
+    #snapshot_path is a binary snapshot that is loaded instead of the csv files while they did not change
+    def __init__(self, books_path=None, waiting_list_path=None, load_workers=None, snapshot_path=None):
+        super().__init__()
+        self.books_path = books_path
+        self.waiting_list_path = waiting_list_path
+        self.load_workers = load_workers
+        self.snapshot = Snapshot(snapshot_path, books_path, waiting_list_path) if snapshot_path else None
+        self._in_transaction = False
+        self._books_dirty = False
+        self._waiting_list_dirty = False
+        self.journal_offset = 0  # journal records already included in the loaded state
+
+    #loads books and waiting list from the snapshot, or from the csv files when they are newer
+    def load(self):
+        self.journal_offset = 0
+        if self.snapshot is not None and self.snapshot.is_fresh():
+            try:
+                self.books, self.waiting_list, self.books_borrowed = self.snapshot.load()
+                self.journal_offset = self.snapshot.journal_records
+                return self.books, self.waiting_list, self.books_borrowed
+            except (OSError, ValueError) as e:
+                print(f"Error loading snapshot {self.snapshot.file_path}: {str(e)}, loading csv files.")
+
+        if self.load_workers and self.load_workers > 1:
+            self.books = CSVHandler.load_books_parallel(self.books_path, self.load_workers)
+        else:
+            self.books = CSVHandler.load_books_from_csv(self.books_path)
+        self.waiting_list = CSVHandler.load_waiting_list_from_csv(self.waiting_list_path)
+        self.books_borrowed = {}
+
+        # update loaned books status
+        for title, book in self.books.items():
+            if book.is_loaned == "Yes":
+                book.available_copies = 0
+                self.books_borrowed[title] = book.total_copies
+
+        return self.books, self.waiting_list, self.books_borrowed
+
+    def save_book(self, book, borrowed_copies):
+        self.save_books()
+
+    def delete_book(self, title):
+        self.save_books()
+
+    def add_waiting(self, title, customer, priority=0):
+        self.save_waiting_list()
+
+    def remove_waiting(self, title, customers):
+        self.save_waiting_list()
+
+    def save_books(self):
+        if self._in_transaction:
+            self._books_dirty = True
+            return
+        CSVHandler.save_books_to_csv(self.books, self.books_path)
+
+    def save_waiting_list(self):
+        if self._in_transaction:
+            self._waiting_list_dirty = True
+            return
+        CSVHandler.save_waiting_list_to_csv(self.waiting_list, self.waiting_list_path)
+
+    def write_snapshot(self):
+        if self.snapshot is not None:
+            self.snapshot.write(self.books, self.waiting_list, self.books_borrowed)
+
+    #marks the files dirty inside the scope and rewrites each of them at most once at the end
+    @contextmanager
+    def transaction(self):
+        if self._in_transaction:
+            yield self
+            return
+        self._in_transaction = True
+        try:
+            yield self
+        finally:
+            self._in_transaction = False
+            books_dirty, self._books_dirty = self._books_dirty, False
+            waiting_list_dirty, self._waiting_list_dirty = self._waiting_list_dirty, False
+        if books_dirty:
+            self.save_books()
+        if waiting_list_dirty:
+            self.save_waiting_list()
+
+
+#csv storage that appends every change to a journal and only rewrites the csv files on compaction
+class JournalStorage(CSVStorage):
+    #initializes the storage with the csv snapshot paths and the journal path
+    def __init__(self, books_path=None, waiting_list_path=None, journal_path=None, compact_threshold=10000,
+                 snapshot_path=None):
+        super().__init__(books_path, waiting_list_path, snapshot_path=snapshot_path)
+        self.journal = Journal(journal_path)
+        self.compact_threshold = compact_threshold
+        self._pending = None
+
+    #loads the csv snapshot (or the binary snapshot) and replays the changes made since
+    def load(self):
+        super().load()
+        self.journal.replay_into(self.books, self.waiting_list, self.books_borrowed, skip=self.journal_offset)
+        return self.books, self.waiting_list, self.books_borrowed
+
+    #writes a binary snapshot recording how much of the journal it includes, so those records are not
+    #replayed a second time on top of it
+    def write_snapshot(self):
+        if self.snapshot is not None:
+            self.snapshot.write(self.books, self.waiting_list, self.books_borrowed, self.journal.record_count)
+
+    def save_book(self, book, borrowed_copies):
+        self._append([Journal.book_record(book, borrowed_copies)])
+
+    def delete_book(self, title):
+        self._append([Journal.remove_record(title)])
+
+    def add_waiting(self, title, customer, priority=0):
+        self._append([Journal.wait_add_record(title, customer, priority)])
+
+    def remove_waiting(self, title, customers):
+        self._append([Journal.wait_remove_record(title, customer) for customer in customers])
+
+    #collects the records of the scope and appends them with a single write at the end
+    @contextmanager
+    def transaction(self):
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        finally:
+            records, self._pending = self._pending, None
+        self._append(records)
+
+    #appends records to the journal, or keeps them until the open transaction ends
+    def _append(self, records):
+        if self._pending is not None:
+            self._pending.extend(records)
+            return
+        self.journal.append_many(records)
+        self._compact_if_needed()
+
+    #folds the journal into a new csv snapshot and starts a fresh journal
+    def compact(self):
+        super().compact()
+        # the csv format only keeps whether a book is fully loaned,
+        # so the exact borrow counts are carried over into the new journal
+        self.journal.reset([
+            Journal.book_record(self.books[title], borrowed)
+            for title, borrowed in self.books_borrowed.items() if title in self.books
+        ])
+
+    #compacts the journal once it grows past the threshold
+    def _compact_if_needed(self):
+        if self.compact_threshold and self.journal.record_count >= self.compact_threshold:
+            self.compact()
+
+    def close(self):
+        self.journal.close()
@@ -0,0 +1,14 @@
+import unicodedata
+
+# final forms of Hebrew letters and the regular letters they are searched as
+HEBREW_FINAL_LETTERS = str.maketrans('ךםןףץ', 'כמנפצ')
+
+
+#returns the key a text is searched by: compatibility characters are decomposed (NFKD), case is
+#folded, combining marks (accents, niqqud) are removed and Hebrew final letters become regular letters,
+#so "Émile", "EMILE" and "émile" have the same key, and so do Hebrew words with or without niqqud
+def normalize_text(text):
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', unicodedata.normalize('NFKD', text).casefold())
+    return ''.join(char for char in text if not unicodedata.combining(char)).translate(HEBREW_FINAL_LETTERS)